@@ -0,0 +1,8 @@
+"""Performance benchmarks for pystrafe.
+
+Every ``bench_*`` module in this package defines ``time_*``, ``mem_*`` and
+``track_*`` functions, in the style of airspeed velocity, which are run by
+``python -m benchmarks``. A module may define a ``setup`` function that is
+called once before any of its benchmarks. The results can be saved as a
+baseline and compared against later; see :py:mod:`benchmarks.__main__`.
+"""
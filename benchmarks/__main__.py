@@ -0,0 +1,178 @@
+"""Run the benchmarks and print the time taken per call.
+
+Usage: ``python -m benchmarks [options] [substring ...]``, where only
+benchmarks with names containing one of the substrings are run.
+
+As in airspeed velocity, ``time_*`` functions are timed, ``mem_*`` functions
+return an object whose size is reported, and ``track_*`` functions return a
+number that is reported as is, such as the iteration count of a solver. The
+size is the ``nbytes`` attribute of the object if it has one, otherwise
+:py:func:`sys.getsizeof`.
+
+With ``--save FILE``, the results are also written to a JSON file, which a
+later run can be compared against with ``--compare FILE``. The comparison
+marks results that are more than ``--factor`` times worse or better than the
+stored ones, and the exit status is 1 if any is worse. A baseline is kept in
+``benchmarks/baseline.json``. It was recorded on a single x86_64 core with
+the Python version stored in the file, so on other machines use a larger
+``--factor`` or save a local baseline first. With ``--uncovered``,
+the public functions and classes of :py:mod:`pystrafe` whose names do not
+appear in any benchmark are listed instead.
+"""
+
+import re
+import sys
+import json
+import timeit
+import inspect
+import pkgutil
+import argparse
+import platform
+import importlib
+import benchmarks
+
+def discover():
+    for info in pkgutil.iter_modules(benchmarks.__path__):
+        if not info.name.startswith('bench_'):
+            continue
+        module = importlib.import_module('benchmarks.' + info.name)
+        funcs = [(name, getattr(module, name)) for name in sorted(vars(module))
+                 if name.startswith(('time_', 'mem_', 'track_'))]
+        yield module, funcs
+
+def measure(func, repeat=5):
+    """Return the best time per call of *func* in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+def format_time(t):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if t >= scale:
+            return '{:8.3f} {}'.format(t / scale, unit)
+    return '{:8.3f} ns'.format(t / 1e-9)
+
+def measure_mem(func):
+    """Return the size in bytes of the object returned by *func*."""
+    obj = func()
+    size = getattr(obj, 'nbytes', None)
+    return sys.getsizeof(obj) if size is None else size
+
+def format_size(n):
+    for unit, scale in (('GB', 1 << 30), ('MB', 1 << 20), ('kB', 1 << 10)):
+        if n >= scale:
+            return '{:8.3f} {}'.format(n / scale, unit)
+    return '{:8d} B'.format(n)
+
+def measure_track(func):
+    """Return the number returned by *func*."""
+    return float(func())
+
+def format_track(n):
+    return '{:11.6g}'.format(n)
+
+_runners = {'time_': (measure, format_time), 'mem_': (measure_mem, format_size),
+            'track_': (measure_track, format_track)}
+
+def _runner(name):
+    return _runners[name.split('_', 1)[0] + '_']
+
+def run(patterns):
+    """Run the benchmarks matching *patterns*, print the results as they
+    come, and return a dict of the results by full benchmark name."""
+    results = {}
+    for module, funcs in discover():
+        funcs = [(name, func) for name, func in funcs
+                 if not patterns or any(p in name for p in patterns)]
+        if not funcs:
+            continue
+        if hasattr(module, 'setup'):
+            module.setup()
+        for name, func in funcs:
+            full = module.__name__.split('.', 1)[1] + '.' + name
+            run_one, fmt = _runner(name)
+            results[full] = run_one(func)
+            print('{:60} {}'.format(full, fmt(results[full])))
+    return results
+
+def compare(results, baseline, factor):
+    """Print *results* against *baseline* and return the number of results
+    that are worse by more than *factor*."""
+    worse = 0
+    for full in sorted(results):
+        new = results[full]
+        old = baseline.get(full)
+        fmt = _runner(full.split('.', 1)[1])[1]
+        if old is None:
+            print('  {:58} {:>11} {}'.format(full, 'new', fmt(new)))
+            continue
+        ratio = new / old if old else (1.0 if new == old else float('inf'))
+        mark = ' '
+        if ratio > factor:
+            mark = '+'
+            worse += 1
+        elif ratio < 1 / factor:
+            mark = '-'
+        print('{} {:58} {} {} {:6.2f}'.format(mark, full, fmt(old), fmt(new),
+                                               ratio))
+    return worse
+
+def uncovered():
+    """Return the names of the public functions and classes of pystrafe that
+    do not appear in the source of any benchmark module."""
+    import pystrafe
+    import pystrafe.vec
+    source = '\n'.join(inspect.getsource(module) for module, _ in discover())
+    names = []
+    for package in (pystrafe, pystrafe.vec):
+        for info in pkgutil.iter_modules(package.__path__):
+            if info.name == 'tests' or info.ispkg:
+                continue
+            module = importlib.import_module(package.__name__ + '.' + info.name)
+            for name, obj in vars(module).items():
+                if name.startswith('_') or getattr(obj, '__module__', None) \
+                        != module.__name__:
+                    continue
+                # Plain result types are not worth benchmarking.
+                if inspect.isclass(obj) and issubclass(obj, tuple):
+                    continue
+                if (inspect.isfunction(obj) or inspect.isclass(obj)) \
+                        and not re.search(r'\b{}\b'.format(name), source):
+                    names.append(module.__name__ + '.' + name)
+    return names
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('patterns', nargs='*', metavar='substring')
+    parser.add_argument('--save', metavar='FILE',
+                        help='write the results to a JSON file')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare the results against a saved JSON file')
+    parser.add_argument('--factor', type=float, default=1.1,
+                        help='ratio beyond which a result counts as changed')
+    parser.add_argument('--uncovered', action='store_true',
+                        help='list the public functions without benchmarks')
+    args = parser.parse_args(argv)
+
+    if args.uncovered:
+        names = uncovered()
+        for name in names:
+            print(name)
+        return 1 if names else 0
+
+    results = run(args.patterns)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'results': results}, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print()
+        if compare(results, baseline, args.factor):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
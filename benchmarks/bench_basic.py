@@ -0,0 +1,83 @@
+"""Latency of the per-frame scalar functions."""
+
+import math
+from pystrafe import basic, common, ladder, scalar, view
+
+n = [0.0, math.sqrt(0.5), math.sqrt(0.5)]
+
+def time_vec_dot():
+    common.vec_dot([1.0, 2.0, 3.0], [4.0, 5.0, 6.0])
+
+def time_vec_length():
+    common.vec_length([1.0, 2.0, 3.0])
+
+def time_collide():
+    basic.collide([100.0, -200.0, -300.0], n)
+
+def time_friction():
+    basic.friction([50.0, 60.0, 0.0], 0.001, basic.E, basic.k)
+
+def time_gravity_half():
+    basic.gravity_half([50.0, 60.0, 0.0], basic.g, 0.001)
+
+def time_strafe_fme_theta():
+    basic.strafe_fme_theta([400.0, 100.0, 0.0], 1.5, 30, 3.2)
+
+def time_climb_velocity():
+    ladder.climb_velocity(n, [0.0, 0.0, 1.0], [1.0, 0.0, 0.0], 1, 1)
+
+def time_maxspeed_normal():
+    ladder.maxspeed_normal(n, 1, 1, 1)
+
+ladder_cache = ladder.LadderCache()
+ladder_cache_exact = ladder.LadderCache(quantum=None)
+
+def time_ladder_cache_hit():
+    ladder_cache.maxspeed_normal(n, 1, 1, 1)
+
+def time_ladder_cache_exact_hit():
+    ladder_cache_exact.maxspeed_normal(n, 1, 1, 1)
+
+def time_angles_to_vectors():
+    view.angles_to_vectors(0.3, 1.2, 3)
+
+def time_strafe_fme_theta_optimal():
+    v = [400.0, 100.0, 0.0]
+    theta = basic.strafe_optimal_theta(math.hypot(v[0], v[1]), 30, 3.2)
+    basic.strafe_fme_theta(v, theta, 30, 3.2)
+
+def time_strafe_optimal():
+    basic.strafe_optimal([400.0, 100.0, 0.0], 30, 3.2)
+
+def time_float_equal():
+    common.float_equal(1.0, 1.0 + 1e-12)
+
+def time_float_zero():
+    common.float_zero(1e-9)
+
+def time_vec_set():
+    common.vec_set([0.0, 0.0, 0.0], 1.0)
+
+def time_vec_normalize():
+    common.vec_normalize([1.0, 2.0, 3.0])
+
+def time_vec_cross():
+    common.vec_cross([1.0, 2.0, 3.0], [4.0, 5.0, 6.0])
+
+def time_vec_add():
+    common.vec_add([1.0, 2.0, 3.0], [4.0, 5.0, 6.0])
+
+def time_vec_sub():
+    common.vec_sub([1.0, 2.0, 3.0], [4.0, 5.0, 6.0])
+
+def time_vec_mul():
+    common.vec_mul([1.0, 2.0, 3.0], 2.5)
+
+def time_anglemod_rad():
+    common.anglemod_rad(1.2345)
+
+def time_anglemod_deg():
+    common.anglemod_deg(123.45)
+
+def time_strafe_maxaccel():
+    scalar.strafe_maxaccel(400.0, 30, 0.001, 320, 10, basic.E, basic.k)
@@ -0,0 +1,63 @@
+"""Throughput of the damage functions over (hp, ap, dmg) grids and height
+maps."""
+
+import itertools
+import numpy as np
+from pystrafe import damage
+from pystrafe.vec import damage as vdamage
+
+hps = np.arange(1, 101)
+aps = np.arange(0, 1001) * 0.1
+dmgs = np.linspace(0, 200, 10)
+
+def time_hpap_damage_vec_1m():
+    vdamage.hpap_damage(hps[:, None, None], aps[None, :, None], dmgs)
+
+def time_hpap_damage_scalar_loop_10k():
+    for hp, ap, dmg in itertools.product(hps[:10], aps[:100], dmgs):
+        damage.hpap_damage(hp, ap, dmg)
+
+def time_ap_dhp_damage_vec_1m():
+    vdamage.ap_dhp_damage(np.arange(-500, 500, 0.001), 40)
+
+def time_ap_dhp_damage_scalar_loop_10k():
+    for dhp in np.arange(-5, 5, 0.001):
+        damage.ap_dhp_damage(dhp, 40)
+
+zmap = np.linspace(-2000, 100, 1000)[:, None] + np.linspace(0, 100, 1000)
+
+def time_fall_z_vec_1m():
+    vdamage.fall_z(268, zmap, 800)
+
+def time_fall_max_speedzi_vec_1m():
+    vdamage.fall_max_speedzi(10, zmap, 800)
+
+def time_fall_max_speedzi_bisect_1k():
+    # The iterative search replaced by fall_max_speedzi
+    for z in zmap[:10, :100].ravel():
+        lo, hi = 0.0, 1e4
+        for _ in range(50):
+            mid = 0.5 * (lo + hi)
+            try:
+                ok = damage.fall_z(mid, z, 800) <= 10
+            except ValueError:
+                ok = False
+            lo, hi = (mid, hi) if ok else (lo, mid)
+
+def time_fall():
+    damage.fall(700.0)
+
+def time_fall_speed():
+    damage.fall_speed(10.0)
+
+def time_fall_min_z():
+    damage.fall_min_z(10.0, 268.0, 800.0)
+
+def time_fall_vec_1m():
+    vdamage.fall(zmap)
+
+def time_fall_speed_vec_1m():
+    vdamage.fall_speed(zmap)
+
+def time_fall_min_z_vec_1m():
+    vdamage.fall_min_z(10, zmap, 800)
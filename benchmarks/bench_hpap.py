@@ -0,0 +1,27 @@
+"""Build time, memory and queries of :py:class:`pystrafe.hpap.TransitionIndex`
+over the full 1-100 HP by 0-100 AP space."""
+
+import numpy as np
+from pystrafe import hpap
+
+# 40 damages in multiples of 0.25, so that AP stays on the 0.1 grid
+dmgs = np.arange(1, 41) * 2.5
+
+def setup():
+    global index
+    index = hpap.TransitionIndex(dmgs)
+
+def time_build():
+    hpap.TransitionIndex(dmgs)
+
+def mem_index():
+    return index
+
+def time_predecessors():
+    index.predecessors(50, 20)
+
+def time_reverse_reachable_3():
+    index.reverse_reachable(50, 20, 3)
+
+def time_shortest_sequence():
+    index.shortest_sequence(100, 100, 70, 40)
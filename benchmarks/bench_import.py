@@ -0,0 +1,23 @@
+"""Import time of the package and its submodules in a fresh interpreter."""
+
+import sys
+import subprocess
+
+def _run(stmt):
+    subprocess.run([sys.executable, '-c', stmt], check=True)
+
+def time_python_startup():
+    _run('pass')
+
+def time_import_pystrafe():
+    _run('import pystrafe')
+
+def time_import_damage():
+    _run('import pystrafe.damage')
+
+def time_import_motion():
+    _run('import pystrafe.motion')
+
+def time_import_motion_solve():
+    _run('from pystrafe import motion\n'
+         'motion.strafe_solve_speedxi(0, 181760, 100, -18, 800)')
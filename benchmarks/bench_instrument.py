@@ -0,0 +1,19 @@
+"""Overhead of the instrumentation in :py:mod:`pystrafe.instrument`."""
+
+from pystrafe import basic, instrument
+
+def _strafe_1k():
+    v = [400.0, 0.0, 0.0]
+    for _ in range(1000):
+        basic.strafe_fme_theta(v, 1.5, 30, 3.2)
+
+def time_strafe_fme_theta_1k():
+    _strafe_1k()
+
+def time_strafe_fme_theta_1k_instrumented():
+    with instrument.Instrument():
+        _strafe_1k()
+
+def time_Instrument_start_stop():
+    with instrument.Instrument():
+        pass
@@ -0,0 +1,40 @@
+"""Latency of the per-frame kernels in :py:mod:`pystrafe.jit`, which are
+compiled only when Numba is installed."""
+
+import numpy as np
+from pystrafe import basic, jit, sim
+
+v = np.array([400.0, 100.0, 0.0])
+n = np.array([0.0, 0.0, 1.0])
+
+def setup():
+    # Trigger the compilation outside of the timings.
+    time_run_1k_frames()
+
+def time_scalar_friction():
+    jit.scalar_friction(400.0, 0.001, basic.E, basic.k)
+
+def time_scalar_strafe_maxaccel():
+    jit.scalar_strafe_maxaccel(400.0, 30, 0.001, 320, 10, basic.E, basic.k)
+
+def time_collide():
+    jit.collide(np.array([100.0, -200.0, -300.0]), n)
+
+def time_friction():
+    jit.friction(np.array([50.0, 60.0, 0.0]), 0.001, basic.E, basic.k)
+
+def time_strafe_fme_theta():
+    jit.strafe_fme_theta(v.copy(), 1.5, 30, 3.2)
+
+def time_step():
+    jit.step(np.zeros(3), v.copy(), 0.001, 1.5, 30.0, 3.2, False, basic.E,
+             basic.k, basic.g)
+
+def time_run_1k_frames():
+    jit.run(np.zeros(3), v.copy(), 1000, 0.001, 1.5, 30.0, 3.2, False,
+            basic.E, basic.k, basic.g)
+
+def time_iter_trajectory_1k_frames():
+    for _ in sim.iter_trajectory([400.0, 100.0, 0.0], 0.001, 30, 3.2, n=1000,
+                                 theta=1.5, every=1000):
+        pass
@@ -0,0 +1,53 @@
+"""Latency of the scalar closed-form motion functions."""
+
+import math
+from pystrafe import motion
+
+K = motion.strafe_K_std(0.001)
+
+def time_strafe_distance():
+    motion.strafe_distance(2.5, 400, K)
+
+def time_strafe_distance_frames():
+    motion.strafe_distance_frames(2500, 400, K, 0.001)
+
+def time_strafe_distance_frames_loop():
+    tau = 0.001
+    math.fsum(math.sqrt(160000 + i * K * tau) for i in range(1, 2501)) * tau
+
+cfg = motion.strafe_config(30, 0.001, 320, 10)
+
+def time_strafe_time_recompute_K():
+    motion.strafe_time(1000, 400, motion.strafe_K(30, 0.001, 320, 10))
+
+def time_strafe_config_strafe_time():
+    cfg.strafe_time(1000, 400)
+
+def time_strafe_solve_speedxi_recompute_K():
+    motion.strafe_solve_speedxi(268, motion.strafe_K(30, 0.001, 320, 10), 500, -50, 800,
+                                'newton')
+
+def time_strafe_config_strafe_solve_speedxi():
+    cfg.strafe_solve_speedxi(268, 500, -50, 'newton')
+
+def time_solve_boost_min_dmg_recompute_K():
+    motion.solve_boost_min_dmg([100, 268], motion.strafe_K(30, 0.001, 320, 10), 400,
+                               500, 800)
+
+def time_strafe_config_solve_boost_min_dmg():
+    cfg.solve_boost_min_dmg([100, 268], 400, 500)
+
+def time_strafe_config_cached():
+    motion.strafe_config(30, 0.001, 320, 10)
+
+def time_StrafeConfig_new():
+    motion.StrafeConfig(30, 0.001, 320, 10)
+
+def time_strafe_speedxf():
+    motion.strafe_speedxf(2.5, 400, K)
+
+def time_gravity_speediz_distance_time():
+    motion.gravity_speediz_distance_time(0.5, -50, 800)
+
+def time_gravity_time_speediz_z():
+    motion.gravity_time_speediz_z(268, -50, 800)
@@ -0,0 +1,25 @@
+"""Throughput of the process pool batch solvers in :py:mod:`pystrafe.parallel`."""
+
+import numpy as np
+from pystrafe import motion, parallel
+
+K = motion.strafe_K_std(0.001)
+
+def setup():
+    global xs, zs, vi
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(0, 2000, 20000)
+    zs = rng.uniform(-500, 40, 20000)
+    vi = np.stack([rng.uniform(0, 400, 2000), np.full(2000, 268.0)], axis=-1)
+
+def time_map_solve_speedxi_serial():
+    parallel.map_solve_speedxi(268, K, xs, zs, 800, workers=1)
+
+def time_map_solve_speedxi():
+    parallel.map_solve_speedxi(268, K, xs, zs, 800)
+
+def time_map_boost_min_dmg_serial():
+    parallel.map_boost_min_dmg(vi, K, xs[:2000], zs[:2000], 800, workers=1)
+
+def time_map_boost_min_dmg():
+    parallel.map_boost_min_dmg(vi, K, xs[:2000], zs[:2000], 800)
@@ -0,0 +1,41 @@
+"""Throughput of the batched player movement in :py:mod:`pystrafe.pmove`."""
+
+import math
+import numpy as np
+from pystrafe import pmove
+
+n = 10000
+c = math.sqrt(0.5)
+planes = [[0, 0, 1, 0], [1, 0, 0, -1000], [-1, 0, 0, -1000],
+          [0, 1, 0, -1000], [0, -1, 0, -1000], [0, c, c, -300]]
+
+def setup():
+    global move, state, yaws
+    rng = np.random.default_rng(0)
+    pos = rng.uniform(-900, 900, (n, 3))
+    pos[:, 2] = np.where(np.arange(n) % 2, 0.0, rng.uniform(0, 200, n))
+    vel = rng.uniform(-400, 400, (n, 3))
+    move = pmove.PlayerMove(planes, 0.001)
+    state = pmove.PlayerState(pos, vel)
+    yaws = rng.uniform(-np.pi, np.pi, n)
+
+def time_step():
+    move.step(state, yaws)
+
+def time_categorize():
+    move.categorize(state)
+
+def time_friction():
+    move.friction(state, state.onground)
+
+def time_accelerate():
+    move.accelerate(state, yaws)
+
+def time_move():
+    move.move(state)
+
+def time_step_single_player():
+    single.step(single_state, 0.0)
+
+single = pmove.PlayerMove(planes, 0.001)
+single_state = pmove.PlayerState([[0.0, 0.0, 0.0]], [[300.0, 0.0, 0.0]])
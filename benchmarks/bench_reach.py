@@ -0,0 +1,24 @@
+"""Throughput of the reachability grids in :py:mod:`pystrafe.reach`."""
+
+import numpy as np
+from pystrafe import motion, reach
+
+K = motion.strafe_K_std(0.001)
+xs = np.linspace(0, 2000, 1000)
+zs = np.linspace(-500, 40, 1000)
+
+def time_reach_grid():
+    reach.reach_grid(xs, zs, 400, 268, K, 800)
+
+def time_reach_grid_threads():
+    reach.reach_grid(xs, zs, 400, 268, K, 800, chunk_size=1 << 16, workers=4)
+
+def time_reach_grid_scalar_loop_10k():
+    for x in xs[::10]:
+        for z in zs[::10]:
+            motion.strafe_solve_speedxi(268, K, x, z, 800)
+
+zmap = zs[:, None] * np.linspace(0.5, 1.5, 1000)
+
+def time_flight_time_1m():
+    reach.flight_time(268, zmap, 800)
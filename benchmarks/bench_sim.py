@@ -0,0 +1,54 @@
+"""Throughput of the batched simulation in :py:mod:`pystrafe.sim`."""
+
+import numpy as np
+from pystrafe import sim
+
+n = 10000
+
+def setup():
+    global s, ground, yaws, v
+    rng = np.random.default_rng(0)
+    v = np.zeros((n, 3))
+    v[:, :2] = rng.uniform(-1000, 1000, (n, 2))
+    s = sim.StrafeSim(v, 0.001)
+    # Friction slows the players down to a stop, so it gets its own copy.
+    ground = sim.StrafeSim(v, 0.001)
+    yaws = rng.uniform(-np.pi, np.pi, n)
+
+def time_strafe():
+    s.strafe(yaws, 30, 3.2)
+
+def time_strafe_yaw():
+    s.strafe_yaw(yaws, 30, 3.2)
+
+def time_accelerate_yaw():
+    sim.accelerate_yaw(s.v[:, 0], s.v[:, 1], yaws, 30, 3.2)
+
+def time_strafe_optimal_anglemod():
+    s.strafe_optimal_anglemod(30, 3.2)
+
+def time_friction():
+    ground.friction()
+
+def time_gravity_half():
+    s.gravity_half()
+
+def time_step():
+    s.step(yaws, 30, 3.2)
+
+def time_strafe_distance_anglemod_100_frames():
+    sim.strafe_distance_anglemod(v, 100, 30, 3.2, 0.001)
+
+def time_iter_trajectory_10k_frames():
+    for _ in sim.iter_trajectory([400.0, 0.0, 268.0], 0.001, 30, 3.2, n=10000):
+        pass
+
+def time_iter_trajectory_10k_frames_every_100():
+    for _ in sim.iter_trajectory([400.0, 0.0, 268.0], 0.001, 30, 3.2, n=10000,
+                                 every=100):
+        pass
+
+def time_iter_trajectory_10k_frames_chunks():
+    for _ in sim.iter_trajectory([400.0, 0.0, 268.0], 0.001, 30, 3.2, n=10000,
+                                 chunk_size=4096):
+        pass
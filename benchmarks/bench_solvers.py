@@ -0,0 +1,161 @@
+"""Latency and iteration counts of the iterative solvers.
+
+The ``track_*`` benchmarks count how much work the solvers behind
+:py:func:`pystrafe.motion.strafe_solve_speedxi` and
+:py:func:`pystrafe.motion.solve_boost_min_dmg` and their array versions do
+over a fixed set of problems, so that a change in convergence shows up even
+when the timings are too noisy to tell.
+"""
+
+import contextlib
+import numpy as np
+from pystrafe import motion, optimize
+from pystrafe.vec import motion as vmotion
+
+K = motion.strafe_K_std(0.001)
+
+def setup():
+    global speedzi, x, z, problems
+    rng = np.random.default_rng(0)
+    speedzi = rng.uniform(0, 600, 1000)
+    x = rng.uniform(0, 3000, 1000)
+    z = rng.uniform(-500, 40, 1000)
+    problems = list(zip(speedzi.tolist(), x.tolist(), z.tolist()))
+
+class _CountingOptimize:
+    """Stand-in for the module returned by ``motion._optimize`` that counts
+    the objective evaluations of the pure Python solvers."""
+
+    def __init__(self):
+        self.nfev = 0
+
+    def _wrap(self, f):
+        def counted(v):
+            self.nfev += 1
+            return f(v)
+        return counted
+
+    def brentq(self, f, a, b):
+        return optimize.brentq(self._wrap(f), a, b)
+
+    def minimize_scalar(self, fun):
+        return optimize.minimize_scalar(self._wrap(fun))
+
+@contextlib.contextmanager
+def _patched(module, name, value):
+    original = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+def _min_maxiter(solve, *args):
+    """Return the iteration count of *solve*, which raises RuntimeError when
+    it fails to converge within its *maxiter* argument, and its result."""
+    for maxiter in range(1, 100):
+        try:
+            return maxiter, solve(*args, maxiter=maxiter)
+        except RuntimeError:
+            pass
+    raise RuntimeError('failed to converge')
+
+def _solve_speedxi_all(method):
+    for speedzi_i, x_i, z_i in problems:
+        try:
+            motion.strafe_solve_speedxi(speedzi_i, K, x_i, z_i, 800, method)
+        except ValueError:
+            pass
+
+def time_brentq():
+    optimize.brentq(lambda v: v * v - 2, 0, 2)
+
+def time_minimize_scalar():
+    optimize.minimize_scalar(lambda v: (v - 3) ** 2 + 1)
+
+def track_solve_speedxi_brentq_nfev():
+    """Objective evaluations of brentq over 1000 problems."""
+    counting = _CountingOptimize()
+    with _patched(motion, '_optimize', lambda: counting):
+        _solve_speedxi_all('brentq')
+    return counting.nfev
+
+def track_solve_speedxi_newton_iterations():
+    """Newton iterations over 1000 problems."""
+    total = 0
+
+    def counted(c, D):
+        nonlocal total
+        n, ret = _min_maxiter(newton, c, D)
+        total += n
+        return ret
+
+    newton = motion._strafe_solve_speedxi_newton
+    with _patched(motion, '_strafe_solve_speedxi_newton', counted):
+        _solve_speedxi_all('newton')
+    return total
+
+def track_boost_min_dmg_nfev():
+    """Objective evaluations of minimize_scalar over 100 problems."""
+    counting = _CountingOptimize()
+    with _patched(motion, '_optimize', lambda: counting):
+        for speedzi_i, x_i, z_i in problems[:100]:
+            motion.solve_boost_min_dmg([100, speedzi_i], K, x_i, z_i, 800)
+    return counting.nfev
+
+def _count_vec_calls(name, run):
+    """Return the number of calls of the objective passed to the array solver
+    *name* of :py:mod:`pystrafe.vec.motion`, and the total number of
+    elements evaluated, while calling *run*."""
+    calls = elements = 0
+
+    def counting_solver(f, *args):
+        def counted(v, idx):
+            nonlocal calls, elements
+            calls += 1
+            elements += len(v)
+            return f(v, idx)
+        return solver(counted, *args)
+
+    solver = getattr(vmotion, name)
+    with _patched(vmotion, name, counting_solver):
+        run()
+    return calls, elements
+
+def track_vec_solve_speedxi_illinois_iterations():
+    """Iterations of the Illinois method for a batch of 1000 problems."""
+    return _count_vec_calls('_illinois', lambda: vmotion.strafe_solve_speedxi(
+        speedzi, K, x, z, 800))[0]
+
+def track_vec_solve_speedxi_illinois_nfev():
+    """Objective evaluations of the Illinois method over 1000 problems."""
+    return _count_vec_calls('_illinois', lambda: vmotion.strafe_solve_speedxi(
+        speedzi, K, x, z, 800))[1]
+
+def track_vec_solve_speedxi_newton_iterations():
+    """Newton iterations for a batch of 1000 problems."""
+    result = []
+
+    def counted(c, D, rtol, maxiter):
+        n, ret = _min_maxiter(newton, c, D, rtol)
+        result.append(n)
+        return ret
+
+    newton = vmotion._strafe_solve_speedxi_newton
+    with _patched(vmotion, '_strafe_solve_speedxi_newton', counted):
+        vmotion.strafe_solve_speedxi(speedzi, K, x, z, 800, 'newton')
+    return sum(result)
+
+def track_vec_boost_min_dmg_iterations():
+    """Calls of the batched objective in the golden-section search for 100
+    problems, which is two more than the iterations."""
+    vi = np.stack([np.full(100, 100.0), speedzi[:100]], axis=-1)
+    return _count_vec_calls('_golden', lambda: vmotion.solve_boost_min_dmg(
+        vi, K, x[:100], z[:100], 800))[0]
+
+def track_vec_boost_min_dmg_nfev():
+    """Objective evaluations of the golden-section search over 100
+    problems."""
+    vi = np.stack([np.full(100, 100.0), speedzi[:100]], axis=-1)
+    return _count_vec_calls('_golden', lambda: vmotion.solve_boost_min_dmg(
+        vi, K, x[:100], z[:100], 800))[1]
@@ -0,0 +1,28 @@
+"""Batch clipping of velocities against planes."""
+
+import math
+import numpy as np
+from pystrafe import basic
+from pystrafe.vec import basic as vbasic
+
+c = math.sqrt(0.5)
+normals = np.array([[0.0, 0.0, 1.0], [-1.0, 0.0, 0.0], [0.0, c, c]])
+rng = np.random.default_rng(0)
+v = rng.uniform(-500, 500, (10000, 3))
+mask = rng.random((10000, 3)) < 0.5
+v_list = v[:1000].tolist()
+n = normals[2].tolist()
+
+def time_collide_vec_10k():
+    vbasic.collide(v, normals[2])
+
+def time_collide_scalar_loop_1k():
+    for vel in v_list:
+        if vel[1] + vel[2] < 0:
+            basic.collide(list(vel), n)
+
+def time_clip_planes_10k():
+    vbasic.clip_planes(v, normals, mask=mask)
+
+def time_clip_planes_no_validate_10k():
+    vbasic.clip_planes(v, normals, validate=False, mask=mask)
@@ -0,0 +1,25 @@
+"""Throughput of the elementwise helpers in :py:mod:`pystrafe.vec.common`."""
+
+import numpy as np
+from pystrafe.vec import common as vcommon
+
+a = np.random.default_rng(0).uniform(-10, 10, 1000000)
+b = a + 1e-12
+
+def time_float_equal_1m():
+    vcommon.float_equal(a, b)
+
+def time_float_zero_1m():
+    vcommon.float_zero(a)
+
+def time_validate_K_1m():
+    vcommon.validate_K(a + 10)
+
+def time_anglemod_index_rad_1m():
+    vcommon.anglemod_index_rad(a)
+
+def time_anglemod_rad_1m():
+    vcommon.anglemod_rad(a)
+
+def time_anglemod_deg_1m():
+    vcommon.anglemod_deg(a)
@@ -0,0 +1,26 @@
+"""Batch ladder viewangles over many ladder normals."""
+
+import numpy as np
+from pystrafe import ladder
+from pystrafe.vec import ladder as vladder
+
+rng = np.random.default_rng(0)
+normals = rng.normal(size=(100000, 3))
+normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+normals_list = normals[:1000].tolist()
+f = np.broadcast_to([0.0, 0.0, 1.0], normals.shape)
+s = np.broadcast_to([1.0, 0.0, 0.0], normals.shape)
+
+def time_maxspeed_normal_vec_100k():
+    vladder.maxspeed_normal(normals, 1, 1, 1)
+
+def time_maxspeed_normal_scalar_loop_1k():
+    for n in normals_list:
+        ladder.maxspeed_normal(n, 1, 1, 1)
+
+def time_climb_velocity_vec_100k():
+    vladder.climb_velocity(normals, f, s, 1, 1)
+
+def time_climb_velocity_scalar_loop_1k():
+    for n in normals_list:
+        ladder.climb_velocity(n, [0.0, 0.0, 1.0], [1.0, 0.0, 0.0], 1, 1)
@@ -0,0 +1,62 @@
+"""Batched solvers in :py:mod:`pystrafe.vec.motion` against scalar loops over
+the same inputs."""
+
+import numpy as np
+from pystrafe import motion
+from pystrafe.vec import motion as vmotion
+
+K = motion.strafe_K_std(0.001)
+
+def setup():
+    global speedzi, x, z, vi_boost, dx_boost
+    rng = np.random.default_rng(0)
+    n = 10000
+    speedzi = rng.uniform(0, 600, n)
+    x = rng.uniform(0, 3000, n)
+    z = rng.uniform(-500, 100, n)
+    vi_boost = np.stack([np.full(1000, 100.0), speedzi[:1000]], -1)
+    # Stand-in for the solutions of neighbouring targets
+    dx_boost = vmotion.solve_boost_min_dmg(vi_boost, K, x[:1000], z[:1000], 800)[0]
+    dx_boost *= rng.uniform(0.97, 1.03, 1000)
+
+def time_strafe_solve_speedxi_scalar_loop():
+    for args in zip(speedzi.tolist(), x.tolist(), z.tolist()):
+        try:
+            motion.strafe_solve_speedxi(args[0], K, args[1], args[2], 800)
+        except ValueError:
+            pass
+
+def time_strafe_solve_speedxi_vec():
+    vmotion.strafe_solve_speedxi(speedzi, K, x, z, 800)
+
+def time_strafe_solve_speedxi_newton_scalar_loop():
+    for args in zip(speedzi.tolist(), x.tolist(), z.tolist()):
+        try:
+            motion.strafe_solve_speedxi(args[0], K, args[1], args[2], 800, 'newton')
+        except ValueError:
+            pass
+
+def time_strafe_solve_speedxi_newton_vec():
+    vmotion.strafe_solve_speedxi(speedzi, K, x, z, 800, 'newton')
+
+def time_solve_boost_min_dmg_scalar_loop():
+    for args in zip(speedzi[:1000].tolist(), x[:1000].tolist(), z[:1000].tolist()):
+        motion.solve_boost_min_dmg([100, args[0]], K, args[1], args[2], 800)
+
+def time_solve_boost_min_dmg_vec():
+    vmotion.solve_boost_min_dmg(vi_boost, K, x[:1000], z[:1000], 800)
+
+def time_solve_boost_min_dmg_vec_warm():
+    vmotion.solve_boost_min_dmg(vi_boost, K, x[:1000], z[:1000], 800, dx0=dx_boost)
+
+def time_strafe_speedxf_vec():
+    vmotion.strafe_speedxf(x / 1000, speedzi, K)
+
+def time_gravity_speediz_distance_time_vec():
+    vmotion.gravity_speediz_distance_time(x / 1000, z, 800)
+
+def time_gravity_time_speediz_z_vec():
+    vmotion.gravity_time_speediz_z(speedzi, z, 800)
+
+def time_gravity_first_time_vec():
+    vmotion.gravity_first_time(speedzi, z, 800)
@@ -1,7 +1,26 @@
-from pystrafe import common
-from pystrafe import view
-from pystrafe import basic
-from pystrafe import motion
-from pystrafe import damage
+"""Python routines for Half-Life physics computations.
+
+Submodules are imported lazily on first access, so that ``import pystrafe``
+stays cheap and heavy dependencies such as scipy are only loaded when needed.
+"""
+
+import os
+import importlib
 
 __version__ = '0.1'
+
+_submodules = {'basic', 'common', 'damage', 'hpap', 'instrument', 'jit',
+               'ladder', 'motion', 'optimize', 'parallel', 'pmove', 'reach',
+               'scalar', 'sim', 'vec', 'view'}
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | _submodules)
+
+if os.environ.get('PYSTRAFE_INSTRUMENT'):
+    from pystrafe import instrument as _instrument
+    _instrument._enable_from_environ(os.environ['PYSTRAFE_INSTRUMENT'])
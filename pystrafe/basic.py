@@ -15,23 +15,25 @@ def collide(v, n, b=1):
     If this is not a case, a valid velocity would still be computed, but a
     warning will be raised.
     """
-    if not common.float_equal(common.vec_length(n, 3), 1):
+    nx, ny, nz = n[0], n[1], n[2]
+    if not common.float_equal(math.sqrt(nx * nx + ny * ny + nz * nz), 1):
         raise ValueError('n must be a unit vector')
 
     # This is what happens in the game: b is usually never below 1, and the game
     # sets the velocity to zero if that happens.
     if b < 1:
-        common.vec_set(v, 0.0, 3)
+        v[0] = v[1] = v[2] = 0.0
         return
 
-    vdotn = common.vec_dot(v, n, 3)
+    vdotn = v[0] * nx + v[1] * ny + v[2] * nz
     if vdotn > 0.0:
         warnings.warn('v directed out of the plane', RuntimeWarning)
         return
 
-    n = n[:]
-    common.vec_mul(n, vdotn * b)
-    common.vec_sub(v, n)
+    vdotn *= b
+    v[0] -= nx * vdotn
+    v[1] -= ny * vdotn
+    v[2] -= nz * vdotn
 
 def friction(v, tau, E, k):
     """Apply friction to the velocity *v*.
@@ -49,21 +51,22 @@ def friction(v, tau, E, k):
     is responsible of multiplying the coefficients of edgefriction or entity
     friction with *k* as the argument.
     """
-    speed = common.vec_length(v, 2)
+    vx, vy = v[0], v[1]
+    speed = math.sqrt(vx * vx + vy * vy)
     if speed < 0.1:
         return
     if speed >= E:
         fric = 1 - tau * k
-        common.vec_mul(v, fric, 2)
+        v[0] = vx * fric
+        v[1] = vy * fric
         return
     fric = tau * E * k
     if speed >= fric:
-        vhat = v[:]
-        common.vec_mul(vhat, 1 / speed, 2)
-        common.vec_mul(vhat, fric, 2)
-        common.vec_sub(v, vhat, 2)
+        inv = 1 / speed
+        v[0] = vx - vx * inv * fric
+        v[1] = vy - vy * inv * fric
     else:
-        common.vec_set(v, 0.0, 2)
+        v[0] = v[1] = 0.0
 
 def gravity_half(v, g, tau):
     """Apply gravity to 3D velocity vector *v*.
@@ -85,17 +88,63 @@ def strafe_fme_theta(v, theta, L, gamma1):
     for groundstrafing. *gamma1* is usually :math:`k_e \tau M A`.
 
     """
-    speed = common.vec_length(v, 2)
+    vx, vy = v[0], v[1]
+    speed = math.sqrt(vx * vx + vy * vy)
     if common.float_zero(speed):
         raise ValueError('speed cannot be 0')
-    vhat = v[:]
-    common.vec_mul(vhat, 1 / speed, 2)
+    inv = 1 / speed
+    hx, hy = vx * inv, vy * inv
     ct = math.cos(theta)
     gamma2 = L - speed * ct
     if gamma2 <= 0.0:
         return
     st = math.sin(theta)
     mu = min(gamma1, gamma2)
-    a = [vhat[0] * ct - vhat[1] * st, vhat[0] * st + vhat[1] * ct]
-    common.vec_mul(a, mu, 2)
-    common.vec_add(v, a, 2)
+    v[0] = vx + (hx * ct - hy * st) * mu
+    v[1] = vy + (hx * st + hy * ct) * mu
+
+def strafe_optimal_theta(speed, L, gamma1):
+    r"""Compute the theta for strafing with the maximum acceleration.
+
+    This is :math:`\arccos((L - \gamma_1) / \lVert\mathbf{v}\rVert)`, clipped to
+    :math:`[0, \pi/2]`, which covers the three regimes of
+    :py:func:`pystrafe.scalar.strafe_maxaccel`. The angle is for strafing
+    towards the left, so negate it to strafe towards the right.
+
+    >>> '{:.6g}'.format(strafe_optimal_theta(400, 30, 3.2))
+    '1.50375'
+    """
+    if common.float_zero(speed):
+        raise ValueError('speed cannot be 0')
+    return math.acos(min(max((L - gamma1) / speed, 0.0), 1.0))
+
+def strafe_optimal(v, L, gamma1, left=True):
+    """Perform a strafe with the maximum acceleration.
+
+    This is equivalent to :py:func:`strafe_fme_theta` with the theta given by
+    :py:func:`strafe_optimal_theta`, negated if *left* is false, but computes
+    the cosine and sine of the optimal theta algebraically without calling any
+    trigonometric function. The resulting velocity differs from that of the
+    equivalent call by a relative error of at most 1e-14.
+
+    >>> v = [400.0, 0.0]
+    >>> strafe_optimal(v, 30, 3.2)
+    >>> [round(c, 4) for c in v]
+    [400.2144, 3.1928]
+    """
+    vx, vy = v[0], v[1]
+    speed = math.sqrt(vx * vx + vy * vy)
+    if common.float_zero(speed):
+        raise ValueError('speed cannot be 0')
+    ct = min(max((L - gamma1) / speed, 0.0), 1.0)
+    gamma2 = L - speed * ct
+    if gamma2 <= 0.0:
+        return
+    st = math.sqrt(1 - ct * ct)
+    if not left:
+        st = -st
+    inv = 1 / speed
+    hx, hy = vx * inv, vy * inv
+    mu = min(gamma1, gamma2)
+    v[0] = vx + (hx * ct - hy * st) * mu
+    v[1] = vy + (hx * st + hy * ct) * mu
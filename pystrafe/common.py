@@ -22,8 +22,6 @@ def vec_set(v, value, length=None):
 
 def vec_length(v, length=None):
     """Compute the norm of *v*."""
-    if length is None:
-        length = len(v)
     return math.sqrt(vec_dot(v, v, length))
 
 def vec_normalize(v):
@@ -36,6 +34,11 @@ def vec_dot(a, b, length=None):
     """Dot product of vectors *a* and *b*."""
     if length is None:
         length = len(a)
+    # Unrolled for the common lengths, summing in the same order as the loop.
+    if length == 3:
+        return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+    if length == 2:
+        return a[0] * b[0] + a[1] * b[1]
     return sum(a[i] * b[i] for i in range(length))
 
 def vec_cross(a, b):
@@ -110,6 +110,71 @@ def fall(vfz):
     """
     return max(0.0, 25 * (vfz - 580) / 111)
 
+def fall_speed(dmg):
+    """Compute the maximum touch-ground vertical speed given fall damage.
+
+    This is the inverse of :py:func:`fall`. Return the highest *vfz* at which
+    the untruncated fall damage does not exceed *dmg*. Raise
+    :py:exc:`ValueError` if *dmg* is negative.
+
+    >>> fall_speed(0)
+    580.0
+    >>> fall_speed(100)
+    1024.0
+    """
+    if dmg < 0:
+        raise ValueError('dmg must be >= 0')
+    return 580 + 111 * dmg / 25
+
+def fall_z(speedzi, z, g):
+    """Compute the fall damage from landing at a height.
+
+    The player starts with vertical speed *speedzi* and lands on a surface at
+    height *z* relative to the starting position while descending, that is at
+    the later time given by :py:func:`pystrafe.motion.gravity_time_speediz_z`.
+    Return the untruncated damage. Raise :py:exc:`ValueError` if *z* is
+    unreachable.
+
+    >>> '{:.10g}'.format(fall_z(268, -200, 800))
+    '10.35100565'
+    """
+    return fall(math.sqrt(speedzi * speedzi - 2 * g * z))
+
+def fall_min_z(dmg, speedzi, g):
+    """Compute the lowest landing height given fall damage.
+
+    Return the lowest height relative to the starting position, on which the
+    player with initial vertical speed *speedzi* can land while taking at most
+    *dmg* untruncated fall damage. This is usually negative. A positive value
+    means the player must land above the starting position, which is only
+    possible when moving upwards. *g* must be positive.
+
+    >>> fall_min_z(0, 268, 800)
+    -165.36
+    >>> '{:.10g}'.format(fall_z(268, fall_min_z(10, 268, 800), 800))
+    '10'
+    """
+    if g <= 0:
+        raise ValueError('g must be > 0')
+    speedf = fall_speed(dmg)
+    return (speedzi * speedzi - speedf * speedf) / (2 * g)
+
+def fall_max_speedzi(dmg, z, g):
+    """Compute the maximum initial vertical speed given fall damage.
+
+    Return the highest magnitude of the initial vertical speed with which the
+    player can land at height *z* relative to the starting position while
+    taking at most *dmg* untruncated fall damage. For *z* at or below the
+    starting position the direction of the speed does not matter, while for a
+    positive *z* the speed must be upwards to reach the landing height. Raise
+    :py:exc:`ValueError` if even a zero initial speed results in more damage.
+
+    >>> fall_max_speedzi(0, -100, 800)
+    420.0
+    """
+    speedf = fall_speed(dmg)
+    return math.sqrt(speedf * speedf + 2 * g * z)
+
 #def radius_falloff():
 #    pass
 #
@@ -0,0 +1,153 @@
+"""Index of the transitions between HP and AP states under damage.
+
+A :py:class:`TransitionIndex` enumerates every state of integer HP and
+quantised AP in a range, and precomputes the state reached from each of them
+by each damage in a given set using :py:func:`pystrafe.vec.damage.hpap_damage`.
+The transitions are stored as a dense table of state numbers, together with
+the reverse transitions in compressed sparse row form, so that forward steps,
+reverse lookups and shortest damage sequences between two states are answered
+without calling the damage functions again.
+"""
+
+import numpy as np
+from pystrafe.vec import damage as vdamage
+
+class TransitionIndex:
+    """Transitions between HP and AP states for a set of damages.
+
+    *dmgs* is a sequence of damage values, referred to by their indices. The
+    states are all integer HP values in the inclusive range *hp_range*, and AP
+    values from 0 to *ap_max* in steps of *ap_step*. The AP after a damage is
+    rounded to the nearest step, which is exact if the damages are multiples
+    of ``2.5 * ap_step``. Transitions leaving the range, including those
+    resulting in death when the range starts at 1, are not recorded.
+
+    >>> index = TransitionIndex([10, 20, 50])
+    >>> index.step(100, 50, 2)
+    (90, 30.0)
+    >>> index.shortest_sequence(100, 50, 94, 38)
+    [20.0, 10.0]
+    """
+
+    def __init__(self, dmgs, hp_range=(1, 100), ap_max=100.0, ap_step=0.1):
+        self.dmgs = np.array(dmgs, dtype=float)
+        if self.dmgs.ndim != 1 or not np.all(np.isfinite(self.dmgs)):
+            raise ValueError('dmgs must be a 1D sequence of finite values')
+        if hp_range[0] > hp_range[1]:
+            raise ValueError('empty hp_range')
+        if ap_step <= 0 or ap_max < 0:
+            raise ValueError('ap_step must be > 0 and ap_max >= 0')
+        self.hp_min, self.hp_max = int(hp_range[0]), int(hp_range[1])
+        self.ap_step = ap_step
+        self.n_ap = int(round(ap_max / ap_step)) + 1
+        n_hp = self.hp_max - self.hp_min + 1
+        self.n_states = n_hp * self.n_ap
+        n_dmgs = len(self.dmgs)
+
+        hp = np.arange(self.hp_min, self.hp_max + 1, dtype=float)
+        ap = np.arange(self.n_ap) * ap_step
+        res = vdamage.hpap_damage(hp[:, None, None], ap[None, :, None], self.dmgs)
+        new_hp = res['hp']
+        new_ap = np.rint(res['ap'] / ap_step)
+        with np.errstate(invalid='ignore'):
+            valid = (new_hp >= self.hp_min) & (new_hp <= self.hp_max) \
+                & (new_ap < self.n_ap)
+        dst = (new_hp - self.hp_min) * self.n_ap + new_ap
+        #: The state reached from each state by each damage, or -1.
+        self.next = np.where(valid, dst, -1).astype(np.int32).reshape(
+            self.n_states, n_dmgs)
+
+        # Reverse transitions as edge numbers state * n_dmgs + dmg index,
+        # grouped by the state they lead to.
+        flat = self.next.ravel()
+        edges = np.flatnonzero(flat >= 0)
+        order = np.argsort(flat[edges], kind='stable')
+        self._rev_edges = edges[order].astype(np.int32)
+        self._rev_ptr = np.zeros(self.n_states + 1, dtype=np.int64)
+        np.cumsum(np.bincount(flat[edges], minlength=self.n_states),
+                  out=self._rev_ptr[1:])
+
+    @property
+    def nbytes(self):
+        """Total size of the index arrays in bytes."""
+        return self.next.nbytes + self._rev_edges.nbytes + self._rev_ptr.nbytes
+
+    def state(self, hp, ap):
+        """Return the state number of *hp* and *ap*.
+
+        *hp* must be an integer, and *ap* is rounded to the nearest step.
+        """
+        if not float(hp).is_integer():
+            raise ValueError('hp must be an integer')
+        a = int(round(ap / self.ap_step))
+        if not (self.hp_min <= hp <= self.hp_max and 0 <= a < self.n_ap):
+            raise ValueError('state out of range')
+        return (int(hp) - self.hp_min) * self.n_ap + a
+
+    def hpap(self, state):
+        """Return the (*hp*, *ap*) of a state number."""
+        hp, a = divmod(int(state), self.n_ap)
+        return hp + self.hp_min, a * self.ap_step
+
+    def step(self, hp, ap, i):
+        """Return the (*hp*, *ap*) after the damage with index *i*, or
+        ``None`` if it leaves the range."""
+        dst = self.next[self.state(hp, ap), i]
+        return None if dst < 0 else self.hpap(dst)
+
+    def predecessors(self, hp, ap):
+        """Return a list of (*hp*, *ap*, *dmg*) from which a single damage
+        *dmg* leads to *hp* and *ap*."""
+        s = self.state(hp, ap)
+        edges = self._rev_edges[self._rev_ptr[s]:self._rev_ptr[s + 1]]
+        src, i = np.divmod(edges, len(self.dmgs))
+        return [self.hpap(s) + (float(self.dmgs[j]),) for s, j in zip(src, i)]
+
+    def reverse_reachable(self, hp, ap, steps=1):
+        """Return an array of shape (N, 2) of the (*hp*, *ap*) states from
+        which some sequence of exactly *steps* damages leads to *hp* and
+        *ap*."""
+        # The extra last element is never set, and is what -1 indexes.
+        mask = np.zeros(self.n_states + 1, dtype=bool)
+        mask[self.state(hp, ap)] = True
+        for _ in range(steps):
+            mask[:-1] = mask[self.next].any(axis=1)
+        hp, a = np.divmod(np.flatnonzero(mask[:-1]), self.n_ap)
+        return np.stack([hp + self.hp_min, a * self.ap_step], axis=-1)
+
+    def shortest_sequence(self, hp, ap, target_hp, target_ap, max_steps=None):
+        """Return the shortest list of damages leading from *hp* and *ap* to
+        *target_hp* and *target_ap*, or ``None`` if there is none within
+        *max_steps* damages.
+
+        The search is breadth-first over whole levels at a time. Among
+        sequences of the same length, the one returned depends only on the
+        order of the states and of the damages, so the result is
+        deterministic.
+        """
+        start = self.state(hp, ap)
+        goal = self.state(target_hp, target_ap)
+        n_dmgs = len(self.dmgs)
+        parent = np.full(self.n_states, -1, dtype=np.int64)
+        visited = np.zeros(self.n_states, dtype=bool)
+        visited[start] = True
+        frontier = np.array([start])
+        steps = 0
+        while not visited[goal]:
+            if not len(frontier) or (max_steps is not None and steps >= max_steps):
+                return None
+            steps += 1
+            edges = (frontier[:, None] * n_dmgs + np.arange(n_dmgs)).ravel()
+            dst = self.next.ravel()[edges]
+            keep = dst >= 0
+            keep[keep] = ~visited[dst[keep]]
+            frontier, first = np.unique(dst[keep], return_index=True)
+            visited[frontier] = True
+            parent[frontier] = edges[keep][first]
+
+        seq = []
+        s = goal
+        while s != start:
+            s, i = divmod(int(parent[s]), n_dmgs)
+            seq.append(float(self.dmgs[i]))
+        return seq[::-1]
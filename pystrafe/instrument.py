@@ -0,0 +1,203 @@
+"""Opt-in call counting and timing of the functions in :py:mod:`pystrafe`.
+
+While an :py:class:`Instrument` is active, the public functions of the chosen
+submodules are replaced by wrappers that record the number of calls, the
+cumulative time spent in them and the number of calls that raised. The
+scalar root finder and minimiser used by :py:mod:`pystrafe.motion` are
+wrapped too, recording their iterations and function evaluations under the
+names ``brentq`` and ``minimize_scalar``. Nothing is wrapped otherwise, so
+the instrumentation costs nothing when not in use.
+
+>>> from pystrafe import motion
+>>> with Instrument() as ins:
+...     speed = motion.strafe_solve_speedxi(0, 181760, 100, -18, 800)
+>>> stats = ins.as_dict()
+>>> stats['pystrafe.motion.strafe_solve_speedxi']['calls']
+1
+>>> stats['brentq']['nfev'] > 0
+True
+
+The times are inclusive of the time spent in other instrumented functions
+called in turn. Only calls made through the module attributes are seen, as
+in ``common.vec_dot(a, b)``, which is how the package itself calls its
+functions, but not calls through names imported before the instrumentation
+started. The counters are not synchronised between threads, and calls in
+other processes, such as the workers of :py:mod:`pystrafe.parallel`, are not
+recorded.
+
+Setting the environment variable ``PYSTRAFE_INSTRUMENT`` to a file path
+before importing :py:mod:`pystrafe` instruments the default modules for the
+lifetime of the process, and writes the statistics to that path as JSON at
+exit.
+"""
+
+import json
+import time
+import atexit
+import inspect
+import functools
+import importlib
+
+#: Submodules instrumented by default.
+default_modules = ('basic', 'common', 'damage', 'ladder', 'motion', 'view')
+
+_active = None
+
+class _Record:
+    __slots__ = ('calls', 'time', 'failures', 'iterations', 'nfev')
+
+    def __init__(self, solver=False):
+        self.calls = 0
+        self.time = 0.0
+        self.failures = 0
+        self.iterations = self.nfev = 0 if solver else None
+
+    def as_dict(self):
+        d = {'calls': self.calls, 'time': self.time, 'failures': self.failures}
+        if self.nfev is not None:
+            d['iterations'] = self.iterations
+            d['nfev'] = self.nfev
+        return d
+
+class _Optimize:
+    """Proxy of the module returned by ``motion._optimize`` that records the
+    iterations and function evaluations of its solvers."""
+
+    def __init__(self, opt, records):
+        self._opt = opt
+        self._brentq = records.setdefault('brentq', _Record(True))
+        self._minimize_scalar = records.setdefault('minimize_scalar',
+                                                   _Record(True))
+
+    def __getattr__(self, name):
+        return getattr(self._opt, name)
+
+    def brentq(self, f, a, b, **kwargs):
+        rec = self._brentq
+        full_output = kwargs.pop('full_output', False)
+        start = time.perf_counter()
+        try:
+            root, res = self._opt.brentq(f, a, b, full_output=True, **kwargs)
+        except Exception:
+            rec.failures += 1
+            raise
+        finally:
+            rec.calls += 1
+            rec.time += time.perf_counter() - start
+        rec.iterations += res.iterations
+        rec.nfev += res.function_calls
+        return (root, res) if full_output else root
+
+    def minimize_scalar(self, fun, **kwargs):
+        rec = self._minimize_scalar
+        start = time.perf_counter()
+        try:
+            res = self._opt.minimize_scalar(fun, **kwargs)
+        except Exception:
+            rec.failures += 1
+            raise
+        finally:
+            rec.calls += 1
+            rec.time += time.perf_counter() - start
+        rec.iterations += res.nit
+        rec.nfev += res.nfev
+        if not res.success:
+            rec.failures += 1
+        return res
+
+def _wrap(func, rec):
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            rec.failures += 1
+            raise
+        finally:
+            rec.calls += 1
+            rec.time += perf_counter() - start
+    return wrapper
+
+class Instrument:
+    """Context manager recording the calls of the functions in *modules*.
+
+    *modules* are names of submodules of :py:mod:`pystrafe`, such as
+    ``'motion'`` or ``'vec.motion'``. Only one instance may be active at a
+    time, but an instance may be entered again to keep accumulating.
+    """
+
+    def __init__(self, modules=default_modules):
+        self.modules = tuple(modules)
+        self._records = {}
+        self._patches = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        """Start recording, like entering the context."""
+        global _active
+        if _active is not None:
+            raise RuntimeError('another Instrument is already active')
+        _active = self
+        for name in self.modules:
+            module = importlib.import_module('pystrafe.' + name)
+            for attr, obj in list(vars(module).items()):
+                if attr.startswith('_') or not inspect.isfunction(obj) \
+                        or obj.__module__ != module.__name__:
+                    continue
+                rec = self._records.setdefault(module.__name__ + '.' + attr,
+                                               _Record())
+                self._patch(module, attr, _wrap(obj, rec))
+        motion = importlib.import_module('pystrafe.motion')
+        proxy = _Optimize(motion._optimize(), self._records)
+        self._patch(motion, '_optimize', lambda: proxy)
+
+    def _patch(self, module, attr, value):
+        self._patches.append((module, attr, getattr(module, attr)))
+        setattr(module, attr, value)
+
+    def stop(self):
+        """Stop recording and restore the original functions."""
+        global _active
+        for module, attr, original in reversed(self._patches):
+            setattr(module, attr, original)
+        self._patches.clear()
+        if _active is self:
+            _active = None
+
+    def reset(self):
+        """Discard the statistics recorded so far."""
+        for rec in self._records.values():
+            rec.__init__(rec.nfev is not None)
+
+    def as_dict(self):
+        """Return a dict mapping the names of the functions that were called
+        to dicts of their statistics, with the keys *calls*, *time* in
+        seconds and *failures*, and for the solvers also *iterations* and
+        *nfev*."""
+        return {name: rec.as_dict()
+                for name, rec in sorted(self._records.items()) if rec.calls}
+
+    def to_json(self, path=None):
+        """Return the statistics of :py:meth:`as_dict` as a JSON string, or
+        write them to the file at *path* if given."""
+        if path is None:
+            return json.dumps(self.as_dict(), indent=1)
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=1)
+
+def _enable_from_environ(path):
+    """Instrument the default modules until exit and then write the
+    statistics to *path*."""
+    ins = Instrument()
+    ins.start()
+    atexit.register(ins.to_json, path)
+    return ins
@@ -2,8 +2,11 @@
 """
 
 import math
+import collections
 from pystrafe import common
 
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
 def climb_velocity(n, f, s, F, S):
     """Compute the climbing velocity given unit acceleration vectors.
 
@@ -19,31 +22,32 @@ def climb_velocity(n, f, s, F, S):
 
     Return the player climbing velocity in 3D.
     """
-    if not common.float_equal(common.vec_dot(n, n, 3), 1):
+    n0, n1, n2 = n[0], n[1], n[2]
+    if not common.float_equal(n0 * n0 + n1 * n1 + n2 * n2, 1):
         raise ValueError('n must be a unit vector')
     if not common.float_equal(common.vec_dot(f, f, 3), 1):
         raise ValueError('f must be a unit vector')
     if not common.float_equal(common.vec_dot(s, s, 3), 1):
         raise ValueError('s must be a unit vector')
 
-    f, s = f[:], s[:]
-    common.vec_mul(f, 0 if common.float_zero(F) else math.copysign(200, F))
-    common.vec_mul(s, 0 if common.float_zero(S) else math.copysign(200, S))
+    fmul = 0 if common.float_zero(F) else math.copysign(200, F)
+    smul = 0 if common.float_zero(S) else math.copysign(200, S)
+    ux = f[0] * fmul + s[0] * smul
+    uy = f[1] * fmul + s[1] * smul
+    uz = f[2] * fmul + s[2] * smul
 
-    u = [0.0, 0.0, 0.0]
-    common.vec_add(u, f)
-    common.vec_add(u, s)
-    cross = common.vec_cross([0, 0, 1], n)
-    cross_norm = common.vec_dot(cross, cross)
+    # The cross product of the z axis with n is (-n1, n0, 0), and the cross
+    # product of n with that is (-n2 n0, -n2 n1, n0^2 + n1^2).
+    cross_norm = n1 * n1 + n0 * n0
     if common.float_zero(cross_norm):
-        fac = [0.0, 0.0, 0.0]
+        fx = fy = fz = 0.0
     else:
-        fac = common.vec_cross(n, cross)
-        common.vec_mul(fac, 1 / cross_norm)
-    common.vec_add(fac, n)
-    common.vec_mul(fac, common.vec_dot(u, n))
-    common.vec_sub(u, fac)
-    return u
+        inv = 1 / cross_norm
+        fx = -(n2 * n0) * inv
+        fy = -(n2 * n1) * inv
+        fz = (n0 * n0 + n1 * n1) * inv
+    udotn = ux * n0 + uy * n1 + uz * n2
+    return [ux - (fx + n0) * udotn, uy - (fy + n1) * udotn, uz - (fz + n2) * udotn]
 
 def maxspeed_normal(n, vdir, F, S):
     """Compute the viewwangles for climbing a ladder at maximum speed.
@@ -62,7 +66,7 @@ def maxspeed_normal(n, vdir, F, S):
 
     .. _Half-Life Physics Reference: https://www.jwchong.com/hl/
     """
-    if not math.isclose(common.vec_dot(n, n, 3), 1):
+    if not math.isclose(n[0] * n[0] + n[1] * n[1] + n[2] * n[2], 1):
         raise ValueError('n must be a unit vector')
 
     if math.isclose(math.fabs(n[2]), 1):
@@ -84,3 +88,78 @@ def maxspeed_normal(n, vdir, F, S):
         pitch = -sign_F * 0.5 * math.pi
 
     return pitch, yaw
+
+def _negative(a):
+    """Return whether the sign bit of *a* is set, like ``math.copysign(1, a) <
+    0`` but faster for the common nonzero values."""
+    return a < 0 or (not a > 0 and math.copysign(1, a) < 0)
+
+class LadderCache:
+    """Memoised front end of :py:func:`maxspeed_normal`.
+
+    The normals are quantised to multiples of *quantum* in each component to
+    form the cache keys, so normals closer than that share the same solution,
+    which is computed from the first of them to be looked up. If *quantum* is
+    ``None``, the components are used as they are, which is faster when the
+    same normals are always given exactly, such as those read from a map. On
+    a miss, the
+    solutions for every sign combination of *vdir*, *F* and *S* are computed
+    together, so that later lookups of the same normal never compute again.
+    At most *maxsize* normals are kept, discarding the least recently used
+    ones, or any number of them if *maxsize* is ``None``.
+
+    >>> cache = LadderCache()
+    >>> cache.maxspeed_normal([1, 0, 0], 1, 1, -1)
+    (-1.5707963267948966, 1.5707963267948966)
+    >>> cache.maxspeed_normal([1, 0, 0], -1, 1, 1)
+    (1.5707963267948966, 1.5707963267948966)
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+    """
+
+    def __init__(self, maxsize=1024, quantum=1e-6):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('maxsize must be > 0')
+        if quantum is not None and quantum <= 0:
+            raise ValueError('quantum must be > 0')
+        self.maxsize = maxsize
+        self.quantum = quantum
+        self.hits = self.misses = 0
+        self._inv_quantum = None if quantum is None else 1 / quantum
+        self._cache = collections.OrderedDict()
+
+    def maxspeed_normal(self, n, vdir, F, S):
+        """Return the same as :py:func:`maxspeed_normal`, using the cache."""
+        # Checked before the lookup, as a non-unit normal may share the key of
+        # a cached unit normal.
+        if not math.isclose(n[0] * n[0] + n[1] * n[1] + n[2] * n[2], 1):
+            raise ValueError('n must be a unit vector')
+        q = self._inv_quantum
+        if q is None:
+            key = (n[0], n[1], n[2])
+        else:
+            key = (round(n[0] * q), round(n[1] * q), round(n[2] * q))
+        try:
+            sols = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            # Only the signs of F and S relative to vdir matter.
+            sols = (maxspeed_normal(n, 1, 1, 1), maxspeed_normal(n, 1, 1, -1),
+                    maxspeed_normal(n, 1, -1, 1), maxspeed_normal(n, 1, -1, -1))
+            self._cache[key] = sols
+            if self.maxsize is not None and len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        down = _negative(vdir)
+        return sols[(_negative(F) != down) << 1 | (_negative(S) != down)]
+
+    def cache_info(self):
+        """Return a :py:class:`CacheInfo` of the hit and miss statistics."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        """Discard all cached solutions and reset the statistics."""
+        self._cache.clear()
+        self.hits = self.misses = 0
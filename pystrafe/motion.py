@@ -14,18 +14,31 @@ these routines in this module assume:
 - strafing along a perfect straight line
 
 These assumptions make implementations much less complex, less error prone, and
-less information needed to perform the computations.
+less information needed to perform the computations. The effect of anglemod can
+be quantified by comparing with :py:func:`pystrafe.sim.strafe_distance_anglemod`.
 
 Consult the Half-Life physics documentation at https://www.jwchong.com/hl/.
 """
 
+import sys
 import math
-import scipy.optimize as opt
+import functools
 from pystrafe import common
 
 jumpspeed = 268.32815729997476
 jumpspeedlj = 299.33259094191531
 
+@functools.lru_cache(maxsize=None)
+def _optimize():
+    """Return ``scipy.optimize`` if installed, otherwise the fallback
+    :py:mod:`pystrafe.optimize`."""
+    # Deferred as importing scipy takes a while
+    try:
+        import scipy.optimize as opt
+    except ImportError:
+        from pystrafe import optimize as opt
+    return opt
+
 def strafe_K(L, tau, M, A):
     """Compute *K* based on strafing parameters.
 
@@ -54,6 +67,82 @@ def strafe_K_std(tau):
     """
     return strafe_K(30, tau, 320, 10)
 
+class StrafeConfig:
+    r"""Strafing parameters with the derived constants computed once.
+
+    The constructor takes the same parameters as :py:func:`strafe_K`, plus
+    the gravity *g*. The methods are the functions in this module with the
+    *K*, *tau* and *g* arguments bound, skipping the validation of *K* and the
+    recomputation of the constants derived from it. They return exactly the
+    same results as the functions. Use :py:func:`strafe_config` to share
+    instances between callers.
+
+    The attributes must not be modified. *K* is as given by
+    :py:func:`strafe_K`, *gamma1* is :math:`\tau MA`, and *LtauMA* is
+    :math:`\min(L, M) - \tau MA`.
+
+    >>> cfg = StrafeConfig(30, 0.001, 320, 10)
+    >>> cfg.K
+    181760.0
+    >>> cfg.strafe_distance(2.5, 400) == strafe_distance(2.5, 400, cfg.K)
+    True
+    """
+
+    __slots__ = ('L', 'tau', 'M', 'A', 'g', 'K', 'gamma1', 'LtauMA', '_K15',
+                 '_K_zero', '_K_cbrt_inv')
+
+    def __init__(self, L, tau, M, A, g=800.0):
+        self.K = strafe_K(L, tau, M, A)
+        self.L, self.tau, self.M, self.A, self.g = L, tau, M, A, g
+        self.gamma1 = tau * M * A
+        self.LtauMA = min(L, M) - self.gamma1
+        self._K15 = 1.5 * self.K
+        self._K_zero = common.float_zero(self.K)
+        # None defers the power to the solver, which raises for K = 0 at the
+        # same point as strafe_solve_speedxi does
+        self._K_cbrt_inv = self.K ** (-1 / 3) if self.K > 0 else None
+
+    def __repr__(self):
+        return 'StrafeConfig({!r}, {!r}, {!r}, {!r}, {!r})'.format(
+            self.L, self.tau, self.M, self.A, self.g)
+
+    def strafe_speedxf(self, t, speed):
+        """Bound version of :py:func:`pystrafe.motion.strafe_speedxf`."""
+        return math.sqrt(speed * speed + t * self.K)
+
+    def strafe_distance(self, t, speed):
+        """Bound version of :py:func:`pystrafe.motion.strafe_distance`."""
+        return _strafe_distance(t, speed, self.K, self._K15)
+
+    def strafe_distance_frames(self, n, speed):
+        """Bound version of :py:func:`pystrafe.motion.strafe_distance_frames`."""
+        return strafe_distance_frames(n, speed, self.K, self.tau)
+
+    def strafe_time(self, x, speedxi):
+        """Bound version of :py:func:`pystrafe.motion.strafe_time`."""
+        return _strafe_time(x, speedxi, self.K, self._K15, self._K_zero)
+
+    def strafe_solve_speedxi(self, speedzi, x, z, method='brentq'):
+        """Bound version of :py:func:`pystrafe.motion.strafe_solve_speedxi`."""
+        return _strafe_solve_speedxi(speedzi, self.K, x, z, self.g, method,
+                                     self._K15, self._K_cbrt_inv)
+
+    def solve_boost_min_dmg(self, vi, x, z):
+        """Bound version of :py:func:`pystrafe.motion.solve_boost_min_dmg`."""
+        return _solve_boost_min_dmg(vi, self.K, x, z, self.g, self._K15,
+                                    self._K_zero)
+
+@functools.lru_cache(maxsize=128)
+def strafe_config(L, tau, M, A, g=800.0):
+    """Return a shared :py:class:`StrafeConfig` for the given parameters.
+
+    The most recently used 128 configurations are cached.
+
+    >>> strafe_config(30, 0.001, 320, 10) is strafe_config(30, 0.001, 320, 10)
+    True
+    """
+    return StrafeConfig(L, tau, M, A, g)
+
 def strafe_speedxf(t, speed, K):
     """Compute the speed after strafing for *t* seconds.
 
@@ -94,15 +183,70 @@ def strafe_distance(t, speed, K):
     """
     if K < 0:
         raise ValueError('K must be > 0')
+    return _strafe_distance(t, speed, K, 1.5 * K)
+
+def _strafe_distance(t, speed, K, K15):
     speed = math.fabs(speed)
-    if common.float_equal(K, 0.0):
+    if K == 0.0:
         return speed * t
     speedsq = speed * speed
-    ret = ((speedsq + t * K) ** 1.5 - speedsq * speed) / (1.5 * K)
+    ret = ((speedsq + t * K) ** 1.5 - speedsq * speed) / K15
     if isinstance(ret, complex):
         raise ValueError('math domain error')
     return math.fabs(ret)
 
+def strafe_distance_frames(n, speed, K, tau):
+    r"""Compute the distance and speed after strafing for *n* frames.
+
+    This is the discrete time counterpart of :py:func:`strafe_distance` and
+    :py:func:`strafe_speedxf`. The speed after frame :math:`i` is :math:`v_i =
+    \sqrt{v_0^2 + iK\tau}` and the player moves by :math:`v_i \tau` in that
+    frame, so the distance is :math:`\tau \sum_{i=1}^n v_i`. Return a 2-tuple
+    of the distance and :math:`v_n`.
+
+    The sum is evaluated in constant time. The first frames are summed
+    explicitly until :math:`v_i^2 \ge 32 K\tau`, which takes at most 32 frames,
+    and the remaining frames by the Euler-Maclaurin formula with correction
+    terms up to :math:`B_6`. The truncation error is below :math:`2 \times
+    10^{-15}` times the speed of a single frame, so the result agrees with
+    summing frame by frame up to rounding errors.
+
+    >>> K = strafe_K_std(0.001)
+    >>> x, v = strafe_distance_frames(2500, 400, K, 0.001)
+    >>> '{:.10g} {:.10g}'.format(x, v)
+    '1531.842728 783.8367177'
+    >>> strafe_distance_frames(3, 10, 0, 0.01)
+    (0.3, 10.0)
+    """
+    if n < 0:
+        raise ValueError('n must be >= 0')
+    if K < 0:
+        raise ValueError('K must be > 0')
+    if tau < 0:
+        raise ValueError('tau must be > 0')
+    a = speed * speed
+    b = K * tau
+    speedf = math.sqrt(a + n * b)
+    if b == 0:
+        return n * tau * speedf, speedf
+
+    m = 0 if a >= 32 * b else min(n, math.ceil(32 - a / b))
+    total = math.fsum(math.sqrt(a + i * b) for i in range(1, m + 1))
+    if n > m:
+        wm, wn = a + m * b, a + n * b
+        sm, sn = math.sqrt(wm), speedf
+        # The integral of sqrt(a + bx) from m to n, written without the
+        # cancellation in the difference of the 3/2 powers.
+        total += 2 / 3 * (n - m) * (wn + sn * sm + wm) / (sn + sm)
+        total += 0.5 * (sn - sm)
+        # Derivatives of odd orders 1, 3 and 5 weighted by B2/2!, B4/4! and
+        # B6/6!, excluding the f(m) term that is already summed above.
+        b2, b3 = b * b, b * b * b
+        total += b / 24 * (1 / sn - 1 / sm)
+        total -= b3 / 1920 * (1 / (wn * wn * sn) - 1 / (wm * wm * sm))
+        total += b3 * b2 / 9216 * (1 / (wn ** 4 * sn) - 1 / (wm ** 4 * sm))
+    return tau * total, speedf
+
 def strafe_time(x, speedxi, K):
     """Compute the time it takes to strafe for the given distance and initial
     speed.
@@ -118,17 +262,20 @@ def strafe_time(x, speedxi, K):
     """
     if K < 0:
         raise ValueError('K must be > 0')
+    return _strafe_time(x, speedxi, K, 1.5 * K, common.float_zero(K))
+
+def _strafe_time(x, speedxi, K, K15, K_zero):
     speedxi = math.fabs(speedxi)
     x = math.fabs(x)
     if common.float_zero(x):
         return 0.0
-    if common.float_zero(K):
+    if K_zero:
         try:
             return x / speedxi
         except ZeroDivisionError:
             return math.inf
     sq = speedxi * speedxi
-    ret = ((sq * speedxi + 1.5 * K * x) ** (2 / 3) - sq) / K
+    ret = ((sq * speedxi + K15 * x) ** (2 / 3) - sq) / K
     # ret < 0 can occur from the subtraction with small x and big speedxi
     return max(ret, 0.0)
 
@@ -169,7 +316,23 @@ def gravity_time_speediz_z(speedzi, z, g):
     t2 = (speedzi + sqrt_tmp) / g
     return t1, t2
 
-def strafe_solve_speedxi(speedzi, K, x, z, g):
+def _strafe_solve_speedxi_newton(c, D, rtol=4 * sys.float_info.epsilon,
+                                 maxiter=50):
+    # Writing s = u - v, where u^3 = v^3 + c and u^2 - v^2 = D, turns the
+    # equation into the quartic s^4 - 4cs + 3D^2 = 0 with v = (D/s - s)/2. The
+    # quartic is convex and decreasing to the left of its smaller root, so
+    # Newton's method from s = 0 increases monotonically towards it. The first
+    # step lands on the asymptotic solution v = x / tz.
+    s = 0.0
+    for _ in range(maxiter):
+        ss = s * s
+        step = (ss * ss - 4 * c * s + 3 * D * D) / (4 * (ss * s - c))
+        s -= step
+        if -step <= rtol * s:
+            return max(0.5 * (D / s - s), 0.0)
+    raise RuntimeError('failed to converge after {} iterations'.format(maxiter))
+
+def strafe_solve_speedxi(speedzi, K, x, z, g, method='brentq'):
     """Compute the initial horizontal speed needed to reach the final position.
 
     z can be negative.
@@ -189,10 +352,25 @@ def strafe_solve_speedxi(speedzi, K, x, z, g):
     for the vertical position to move up to the final position before the
     horizontal position should hit it.
 
-    The result is computed using the ``brentq`` function provided by scipy.
+    By default, the result is computed using the ``brentq`` function provided
+    by scipy, or the equivalent :py:func:`pystrafe.optimize.brentq` if scipy is
+    not installed. If *method* is ``'newton'``, the equation is instead transformed
+    into a quartic whose relevant root is found by Newton's method, which
+    typically converges in three to four iterations and remains accurate for
+    very large speeds where the subtraction in the original equation loses
+    precision.
+
+    >>> K = strafe_K(30, 0.001, 320, 10)
+    >>> '{:.10g}'.format(strafe_solve_speedxi(0, K, 100, -18, 800, 'newton'))
+    '450.6474499'
     """
     if K < 0:
         raise ValueError('K must be > 0')
+    return _strafe_solve_speedxi(speedzi, K, x, z, g, method, 1.5 * K)
+
+def _strafe_solve_speedxi(speedzi, K, x, z, g, method, K15, K_cbrt_inv=None):
+    if method not in ('brentq', 'newton'):
+        raise ValueError('unknown method: {}'.format(method))
 
     sqrt_tmp = math.sqrt(speedzi * speedzi - 2 * g * z)
     tz = speedzi - sqrt_tmp
@@ -203,7 +381,9 @@ def strafe_solve_speedxi(speedzi, K, x, z, g):
     tz /= g
 
     x = math.fabs(x)
-    txmax = (1.5 * x) ** (2 / 3) * K ** (-1 / 3)
+    if K_cbrt_inv is None:
+        K_cbrt_inv = K ** (-1 / 3)
+    txmax = (1.5 * x) ** (2 / 3) * K_cbrt_inv
     if common.float_zero(txmax):
         return 0.0
 
@@ -212,16 +392,19 @@ def strafe_solve_speedxi(speedzi, K, x, z, g):
     elif common.float_zero(tz):
         return math.inf
 
+    tmp = K15 * x
+    if method == 'newton':
+        return _strafe_solve_speedxi_newton(tmp, K * tz)
     # The upper bound of x / tz is the minimum _constant_ speed needed
-    tmp = 1.5 * K * x
-    return opt.brentq(
+    return _optimize().brentq(
         lambda v: ((v ** 3 + tmp) ** (2 / 3) - v ** 2) / K - tz, 0, x / tz)
 
 def solve_boost_min_dmg(vi, K, x, z, g):
     """Compute the speed boost that minimises health loss.
 
     The minimisation is done using the ``minimize_scalar`` function provided by
-    scipy running the Brent's algorithm.
+    scipy running the Brent's algorithm, or the equivalent
+    :py:func:`pystrafe.optimize.minimize_scalar` if scipy is not installed.
 
     The resulting curve tends to end with a negative vertical velocity.
 
@@ -241,9 +424,11 @@ def solve_boost_min_dmg(vi, K, x, z, g):
     """
     if K < 0:
         raise ValueError('K must be > 0')
+    return _solve_boost_min_dmg(vi, K, x, z, g, 1.5 * K, common.float_zero(K))
 
+def _solve_boost_min_dmg(vi, K, x, z, g, K15, K_zero):
     def compute_dy(dx):
-        tx = strafe_time(x, vix + dx, K)
+        tx = _strafe_time(x, vix + dx, K, K15, K_zero)
         try:
             dy = gravity_speediz_distance_time(tx, z, g) - vi[1]
         except ValueError:
@@ -258,7 +443,7 @@ def solve_boost_min_dmg(vi, K, x, z, g):
 
     x = math.fabs(x)
     vix = math.fabs(vi[0])
-    res = opt.minimize_scalar(fun)
+    res = _optimize().minimize_scalar(fun)
     dx = max(res.x, 0.0)
     dy = compute_dy(dx)
     return [dx, dy]
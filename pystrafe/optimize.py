@@ -0,0 +1,240 @@
+"""Pure Python scalar root finding and minimisation.
+
+These are fallbacks for the few routines in :py:mod:`pystrafe.motion` that
+otherwise use scipy, so that the package works without scipy installed. They
+follow the algorithms of ``scipy.optimize.brentq`` and the Brent method of
+``scipy.optimize.minimize_scalar`` step by step, and therefore give the same
+results, but skip the argument handling and result objects of scipy that
+dominate the cost of solving a single cheap scalar problem.
+"""
+
+import math
+import collections
+
+RootResults = collections.namedtuple(
+    'RootResults', 'root iterations function_calls converged')
+
+OptimizeResult = collections.namedtuple('OptimizeResult', 'x fun nit nfev success')
+
+_gold = 1.618034
+_cg = 0.3819660
+
+def brentq(f, a, b, xtol=2e-12, rtol=8.881784197001252e-16, maxiter=100,
+           full_output=False):
+    """Find a root of *f* in the bracket [*a*, *b*] using Brent's method.
+
+    The parameters have the same meanings as those of ``scipy.optimize.brentq``.
+    If *full_output* is true, return a 2-tuple of the root and a
+    :py:class:`RootResults`.
+
+    >>> '{:.10g}'.format(brentq(lambda x: x * x - 2, 0, 2))
+    '1.414213562'
+    """
+    xpre, xcur = a, b
+    xblk = fblk = spre = scur = 0.0
+    fpre = f(xpre)
+    fcur = f(xcur)
+    funcalls = 2
+    if fpre * fcur > 0:
+        raise ValueError('f(a) and f(b) must have different signs')
+    if fpre == 0:
+        root, converged, iterations = xpre, True, 0
+    elif fcur == 0:
+        root, converged, iterations = xcur, True, 0
+    else:
+        converged = False
+        for iterations in range(1, maxiter + 1):
+            if fpre != 0 and fcur != 0 and \
+                    math.copysign(1, fpre) != math.copysign(1, fcur):
+                xblk = xpre
+                fblk = fpre
+                spre = scur = xcur - xpre
+            if math.fabs(fblk) < math.fabs(fcur):
+                xpre, xcur, xblk = xcur, xblk, xcur
+                fpre, fcur, fblk = fcur, fblk, fcur
+
+            delta = 0.5 * (xtol + rtol * math.fabs(xcur))
+            sbis = 0.5 * (xblk - xcur)
+            if fcur == 0 or math.fabs(sbis) < delta:
+                converged = True
+                break
+
+            if math.fabs(spre) > delta and math.fabs(fcur) < math.fabs(fpre):
+                if xpre == xblk:
+                    # interpolate
+                    stry = -fcur * (xcur - xpre) / (fcur - fpre)
+                else:
+                    # extrapolate
+                    dpre = (fpre - fcur) / (xpre - xcur)
+                    dblk = (fblk - fcur) / (xblk - xcur)
+                    stry = -fcur * (fblk * dblk - fpre * dpre) \
+                        / (dblk * dpre * (fblk - fpre))
+                if 2 * math.fabs(stry) < min(math.fabs(spre),
+                                             3 * math.fabs(sbis) - delta):
+                    spre, scur = scur, stry
+                else:
+                    spre = scur = sbis
+            else:
+                spre = scur = sbis
+
+            xpre, fpre = xcur, fcur
+            if math.fabs(scur) > delta:
+                xcur += scur
+            else:
+                xcur += delta if sbis > 0 else -delta
+            fcur = f(xcur)
+            funcalls += 1
+        root = xcur
+        if not converged:
+            raise RuntimeError('failed to converge after {} iterations'.format(maxiter))
+    if full_output:
+        return root, RootResults(root, iterations, funcalls, converged)
+    return root
+
+def _bracket(fun, xa=0.0, xb=1.0, grow_limit=110.0, maxiter=1000):
+    """Search downhill from *xa* and *xb* for three points bracketing a minimum.
+
+    Return a 2-tuple of the points and function values as a 6-tuple, and the
+    number of function calls. The bracket may be invalid, which the caller
+    should check.
+    """
+    fa = fun(xa)
+    fb = fun(xb)
+    if fa < fb:
+        xa, xb = xb, xa
+        fa, fb = fb, fa
+    xc = xb + _gold * (xb - xa)
+    fc = fun(xc)
+    funcalls = 3
+    nit = 0
+    while fc < fb:
+        if nit > maxiter:
+            raise RuntimeError('no valid bracket found')
+        nit += 1
+        tmp1 = (xb - xa) * (fb - fc)
+        tmp2 = (xb - xc) * (fb - fa)
+        val = tmp2 - tmp1
+        denom = 2e-21 if math.fabs(val) < 1e-21 else 2.0 * val
+        w = xb - ((xb - xc) * tmp2 - (xb - xa) * tmp1) / denom
+        wlim = xb + grow_limit * (xc - xb)
+        if (w - xc) * (xb - w) > 0.0:
+            fw = fun(w)
+            funcalls += 1
+            if fw < fc:
+                xa, xb = xb, w
+                fa, fb = fb, fw
+                break
+            elif fw > fb:
+                xc, fc = w, fw
+                break
+            w = xc + _gold * (xc - xb)
+            fw = fun(w)
+            funcalls += 1
+        elif (w - wlim) * (wlim - xc) >= 0.0:
+            w = wlim
+            fw = fun(w)
+            funcalls += 1
+        elif (w - wlim) * (xc - w) > 0.0:
+            fw = fun(w)
+            funcalls += 1
+            if fw < fc:
+                xb, xc = xc, w
+                w = xc + _gold * (xc - xb)
+                fb, fc = fc, fw
+                fw = fun(w)
+                funcalls += 1
+        else:
+            w = xc + _gold * (xc - xb)
+            fw = fun(w)
+            funcalls += 1
+        xa, xb, xc = xb, xc, w
+        fa, fb, fc = fb, fc, fw
+    return (xa, xb, xc, fa, fb, fc), funcalls
+
+def minimize_scalar(fun, tol=1.48e-8, maxiter=500):
+    """Minimise *fun* using Brent's method without bounds.
+
+    This is equivalent to ``scipy.optimize.minimize_scalar(fun, tol=tol,
+    options={'maxiter': maxiter})``, starting with a downhill bracket search
+    from 0 and 1. Return an :py:class:`OptimizeResult`.
+
+    >>> res = minimize_scalar(lambda x: (x - 3) ** 2 + 1)
+    >>> '{:.6g} {:.6g} {}'.format(res.x, res.fun, res.success)
+    '3 1 True'
+    """
+    (xa, xb, xc, fa, fb, fc), funcalls = _bracket(fun)
+    valid = ((fb < fc and fb <= fa) or (fb < fa and fb <= fc)) \
+        and (xa < xb < xc or xc < xb < xa) \
+        and math.isfinite(xa) and math.isfinite(xb) and math.isfinite(xc)
+    if not valid:
+        xs, fs = (xa, xb, xc), (fa, fb, fc)
+        if any(math.isnan(v) for v in xs + fs):
+            return OptimizeResult(math.nan, math.nan, 0, funcalls, False)
+        imin = min(range(3), key=fs.__getitem__)
+        return OptimizeResult(xs[imin], fs[imin], 0, funcalls, False)
+
+    x = w = v = xb
+    fw = fv = fx = fb
+    a, b = (xa, xc) if xa < xc else (xc, xa)
+    deltax = 0.0
+    rat = 0.0
+    nit = 0
+    while nit < maxiter:
+        tol1 = tol * math.fabs(x) + 1e-11
+        tol2 = 2.0 * tol1
+        xmid = 0.5 * (a + b)
+        if math.fabs(x - xmid) < tol2 - 0.5 * (b - a):
+            break
+        if math.fabs(deltax) <= tol1:
+            # golden section step
+            deltax = a - x if x >= xmid else b - x
+            rat = _cg * deltax
+        else:
+            # parabolic step
+            tmp1 = (x - w) * (fx - fv)
+            tmp2 = (x - v) * (fx - fw)
+            p = (x - v) * tmp2 - (x - w) * tmp1
+            tmp2 = 2.0 * (tmp2 - tmp1)
+            if tmp2 > 0.0:
+                p = -p
+            tmp2 = math.fabs(tmp2)
+            dx_temp = deltax
+            deltax = rat
+            if p > tmp2 * (a - x) and p < tmp2 * (b - x) \
+                    and math.fabs(p) < math.fabs(0.5 * tmp2 * dx_temp):
+                rat = p * 1.0 / tmp2
+                u = x + rat
+                if u - a < tol2 or b - u < tol2:
+                    rat = tol1 if xmid - x >= 0 else -tol1
+            else:
+                deltax = a - x if x >= xmid else b - x
+                rat = _cg * deltax
+
+        if math.fabs(rat) < tol1:
+            u = x + tol1 if rat >= 0 else x - tol1
+        else:
+            u = x + rat
+        fu = fun(u)
+        funcalls += 1
+
+        if fu > fx:
+            if u < x:
+                a = u
+            else:
+                b = u
+            if fu <= fw or w == x:
+                v, w = w, u
+                fv, fw = fw, fu
+            elif fu <= fv or v == x or v == w:
+                v, fv = u, fu
+        else:
+            if u >= x:
+                a = x
+            else:
+                b = x
+            v, w, x = w, x, u
+            fv, fw, fx = fw, fx, fu
+        nit += 1
+
+    success = nit < maxiter and not (math.isnan(x) or math.isnan(fx))
+    return OptimizeResult(x, fx, nit, funcalls, success)
@@ -0,0 +1,160 @@
+"""Solve large batches of scalar problems in parallel processes.
+
+The scalar solvers :py:func:`pystrafe.motion.strafe_solve_speedxi` and
+:py:func:`pystrafe.motion.solve_boost_min_dmg` spend most of their time in
+Python code, so threads cannot run them in parallel. The functions in this
+module broadcast their array arguments, place them in a shared memory block,
+and let a process pool solve contiguous chunks of the flattened batch, writing
+the results into a second shared memory block at the same positions. The
+results are therefore in the same order as the inputs regardless of which
+worker finishes first, and no per-element data is pickled between processes.
+
+Elements for which the scalar solver raises :py:exc:`ValueError`,
+:py:exc:`ZeroDivisionError` or :py:exc:`RuntimeError`, such as those with a
+zero *K* or *g* or those the root finder fails on, are ``NaN``. A negative
+*K* is invalid for the whole computation and raises :py:exc:`ValueError` up
+front, as in :py:mod:`pystrafe.vec.motion`.
+"""
+
+import os
+import math
+import concurrent.futures
+from multiprocessing import shared_memory
+import numpy as np
+from pystrafe import motion
+from pystrafe.vec import common as vcommon
+
+# Errors of a single element, which make it NaN without affecting the others.
+_element_errors = (ValueError, ZeroDivisionError, RuntimeError)
+
+# Rough time per call of the scalar solvers in seconds, used to size the chunks
+# so that each task runs long enough to amortise the cost of dispatching it.
+_cost = {'solve_speedxi': 20e-6, 'boost_min_dmg': 120e-6}
+_task_time = 0.05
+
+def _solve_speedxi(args, out, method):
+    for i, (speedzi, K, x, z, g) in enumerate(args):
+        try:
+            out[i, 0] = motion.strafe_solve_speedxi(speedzi, K, x, z, g, method)
+        except _element_errors:
+            out[i, 0] = math.nan
+
+def _boost_min_dmg(args, out):
+    for i, (vix, viy, K, x, z, g) in enumerate(args):
+        try:
+            out[i] = motion.solve_boost_min_dmg([vix, viy], K, x, z, g)
+        except _element_errors:
+            out[i] = math.nan
+
+_kernels = {'solve_speedxi': _solve_speedxi, 'boost_min_dmg': _boost_min_dmg}
+
+def _run_chunk(name, in_name, in_shape, out_name, out_shape, start, stop, kwargs):
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        args = np.ndarray(in_shape, dtype=float, buffer=shm_in.buf)
+        out = np.ndarray(out_shape, dtype=float, buffer=shm_out.buf)
+        _kernels[name](args[start:stop].tolist(), out[start:stop], **kwargs)
+        # Release the views before closing the shared memory.
+        del args, out
+    finally:
+        shm_in.close()
+        shm_out.close()
+
+def _cpu_count():
+    """Return the number of CPUs usable by this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def _chunksize(name, n, workers):
+    """Return the chunk size for *n* elements spread over *workers*.
+
+    Each chunk should take about :py:data:`_task_time` to amortise the
+    dispatch overhead, but there should also be several chunks per worker to
+    balance the load when some elements are much more expensive than others.
+    """
+    by_cost = max(1, int(_task_time / _cost[name]))
+    by_balance = max(1, -(-n // (4 * workers)))
+    return min(by_cost, by_balance)
+
+def _map(name, args, nout, workers, chunksize, **kwargs):
+    args = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in args))
+    shape = args[0].shape
+    n = args[0].size
+    if workers is None:
+        workers = _cpu_count()
+    if chunksize is None:
+        chunksize = _chunksize(name, n, workers)
+    if chunksize < 1:
+        raise ValueError('chunksize must be > 0')
+
+    if workers <= 1 or n <= chunksize:
+        out = np.empty((n, nout))
+        flat = np.stack([a.ravel() for a in args], axis=-1)
+        _kernels[name](flat.tolist(), out, **kwargs)
+        return out.reshape(shape + (nout,))
+
+    in_shape, out_shape = (n, len(args)), (n, nout)
+    shm_in = shared_memory.SharedMemory(create=True, size=max(8 * n * len(args), 1))
+    shm_out = shared_memory.SharedMemory(create=True, size=max(8 * n * nout, 1))
+    try:
+        flat = np.ndarray(in_shape, dtype=float, buffer=shm_in.buf)
+        for j, a in enumerate(args):
+            flat[:, j] = a.ravel()
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_run_chunk, name, shm_in.name, in_shape,
+                                   shm_out.name, out_shape, start,
+                                   min(start + chunksize, n), kwargs)
+                       for start in range(0, n, chunksize)]
+            for future in futures:
+                future.result()
+        out = np.ndarray(out_shape, dtype=float, buffer=shm_out.buf).copy()
+        del flat
+    finally:
+        for shm in (shm_in, shm_out):
+            shm.close()
+            shm.unlink()
+    return out.reshape(shape + (nout,))
+
+def map_solve_speedxi(speedzi, K, x, z, g, method='brentq', workers=None,
+                      chunksize=None):
+    """Apply :py:func:`pystrafe.motion.strafe_solve_speedxi` to every element
+    of the broadcast arguments in parallel.
+
+    *workers* is the number of processes, defaulting to the number of CPUs
+    available to this process.
+    *chunksize* is the number of elements per task, by default chosen from the
+    typical cost of a single call and the size of the batch. Small batches
+    and a single worker are solved in the calling process. Return an array of
+    the broadcast shape.
+
+    >>> K = motion.strafe_K(30, 0.001, 320, 10)
+    >>> map_solve_speedxi(0, K, [100, 100, 200], [-18, -100, 1000], 800)
+    array([450.64744988,   0.        ,          nan])
+    """
+    vcommon.validate_K(K)
+    return _map('solve_speedxi', (speedzi, K, x, z, g), 1, workers, chunksize,
+                method=method)[..., 0]
+
+def map_boost_min_dmg(vi, K, x, z, g, workers=None, chunksize=None):
+    """Apply :py:func:`pystrafe.motion.solve_boost_min_dmg` to every element
+    of the broadcast arguments in parallel.
+
+    *vi* is an array of initial velocities with the last axis of length 2.
+    The remaining parameters are as in :py:func:`map_solve_speedxi`. Return an
+    array of the broadcast shape with a last axis of length 2 holding the
+    boosts.
+
+    >>> K = motion.strafe_K(30, 0.001, 320, 10)
+    >>> map_boost_min_dmg([100, 268], K, [400, 400], 500, 800).round(3)
+    array([[ 27.394, 627.828],
+           [ 27.394, 627.828]])
+    """
+    vcommon.validate_K(K)
+    vi = np.asarray(vi, dtype=float)
+    if vi.ndim < 1 or vi.shape[-1] != 2:
+        raise ValueError('vi must have a last axis of length 2')
+    return _map('boost_min_dmg', (vi[..., 0], vi[..., 1], K, x, z, g), 2,
+                workers, chunksize)
@@ -0,0 +1,271 @@
+"""Batched player movement combining the primitives of :py:mod:`pystrafe.basic`.
+
+A :py:class:`PlayerMove` advances the players held in a :py:class:`PlayerState`
+by whole frames, in the order of the game's walking movement:
+
+1. The players are categorised as on the ground or in the air.
+2. Half of the gravity is applied.
+3. Players on the ground have their vertical velocity zeroed and friction
+   applied, with the friction coefficient multiplied by their edgefriction.
+4. The players accelerate towards their yaws, with the ground or air
+   acceleration.
+5. The players move by their velocities times the frame time, and are clipped
+   against the planes, sliding along creases and stopping in corners.
+6. The players are categorised again, the other half of the gravity is
+   applied, and players on the ground have their vertical velocity zeroed.
+
+The world is a list of infinite planes ``n . x = d`` with unit normals *n*
+pointing out of the solid, so the free space is the intersection of the
+half-spaces in front of the planes. A player is on the ground if a plane with
+a normal *z* component of at least 0.7 lies within 2 units directly below it
+and its vertical velocity is at most 180, in which case it is moved down onto
+that plane as in the game. Jumping, ducking, water, ladders and the player
+bounding box are not modelled.
+"""
+
+import numpy as np
+from pystrafe import basic, sim
+from pystrafe.vec import basic as vbasic
+from pystrafe.vec import common as vcommon
+
+# How far behind a plane a player must be to be pushed again after the first
+# push-out of a frame, which leaves rounding errors.
+_tol = 1e-9
+
+class PlayerState:
+    """Positions, velocities and ground states of *N* players.
+
+    *pos* and *vel* are array-likes of shape (N, 3), copied into the
+    :py:attr:`pos` and :py:attr:`vel` attributes, which a
+    :py:class:`PlayerMove` updates in place. *vel* defaults to zero.
+    *edgefriction* is the multiplier of the friction coefficient of each
+    player, a scalar or an array of shape (N,), held in the
+    :py:attr:`edgefriction` attribute. The :py:attr:`onground` attribute is a
+    boolean array set by :py:meth:`PlayerMove.categorize`.
+
+    >>> state = PlayerState([[0, 0, 0], [0, 0, 100]], edgefriction=[1, 2])
+    >>> state.vel
+    array([[0., 0., 0.],
+           [0., 0., 0.]])
+    >>> state.edgefriction
+    array([1., 2.])
+    """
+
+    def __init__(self, pos, vel=None, edgefriction=1.0):
+        self.pos = np.array(pos, dtype=float, order='C')
+        if self.pos.ndim != 2 or self.pos.shape[1] != 3:
+            raise ValueError('pos must have shape (N, 3)')
+        n = len(self.pos)
+        if vel is None:
+            self.vel = np.zeros((n, 3))
+        else:
+            self.vel = np.array(vel, dtype=float, order='C')
+            if self.vel.shape != self.pos.shape:
+                raise ValueError('vel must have the same shape as pos')
+        self.edgefriction = np.empty(n)
+        self.edgefriction[:] = edgefriction
+        self.onground = np.zeros(n, dtype=bool)
+
+    def __len__(self):
+        return len(self.pos)
+
+class PlayerMove:
+    """Advance the players of a :py:class:`PlayerState` frame by frame.
+
+    *planes* is an array-like of shape (P, 4) of rows ``(nx, ny, nz, d)``,
+    each describing the plane ``n . x = d`` with a unit normal *n* pointing
+    out of the solid. *tau* is the frame time, *M* the maximum speed, *A* and
+    *Aa* the ground and air accelerations, and *b* the bounce coefficient
+    passed to the clipping. The remaining parameters have the same meanings
+    as those in :py:mod:`pystrafe.basic`.
+
+    >>> move = PlayerMove([[0, 0, 1, 0]], 0.01)
+    >>> state = PlayerState([[0, 0, 1], [0, 0, 50]], [[0, 0, 0], [0, 0, 0]])
+    >>> move.step(state, 0.0)
+    >>> state.pos
+    array([[ 0.32,  0.  ,  0.  ],
+           [ 0.3 ,  0.  , 49.96]])
+    >>> state.vel
+    array([[32.,  0.,  0.],
+           [30.,  0., -8.]])
+    >>> state.onground
+    array([ True, False])
+    """
+
+    def __init__(self, planes, tau, M=320.0, A=10.0, Aa=10.0, E=basic.E,
+                 k=basic.k, g=basic.g, b=1):
+        planes = np.array(planes, dtype=float)
+        if planes.size == 0:
+            planes = planes.reshape(0, 4)
+        if planes.ndim != 2 or planes.shape[1] != 4:
+            raise ValueError('planes must have shape (P, 4)')
+        normals = planes[:, :3]
+        if not np.all(vcommon.float_equal(np.sum(normals * normals, axis=1), 1)):
+            raise ValueError('plane normals must be unit vectors')
+        self.normals = np.ascontiguousarray(normals)
+        self.dists = planes[:, 3].copy()
+        self.tau, self.M, self.A, self.Aa = tau, M, A, Aa
+        self.E, self.k, self.g, self.b = E, k, g, b
+
+        # The planes meeting each plane at an acute angle, which a player
+        # pushed out of the plane can end up behind.
+        self._cos = self.normals @ self.normals.T
+        self._acute = [np.flatnonzero((c < 0.0) & ~vcommon.float_equal(c, -1))
+                       for c in self._cos]
+
+        ground = self.normals[:, 2] >= 0.7
+        self._ground_normals = self.normals[ground]
+        self._ground_dists = self.dists[ground]
+        self._ground_nz = self._ground_normals[:, 2].copy()
+
+    def categorize(self, state):
+        """Set :py:attr:`PlayerState.onground`, and move the players on the
+        ground down onto the plane below them."""
+        pos = state.pos
+        if not len(self._ground_nz):
+            state.onground[:] = False
+            return
+        # The lowest vertical distance down to the ground planes. Looping
+        # over the planes is faster than reducing along a short axis.
+        hmin = None
+        for n, d, nz in zip(self._ground_normals, self._ground_dists,
+                            self._ground_nz):
+            h = pos @ n
+            h -= d
+            h /= nz
+            hmin = h if hmin is None else np.minimum(hmin, h, out=hmin)
+        onground = state.onground
+        np.less_equal(hmin, 2.0, out=onground)
+        onground &= state.vel[:, 2] <= 180.0
+        hmin[~onground] = 0.0
+        pos[:, 2] -= hmin
+
+    def gravity_half(self, state):
+        """Apply :py:func:`pystrafe.basic.gravity_half` to every player."""
+        state.vel[:, 2] -= 0.5 * self.g * self.tau
+
+    def friction(self, state, mask=None):
+        """Apply :py:func:`pystrafe.basic.friction` to the players selected
+        by the boolean array *mask*, or to every player, with *k* multiplied
+        by the edgefriction of each player."""
+        vel = state.vel
+        vx, vy = vel[:, 0], vel[:, 1]
+        speed = np.sqrt(vx * vx + vy * vy)
+        active = speed >= 0.1
+        if mask is not None:
+            active &= mask
+        idx = np.flatnonzero(active)
+        vx, vy, speed = vx[idx], vy[idx], speed[idx]
+        k = self.k * state.edgefriction[idx]
+        fric = self.tau * self.E * k
+
+        # The regimes in the same order of precedence as the scalar function.
+        hi = speed >= self.E
+        mid = speed >= fric
+        inv = 1 / speed
+        scale = 1 - self.tau * k
+        vel[idx, 0] = np.where(hi, vx * scale,
+                               np.where(mid, vx - vx * inv * fric, 0.0))
+        vel[idx, 1] = np.where(hi, vy * scale,
+                               np.where(mid, vy - vy * inv * fric, 0.0))
+
+    def accelerate(self, state, yaw, mask=None):
+        """Accelerate the players selected by the boolean array *mask*, or
+        every player, towards the anglemod of *yaw*.
+
+        *yaw* is in radians and may be a scalar or an array of shape (N,). As
+        in :py:func:`pystrafe.sim.accelerate_yaw`, the velocity is
+        updated as in :py:func:`pystrafe.basic.strafe_fme_theta`, with *L* and
+        *gamma1* of ``M`` and ``tau * M * A`` on the ground, and of
+        ``min(30, M)`` and ``tau * M * Aa`` in the air.
+        """
+        onground = state.onground
+        L = np.where(onground, self.M, min(30.0, self.M))
+        gamma1 = np.where(onground, self.tau * self.M * self.A,
+                          self.tau * self.M * self.Aa)
+        sim.accelerate_yaw(state.vel[:, 0], state.vel[:, 1], yaw, L, gamma1,
+                           mask)
+
+    def _push_out(self, pos, touched, tol):
+        """Push the players at *pos* that are behind a plane by more than
+        *tol* back onto it, marking the plane in *touched*. Return whether
+        any player was pushed."""
+        pushed = False
+        for i, (n, d) in enumerate(zip(self.normals, self.dists)):
+            s = pos @ n
+            s -= d
+            idx = np.flatnonzero(s < -tol)
+            if not len(idx):
+                continue
+            pushed = True
+            touched[idx, i] = True
+            s = s[idx]
+            for j in self._acute[i]:
+                # Pushing along n would put these players behind plane j, so
+                # move them onto the crease between the two planes instead.
+                m, c = self.normals[j], self._cos[i, j]
+                sj = pos[idx] @ m
+                sj -= self.dists[j]
+                crease = sj - s * c < -tol
+                if not crease.any():
+                    continue
+                det = 1 - c * c
+                si, sj, rows = s[crease], sj[crease], idx[crease]
+                a = (c * sj - si) / det
+                b = (c * si - sj) / det
+                pos[rows] += a[:, None] * n + b[:, None] * m
+                touched[rows, j] = True
+                idx, s = idx[~crease], s[~crease]
+            pos[idx] -= s[:, None] * n
+        return pushed
+
+    def move(self, state):
+        """Move every player by its velocity times *tau*, then clip it against
+        the planes.
+
+        A player that ends up behind a plane is pushed back onto the plane
+        along its normal, or onto the crease with another plane if the push
+        would put it behind that plane. As a push can still leave a player
+        behind a plane checked earlier, the push-out is repeated for the
+        pushed players until no plane is violated, at most once per plane.
+        The velocity is then clipped with
+        :py:func:`pystrafe.vec.basic.clip_planes` against all the planes the
+        player was pushed out of in the frame and is moving into, so that a
+        player hitting two planes at once slides along their crease.
+        """
+        pos, vel = state.pos, state.vel
+        pos += vel * self.tau
+        touched = np.zeros((len(pos), len(self.normals)), dtype=bool)
+        if not self._push_out(pos, touched, 0.0):
+            return
+        rows = np.flatnonzero(touched.any(axis=1))
+        pushed_pos, pushed_touched = pos[rows], touched[rows]
+        for _ in range(len(self.normals)):
+            if not self._push_out(pushed_pos, pushed_touched, _tol):
+                break
+        pos[rows] = pushed_pos
+        touched[rows] = pushed_touched
+        touched &= (vel @ self.normals.T) < 0.0
+        rows = np.flatnonzero(touched.any(axis=1))
+        vel[rows] = vbasic.clip_planes(vel[rows], self.normals, self.b,
+                                       validate=False, mask=touched[rows])
+
+    def step(self, state, yaw, accel=None):
+        """Advance every player by one frame, accelerating towards *yaw* as
+        in :py:meth:`accelerate`.
+
+        *accel* is an optional boolean array of shape (N,) selecting the
+        players that accelerate, as if the other players held no movement
+        keys.
+        """
+        onground = state.onground
+        vz = state.vel[:, 2]
+        self.categorize(state)
+        self.gravity_half(state)
+        np.copyto(vz, 0.0, where=onground)
+        self.friction(state, onground)
+        self.accelerate(state, yaw, accel)
+        self.move(state)
+        self.categorize(state)
+        self.gravity_half(state)
+        np.copyto(vz, 0.0, where=onground)
@@ -0,0 +1,111 @@
+"""Reachability grids over horizontal and vertical target positions.
+
+For an initial velocity and strafing parameters, every point of an (*x*, *z*)
+grid is assigned the minimum initial horizontal speed needed to reach it from
+:py:func:`pystrafe.vec.motion.strafe_solve_speedxi`, the flight time, and
+whether it is reachable with the given initial horizontal speed. The grid is
+computed in chunks of rows to bound the memory of the temporaries, optionally
+in parallel threads, and may be written straight into memory-mapped ``.npy``
+files so that very large grids never need to fit in memory.
+"""
+
+import os
+import collections
+import concurrent.futures
+import numpy as np
+from pystrafe.vec import common as vcommon
+from pystrafe.vec import motion as vmotion
+
+ReachGrid = collections.namedtuple('ReachGrid', 'speedxi time feasible')
+
+def flight_time(speedzi, z, g):
+    """Compute the flight time to reach the height *z*.
+
+    This is the time used by :py:func:`pystrafe.motion.strafe_solve_speedxi`,
+    which is the earliest nonnegative solution, or ``NaN`` if the height is
+    unreachable, as given by
+    :py:func:`pystrafe.vec.motion.gravity_first_time`. The arguments may be
+    arrays. *g* must be positive.
+
+    >>> flight_time(268, [10, 100, -50], 800)
+    array([0.03966121,        nan, 0.82205749])
+    """
+    if np.any(np.asarray(g) <= 0):
+        raise ValueError('g must be > 0')
+    return vmotion.gravity_first_time(speedzi, z, g)
+
+def _open(path, name, shape, dtype):
+    if path is None:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(os.path.join(path, name + '.npy'),
+                                     mode='w+', dtype=dtype, shape=shape)
+
+def reach_grid(x, z, speedxi, speedzi, K, g, chunk_size=1 << 18, workers=None,
+               path=None, method='illinois'):
+    """Compute the reachability of every point on an (*x*, *z*) grid.
+
+    *x* and *z* are 1D arrays of horizontal distances and heights relative to
+    the starting position. *speedxi* and *speedzi* are the initial horizontal
+    and vertical speeds, and *K* and *g* are as usual.
+
+    Return a :py:class:`ReachGrid` of three arrays of shape ``(len(x),
+    len(z))``: *speedxi* holds the minimum initial horizontal speed needed,
+    *time* holds the flight time given by :py:func:`flight_time`, and
+    *feasible* is true where the given *speedxi* is enough. Both *speedxi* and
+    *time* are ``NaN`` where the height is unreachable. *method* is passed to
+    :py:func:`pystrafe.vec.motion.strafe_solve_speedxi`.
+
+    The grid is computed in chunks of whole rows of about *chunk_size*
+    points. If *workers* is given, the chunks are computed in a thread pool of
+    that size, which helps as NumPy releases the GIL for large arrays. If
+    *path* is given, it must be an existing directory into which the arrays
+    are written as ``speedxi.npy``, ``time.npy`` and ``feasible.npy``, and the
+    returned arrays are memory maps of those files.
+
+    >>> K = vmotion.strafe_K_std(0.001)
+    >>> grid = reach_grid([100, 400], [-18, 40, 100], 500, 268, K, 800)
+    >>> grid.speedxi
+    array([[   0.        ,  422.26530236,           nan],
+           [ 483.48469329, 1776.5386787 ,           nan]])
+    >>> grid.feasible
+    array([[ True,  True, False],
+           [ True, False, False]])
+    """
+    x = np.asarray(x, dtype=float)
+    z = np.asarray(z, dtype=float)
+    if x.ndim != 1 or z.ndim != 1:
+        raise ValueError('x and z must be 1D')
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be > 0')
+    if method not in ('illinois', 'newton'):
+        raise ValueError('unknown method: {}'.format(method))
+    # Check everything before any output file is created.
+    vcommon.validate_K(K)
+    time = flight_time(speedzi, z, g)
+    shape = (len(x), len(z))
+    grid = ReachGrid(_open(path, 'speedxi', shape, float),
+                     _open(path, 'time', shape, float),
+                     _open(path, 'feasible', shape, bool))
+    rows = max(1, chunk_size // max(len(z), 1))
+
+    def compute(start):
+        stop = min(start + rows, len(x))
+        req = vmotion.strafe_solve_speedxi(speedzi, K, x[start:stop, None], z, g,
+                                           method=method)
+        grid.speedxi[start:stop] = req
+        grid.time[start:stop] = time
+        with np.errstate(invalid='ignore'):
+            grid.feasible[start:stop] = req <= speedxi
+
+    starts = range(0, len(x), rows)
+    if workers is None:
+        for start in starts:
+            compute(start)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            # Consume the results to propagate exceptions.
+            list(pool.map(compute, starts))
+    if path is not None:
+        for a in grid:
+            a.flush()
+    return grid
@@ -0,0 +1,404 @@
+"""Batched frame-by-frame simulation of many players at once.
+
+The velocities of all players are stored in a single contiguous float64 array
+of shape (N, 3), and every frame is computed with in-place NumPy operations
+over preallocated buffers. The results are the same as calling the scalar
+functions in :py:mod:`pystrafe.basic` on each velocity in turn.
+
+For a single long run, :py:func:`iter_trajectory` instead steps one player
+with the scalar functions and yields the positions and velocities lazily, one
+frame or one block of frames at a time, so that the memory used does not
+grow with the length of the run.
+"""
+
+import math
+import functools
+import collections
+import numpy as np
+from pystrafe import basic, common
+from pystrafe.vec import common as vcommon
+
+TrajectoryPoint = collections.namedtuple('TrajectoryPoint',
+                                         'frame position velocity speed')
+TrajectoryBlock = collections.namedtuple('TrajectoryBlock',
+                                         'frame position velocity speed')
+
+# The number of frames whose speeds strafe_distance_anglemod sums at once.
+_chunk_frames = 256
+
+@functools.lru_cache(maxsize=None)
+def _anglemod_table():
+    """Return the cosines and sines of all 65536 anglemod yaws."""
+    yaws = np.arange(65536) * common.anglemod_u_rad
+    return np.cos(yaws), np.sin(yaws)
+
+class StrafeSim:
+    """Simulate the velocities of *N* players frame by frame.
+
+    *v* is an array-like of shape (N, 3) holding the initial velocities, which
+    is copied into the :py:attr:`v` attribute. The remaining parameters have
+    the same meanings as those in :py:mod:`pystrafe.basic`.
+
+    >>> sim = StrafeSim([[100.0, 0.0, 0.0], [0.0, 400.0, 0.0]], 0.01)
+    >>> sim.friction()
+    >>> sim.v
+    array([[ 96.,   0.,   0.],
+           [  0., 384.,   0.]])
+    """
+
+    def __init__(self, v, tau, E=basic.E, k=basic.k, g=basic.g):
+        self.v = np.array(v, dtype=float, order='C')
+        if self.v.ndim != 2 or self.v.shape[1] != 3:
+            raise ValueError('v must have shape (N, 3)')
+        self.tau = tau
+        self.E = E
+        self.k = k
+        self.g = g
+
+        n = len(self.v)
+        self._vxy = self.v[:, :2]
+        self._vx = self.v[:, 0]
+        self._vy = self.v[:, 1]
+        self._vz = self.v[:, 2]
+        self._speed = np.empty(n)
+        self._inv = np.empty(n)
+        self._inv_col = self._inv[:, None]
+        self._buf = [np.empty(n) for _ in range(6)]
+        self._xy = np.empty((n, 2))
+        self._masks = [np.empty(n, dtype=bool) for _ in range(4)]
+        self._mask_cols = [m[:, None] for m in self._masks]
+        self._yaw_buf = (*self._buf[:4], np.empty(n, dtype=np.int64),
+                         self._masks[0])
+
+    def _compute_speed(self):
+        speed, tmp = self._speed, self._buf[0]
+        np.multiply(self._vx, self._vx, out=speed)
+        np.multiply(self._vy, self._vy, out=tmp)
+        np.add(speed, tmp, out=speed)
+        np.sqrt(speed, out=speed)
+        return speed
+
+    def _compute_inv_speed(self):
+        np.divide(1.0, self._speed, out=self._inv)
+
+    def friction(self):
+        """Apply :py:func:`pystrafe.basic.friction` to every player."""
+        speed = self._compute_speed()
+        lo, hi, zero, other = self._masks
+        lo_col, hi_col, zero_col, mid_col = self._mask_cols
+        fric = self.tau * self.E * self.k
+
+        # Make the regimes mutually exclusive in the same order of precedence
+        # as the scalar function.
+        np.less(speed, 0.1, out=lo)
+        np.greater_equal(speed, self.E, out=hi)
+        np.less(speed, fric, out=zero)
+        np.logical_not(lo, out=other)
+        np.logical_and(hi, other, out=hi)
+        np.logical_and(zero, other, out=zero)
+        np.logical_not(hi, out=other)
+        np.logical_and(zero, other, out=zero)
+        np.logical_or(lo, hi, out=other)
+        np.logical_or(other, zero, out=other)
+        np.logical_not(other, out=other)
+
+        v, xy = self._vxy, self._xy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._compute_inv_speed()
+            np.multiply(v, self._inv_col, out=xy)
+            np.multiply(xy, fric, out=xy)
+        np.subtract(v, xy, out=v, where=mid_col)
+        np.multiply(v, 1 - self.tau * self.k, out=v, where=hi_col)
+        np.copyto(v, 0.0, where=zero_col)
+
+    def gravity_half(self):
+        """Apply :py:func:`pystrafe.basic.gravity_half` to every player."""
+        np.subtract(self._vz, 0.5 * self.g * self.tau, out=self._vz)
+
+    def strafe(self, theta, L, gamma1):
+        """Apply :py:func:`pystrafe.basic.strafe_fme_theta` to every player.
+
+        *theta* may be a scalar or an array of shape (N,). A scalar *theta*
+        gives results identical to the scalar function, while an array may
+        differ in the last bit due to NumPy's implementation of cosine and sine.
+        """
+        speed = self._compute_speed()
+        update = self._masks[0]
+        np.less_equal(speed, 1e-6, out=update)
+        if update.any():
+            raise ValueError('speed cannot be 0')
+
+        hx, hy, ct, st, gamma2, tmp = self._buf
+        if np.ndim(theta) == 0:
+            ct.fill(math.cos(theta))
+            st.fill(math.sin(theta))
+        else:
+            np.cos(theta, out=ct)
+            np.sin(theta, out=st)
+
+        self._compute_inv_speed()
+        np.multiply(self._vx, self._inv, out=hx)
+        np.multiply(self._vy, self._inv, out=hy)
+        np.multiply(speed, ct, out=gamma2)
+        np.subtract(L, gamma2, out=gamma2)
+        np.greater(gamma2, 0.0, out=update)
+        mu = np.minimum(gamma1, gamma2, out=gamma2)
+
+        np.multiply(hx, ct, out=tmp)
+        np.multiply(hy, st, out=speed)
+        np.subtract(tmp, speed, out=tmp)
+        np.multiply(tmp, mu, out=tmp)
+        np.add(self._vx, tmp, out=self._vx, where=update)
+
+        np.multiply(hx, st, out=tmp)
+        np.multiply(hy, ct, out=speed)
+        np.add(tmp, speed, out=tmp)
+        np.multiply(tmp, mu, out=tmp)
+        np.add(self._vy, tmp, out=self._vy, where=update)
+
+    def strafe_yaw(self, yaw, L, gamma1):
+        """Accelerate every player towards the anglemod of *yaw*.
+
+        This is how the game strafes: the yaw in radians is quantised by
+        :py:func:`pystrafe.common.anglemod_rad` before computing the unit
+        acceleration vector, and the velocity is then updated as in
+        :py:func:`pystrafe.basic.strafe_fme_theta`. *yaw* may be a scalar or an
+        array of shape (N,). See :py:func:`accelerate_yaw`.
+        """
+        accelerate_yaw(self._vx, self._vy, yaw, L, gamma1, buf=self._yaw_buf)
+
+    def strafe_optimal_anglemod(self, L, gamma1, left=True):
+        """Strafe every player with the maximum acceleration subject to
+        anglemod.
+
+        The yaw is the direction of the velocity plus or minus the theta given
+        by :py:func:`pystrafe.basic.strafe_optimal_theta`, which is then passed
+        to :py:meth:`strafe_yaw`. Positive theta is used if *left* is true.
+        """
+        speed = self._compute_speed()
+        zero = self._masks[1]
+        np.less_equal(speed, 1e-6, out=zero)
+        if zero.any():
+            raise ValueError('speed cannot be 0')
+        yaw, theta = self._buf[4:]
+        np.divide(L - gamma1, speed, out=theta)
+        np.clip(theta, 0.0, 1.0, out=theta)
+        np.arccos(theta, out=theta)
+        np.arctan2(self._vy, self._vx, out=yaw)
+        if left:
+            np.add(yaw, theta, out=yaw)
+        else:
+            np.subtract(yaw, theta, out=yaw)
+        self.strafe_yaw(yaw, L, gamma1)
+
+    def step(self, theta, L, gamma1, onground=False):
+        """Advance every player by one frame.
+
+        On the ground, this is equivalent to calling
+        :py:func:`pystrafe.basic.friction` followed by
+        :py:func:`pystrafe.basic.strafe_fme_theta`. In the air, this is
+        equivalent to calling :py:func:`pystrafe.basic.strafe_fme_theta`
+        followed by :py:func:`pystrafe.basic.gravity_half` twice, corresponding
+        to the two halves of gravity applied in a frame.
+        """
+        if onground:
+            self.friction()
+        self.strafe(theta, L, gamma1)
+        if not onground:
+            self.gravity_half()
+            self.gravity_half()
+
+def accelerate_yaw(vx, vy, yaw, L, gamma1, mask=None, buf=None):
+    """Accelerate the horizontal velocities *vx* and *vy* in place towards the
+    anglemod of *yaw*.
+
+    *vx* and *vy* are arrays of shape (N,), and *yaw* is in radians, a scalar
+    or an array of shape (N,). The velocities are updated as in
+    :py:func:`pystrafe.basic.strafe_fme_theta` with the acceleration along
+    the quantised yaw, whose cosine and sine are looked up from a precomputed
+    table. *L* and *gamma1* may be scalars or arrays of shape (N,). Only the
+    players selected by the boolean array *mask* are updated if it is given.
+
+    *buf* is an optional tuple ``(ax, ay, gamma2, tmp, index, update)`` of
+    arrays of shape (N,), the first four of float64, *index* of int64 and
+    *update* of bool, used as scratch space instead of allocating them.
+
+    >>> vx, vy = np.array([400.0]), np.array([0.0])
+    >>> accelerate_yaw(vx, vy, np.pi / 2, 30, 3.2)
+    >>> vx, vy
+    (array([400.]), array([3.2]))
+    """
+    if buf is None:
+        n = len(vx)
+        buf = (np.empty(n), np.empty(n), np.empty(n), np.empty(n),
+               np.empty(n, dtype=np.int64), np.empty(n, dtype=bool))
+    ax, ay, gamma2, tmp, index, update = buf
+    table_cos, table_sin = _anglemod_table()
+    if np.ndim(yaw) == 0:
+        i = vcommon.anglemod_index_rad(yaw)
+        ax.fill(table_cos[i])
+        ay.fill(table_sin[i])
+    else:
+        # The same as vcommon.anglemod_index_rad without the temporaries.
+        np.divide(yaw, common.anglemod_u_rad, out=tmp)
+        np.trunc(tmp, out=tmp)
+        np.copyto(index, tmp, casting='unsafe')
+        np.bitwise_and(index, 0xffff, out=index)
+        np.take(table_cos, index, out=ax)
+        np.take(table_sin, index, out=ay)
+
+    np.multiply(vx, ax, out=gamma2)
+    np.multiply(vy, ay, out=tmp)
+    np.add(gamma2, tmp, out=gamma2)
+    np.subtract(L, gamma2, out=gamma2)
+    np.greater(gamma2, 0.0, out=update)
+    if mask is not None:
+        np.logical_and(update, mask, out=update)
+    mu = np.minimum(gamma1, gamma2, out=gamma2)
+
+    np.multiply(ax, mu, out=tmp)
+    np.add(vx, tmp, out=vx, where=update)
+    np.multiply(ay, mu, out=tmp)
+    np.add(vy, tmp, out=vy, where=update)
+
+def strafe_distance_anglemod(v, n, L, gamma1, tau, left=True):
+    """Compute the distances and speeds after strafing optimally for *n*
+    frames subject to anglemod.
+
+    *v* is an array-like of shape (N, 3) holding the initial velocities. Every
+    frame calls :py:meth:`StrafeSim.strafe_optimal_anglemod`, after which each
+    player moves by its speed times *tau*. Return a 2-tuple of arrays of shape
+    (N,) holding the distances travelled and the final speeds. These are
+    comparable to :py:func:`pystrafe.motion.strafe_distance_frames`, which
+    computes the same without anglemod, and to the continuous time
+    :py:func:`pystrafe.motion.strafe_distance`.
+
+    >>> x, speed = strafe_distance_anglemod([[400.0, 0.0, 0.0]], 1000, 30, 3.2, 0.001)
+    >>> '{:.7g} {:.7g}'.format(x[0], speed[0])
+    '497.7086 583.7657'
+    >>> from pystrafe import motion
+    >>> '{:.7g} {:.7g}'.format(*motion.strafe_distance_frames(1000, 400, 181760, 0.001))
+    '498.162 584.6024'
+    """
+    sim = StrafeSim(v, tau)
+    distance = np.zeros(len(sim.v))
+    # Each frame depends on the last, so only the summing of the speeds is
+    # done a chunk of frames at a time.
+    speeds = np.empty((min(n, _chunk_frames), len(sim.v)))
+    for start in range(0, n, len(speeds)):
+        chunk = speeds[:min(len(speeds), n - start)]
+        for row in chunk:
+            sim.strafe_optimal_anglemod(L, gamma1, left)
+            np.copyto(row, sim._compute_speed())
+        distance += chunk.sum(axis=0)
+    distance *= tau
+    return distance, sim._compute_speed().copy()
+
+def _iter_frames(v, position, tau, L, gamma1, n, theta, left, onground, E, k,
+                 g, every, until):
+    """Yield the frame number, position and velocity lists of the sampled
+    frames. The lists are reused between frames."""
+    pos = position
+    half_g = 0.5 * g * tau
+    stop = False
+    i = 0
+    yield i, pos, v
+    while n is None or i < n:
+        i += 1
+        if onground:
+            basic.friction(v, tau, E, k)
+        else:
+            v[2] -= half_g
+        if theta is None:
+            basic.strafe_optimal(v, L, gamma1, left)
+        else:
+            basic.strafe_fme_theta(v, theta, L, gamma1)
+        pos[0] += v[0] * tau
+        pos[1] += v[1] * tau
+        pos[2] += v[2] * tau
+        if not onground:
+            v[2] -= half_g
+        stop = until is not None and until(pos, v)
+        if stop or i % every == 0 or i == n:
+            yield i, pos, v
+        if stop:
+            return
+
+def iter_trajectory(v, tau, L, gamma1, n=None, position=(0.0, 0.0, 0.0),
+                    theta=None, left=True, onground=False, E=basic.E, k=basic.k,
+                    g=basic.g, every=1, chunk_size=None, until=None):
+    """Return an iterator over the trajectory of a strafing player frame by
+    frame.
+
+    *v* and *position* are the initial 3D velocity and position. Every frame
+    strafes with :py:func:`pystrafe.basic.strafe_optimal` towards the side
+    given by *left*, or with :py:func:`pystrafe.basic.strafe_fme_theta` if
+    *theta* is given, and then moves the player by the velocity times *tau*.
+    On the ground, :py:func:`pystrafe.basic.friction` is applied first. In
+    the air, half of the gravity is applied before and half after the move,
+    as in the game. The remaining parameters have the same meanings as those
+    in :py:mod:`pystrafe.basic`.
+
+    The run lasts *n* frames, or forever if *n* is ``None``, and stops early
+    after the first frame for which ``until(position, velocity)`` is true.
+    The two lists passed to *until* must not be modified.
+
+    The initial state is frame 0, and only the frames that are multiples of
+    *every* are generated, together with the last frame of the run. If
+    *chunk_size* is ``None``, each frame is a :py:class:`TrajectoryPoint` of
+    the frame number, position and velocity as tuples, and horizontal speed.
+    Otherwise, the frames are grouped into :py:class:`TrajectoryBlock` of
+    NumPy arrays, with up to *chunk_size* frames each. The arguments are
+    checked when this is called, and no frame is computed until the first is
+    requested.
+
+    >>> v = [400, 0, 268]
+    >>> for p in iter_trajectory(v, 0.001, 30, 3.2, n=500, every=250):
+    ...     print(p.frame, [round(c, 3) for c in p.position], round(p.speed, 3))
+    0 [0.0, 0.0, 0.0] 400.0
+    250 [51.199, 76.412, 42.0] 453.255
+    500 [-46.362, 117.789, 34.0] 500.879
+    >>> blocks = iter_trajectory(v, 0.001, 30, 3.2, chunk_size=4,
+    ...                          until=lambda pos, v: pos[0] >= 50)
+    >>> block = list(blocks)[-1]
+    >>> block.frame, block.position[:, 0].round(3)
+    (array([156, 157]), array([49.987, 50.144]))
+    """
+    if every < 1:
+        raise ValueError('every must be > 0')
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError('chunk_size must be > 0')
+    v = [float(c) for c in v]
+    position = [float(c) for c in position]
+    if len(v) != 3 or len(position) != 3:
+        raise ValueError('v and position must be 3D')
+    frames = _iter_frames(v, position, tau, L, gamma1, n, theta, left,
+                          onground, E, k, g, every, until)
+    if chunk_size is None:
+        return _iter_points(frames)
+    return _iter_blocks(frames, chunk_size)
+
+def _iter_points(frames):
+    for i, pos, vel in frames:
+        yield TrajectoryPoint(i, tuple(pos), tuple(vel),
+                              math.sqrt(vel[0] * vel[0] + vel[1] * vel[1]))
+
+def _iter_blocks(frames, chunk_size):
+    # Filling Python lists and converting once per chunk is much faster than
+    # assigning rows of arrays frame by frame.
+    frame, buf = [], []
+    for i, pos, vel in frames:
+        frame.append(i)
+        buf += pos
+        buf += vel
+        if len(frame) == chunk_size:
+            yield _block(frame, buf)
+            frame, buf = [], []
+    if frame:
+        yield _block(frame, buf)
+
+def _block(frame, buf):
+    state = np.array(buf).reshape(-1, 6)
+    velocity = state[:, 3:]
+    return TrajectoryBlock(np.array(frame), state[:, :3], velocity,
+                           np.hypot(velocity[:, 0], velocity[:, 1]))
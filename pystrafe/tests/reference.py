@@ -0,0 +1,32 @@
+"""Plain Python versions of the game's code that the tests check against."""
+
+import warnings
+from pystrafe import basic
+
+def dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+def reference_clip(v, planes, b=1):
+    """The clipping of the game's fly move for a single velocity."""
+    if len(planes) == 1:
+        v = list(v)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            basic.collide(v, planes[0], b)
+        return v
+    for i, n in enumerate(planes):
+        d = dot(v, n)
+        out = [v[0] - n[0] * d, v[1] - n[1] * d, v[2] - n[2] * d]
+        if all(dot(out, m) >= 0 for j, m in enumerate(planes) if j != i):
+            break
+    else:
+        if len(planes) != 2:
+            return [0.0, 0.0, 0.0]
+        a, c = planes
+        direction = [a[1] * c[2] - a[2] * c[1], a[2] * c[0] - a[0] * c[2],
+                     a[0] * c[1] - a[1] * c[0]]
+        d = dot(direction, v)
+        out = [direction[0] * d, direction[1] * d, direction[2] * d]
+    if dot(out, v) <= 0:
+        return [0.0, 0.0, 0.0]
+    return out
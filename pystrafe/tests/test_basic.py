@@ -1,5 +1,7 @@
+import math
+import itertools
 from pytest import approx, warns, raises
-from pystrafe import basic
+from pystrafe import basic, scalar
 
 def test_collide():
     v = [-1000, 123, 456]
@@ -56,3 +58,28 @@ def test_frction_low_speed():
     assert v == [0, 0.09]
     basic.friction(v, 10000000, basic.E, basic.k)
     assert v == [0, 0.09]
+
+def test_strafe_optimal_theta():
+    assert basic.strafe_optimal_theta(400, 30, 40) == approx(math.pi / 2)
+    assert basic.strafe_optimal_theta(10, 320, 32) == 0
+    assert math.cos(basic.strafe_optimal_theta(400, 30, 3.2)) == approx(26.8 / 400)
+    with raises(ValueError):
+        basic.strafe_optimal_theta(0, 30, 3.2)
+
+def test_strafe_optimal():
+    speeds = [1e-3, 1, 10, 26.8, 100, 320, 1e4]
+    gamma1s = [0.1, 3.2, 26.8, 30, 32, 400]
+    for speed, L, gamma1, left in itertools.product(speeds, [30, 320], gamma1s,
+                                                   [True, False]):
+        v = [speed * math.cos(0.3), speed * math.sin(0.3)]
+        expected = v[:]
+        theta = basic.strafe_optimal_theta(speed, L, gamma1)
+        basic.strafe_fme_theta(expected, theta if left else -theta, L, gamma1)
+        basic.strafe_optimal(v, L, gamma1, left)
+        assert v == approx(expected, rel=1e-14)
+        maxspeed = scalar.strafe_maxaccel(speed, L, 1, gamma1, 1, 0, 0)
+        assert math.hypot(*v) == approx(maxspeed)
+
+def test_strafe_optimal_zero_speed():
+    with raises(ValueError):
+        basic.strafe_optimal([0, 0], 30, 3.2)
@@ -45,6 +45,45 @@ def test_fall():
     assert damage.fall(1000) == approx(94.5945945945946)
     assert damage.fall(1024) == approx(100)
 
+def test_fall_speed():
+    assert damage.fall_speed(0) == 580
+    assert damage.fall_speed(100) == 1024
+    for dmg in np.arange(0, 200, 0.37):
+        assert damage.fall(damage.fall_speed(dmg)) == approx(dmg)
+    with raises(ValueError):
+        damage.fall_speed(-1)
+
+def test_fall_z():
+    assert damage.fall_z(0, 0, 800) == 0
+    assert damage.fall_z(-1024, 0, 800) == approx(100)
+    assert damage.fall_z(0, -1024 ** 2 / 1600, 800) == approx(100)
+    # Jumping up and falling back to the same height
+    assert damage.fall_z(1024, 0, 800) == damage.fall_z(-1024, 0, 800)
+    with raises(ValueError):
+        damage.fall_z(268, 100, 800)
+
+def test_fall_min_z():
+    for speedzi, dmg in itertools.product([-600, -100, 0, 268, 1000], [0, 10, 100]):
+        z = damage.fall_min_z(dmg, speedzi, 800)
+        assert damage.fall_z(speedzi, z, 800) == approx(dmg)
+        assert damage.fall_z(speedzi, z - 1, 800) > dmg
+    assert damage.fall_min_z(0, 1000, 800) > 0
+    with raises(ValueError):
+        damage.fall_min_z(10, 268, 0)
+
+def test_fall_max_speedzi():
+    cases = list(itertools.product([-100, 0, 50], [0, 10, 100])) + [(-300, 100)]
+    for z, dmg in cases:
+        speedzi = damage.fall_max_speedzi(dmg, z, 800)
+        assert damage.fall_z(speedzi, z, 800) == approx(dmg)
+        assert damage.fall_z(speedzi + 1, z, 800) > dmg
+        # A downward speed cannot reach a landing height above the start.
+        if z <= 0:
+            assert damage.fall_z(-speedzi, z, 800) == approx(dmg)
+    assert damage.fall_max_speedzi(0, 0, 800) == 580
+    with raises(ValueError):
+        damage.fall_max_speedzi(0, -1000, 800)
+
 def test_ap_dhp_damage_pos_dhp_pos_dmg():
     assert damage.ap_dhp_damage(20, 40) == (9.5, 10, '(', ']')
     assert damage.ap_dhp_damage(20, 70) == (24.5, 25.0, '(', ']')
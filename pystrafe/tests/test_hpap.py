@@ -0,0 +1,85 @@
+import itertools
+import numpy as np
+from pytest import raises
+from pystrafe import damage, hpap
+
+dmgs = [-2.5, 0.25, 7.5, 10, 20, 42.5, 50]
+index = hpap.TransitionIndex(dmgs, hp_range=(1, 100), ap_max=50, ap_step=0.1)
+
+def apply(hp, ap, seq):
+    for dmg in seq:
+        hp, ap = damage.hpap_damage(hp, ap, dmg)
+    return hp, ap
+
+def test_step():
+    for hp, a, i in itertools.product(range(1, 101, 7), range(0, 501, 23), range(len(dmgs))):
+        ap = a * 0.1
+        hp2, ap2 = damage.hpap_damage(hp, ap, dmgs[i])
+        ret = index.step(hp, ap, i)
+        if 1 <= hp2 <= 100 and round(ap2 * 10) <= 500:
+            assert ret[0] == hp2 and round(ret[1] * 10) == round(ap2 * 10)
+        else:
+            assert ret is None
+
+def test_predecessors():
+    for hp, ap in [(50, 20), (99, 0), (1, 0), (100, 50)]:
+        preds = index.predecessors(hp, ap)
+        assert len(set(preds)) == len(preds)
+        for hp1, ap1, dmg in preds:
+            assert index.step(hp1, ap1, dmgs.index(dmg)) == index.hpap(index.state(hp, ap))
+    expected = {(hp, a) for hp, a in itertools.product(range(1, 101), range(501))
+                if index.step(hp, a * 0.1, 3) == (50, 20.0)}
+    assert {(hp, round(ap * 10)) for hp, ap, dmg in index.predecessors(50, 20)
+            if dmg == 10} == expected
+
+def test_reverse_reachable():
+    states = index.reverse_reachable(50, 20, 2)
+    assert len(states)
+    for hp, ap in states:
+        assert any(index.state(*apply(hp, ap, seq)) == index.state(50, 20)
+                   for seq in itertools.product(dmgs, repeat=2))
+    one = {tuple(s) for s in index.reverse_reachable(50, 20, 1)}
+    assert one == {(hp, ap) for hp, ap, dmg in index.predecessors(50, 20)}
+
+def reference_distances(hp, ap):
+    start = (hp, round(ap * 10))
+    dist = {start: 0}
+    frontier = [start]
+    while frontier:
+        new = []
+        for hp, a in frontier:
+            for dmg in dmgs:
+                hp2, ap2 = damage.hpap_damage(hp, a * 0.1, dmg)
+                s = (hp2, round(ap2 * 10))
+                if 1 <= hp2 <= 100 and s[1] <= 500 and s not in dist:
+                    dist[s] = dist[(hp, a)] + 1
+                    new.append(s)
+        frontier = new
+    return dist
+
+def test_shortest_sequence():
+    assert index.shortest_sequence(100, 50, 100, 50) == []
+    dist = reference_distances(100, 30)
+    for target in [(94, 38), (60, 0), (33, 12.5), (100, 50), (1, 0), (57, 0.3)]:
+        key = (target[0], round(target[1] * 10))
+        seq = index.shortest_sequence(100, 30, *target)
+        if key not in dist:
+            assert seq is None
+            continue
+        assert len(seq) == dist[key]
+        hp, ap = apply(100, 30, seq)
+        assert (hp, round(ap * 10)) == key
+    assert index.shortest_sequence(100, 50, 33, 12.5, max_steps=1) is None
+
+def test_invalid():
+    with raises(ValueError):
+        index.state(0, 0)
+    with raises(ValueError):
+        index.state(50, 51)
+    with raises(ValueError):
+        index.state(10.7, 0)
+    assert index.state(10.0, 0) == index.state(np.int64(10), 0)
+    with raises(ValueError):
+        hpap.TransitionIndex([np.nan])
+    with raises(ValueError):
+        hpap.TransitionIndex([1], hp_range=(10, 1))
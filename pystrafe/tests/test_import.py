@@ -0,0 +1,41 @@
+import sys
+import subprocess
+from pytest import raises, importorskip
+import pystrafe
+
+def import_times(stmt):
+    """Return a dict of the cumulative import times in microseconds of every
+    module imported by *stmt* in a fresh interpreter."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', stmt],
+                          stderr=subprocess.PIPE, universal_newlines=True,
+                          check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def test_lazy_submodules():
+    times = import_times('import pystrafe')
+    assert 'pystrafe' in times
+    assert not any(name.startswith('pystrafe.') for name in times)
+
+def test_no_scipy_at_import():
+    for module in ['damage', 'view', 'ladder', 'basic', 'motion', 'scalar']:
+        times = import_times('import pystrafe.' + module)
+        assert 'pystrafe.' + module in times
+        assert not any(name.startswith(('scipy', 'numpy')) for name in times)
+
+def test_scipy_on_solve():
+    importorskip('scipy.optimize')
+    times = import_times('from pystrafe import motion\n'
+                         'motion.strafe_solve_speedxi(0, 181760, 100, -18, 800)')
+    assert 'scipy.optimize' in times
+
+def test_getattr():
+    assert pystrafe.damage.hpap_damage(100, 0, 1) == (99, 0)
+    assert 'motion' in dir(pystrafe)
+    with raises(AttributeError):
+        pystrafe.nonexistent
@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import subprocess
+from pytest import raises
+from pystrafe import basic, common, instrument, motion
+from pystrafe.vec import motion as vmotion
+
+K = motion.strafe_K_std(0.001)
+
+def test_counts():
+    originals = (motion.strafe_solve_speedxi, common.vec_dot, motion._optimize)
+    with instrument.Instrument() as ins:
+        assert motion.strafe_solve_speedxi is not originals[0]
+        for _ in range(3):
+            basic.strafe_fme_theta([400.0, 0.0, 0.0], 1.5, 30, 3.2)
+        with raises(ValueError):
+            motion.strafe_solve_speedxi(268, K, 100, 1000, 800)
+        motion.solve_boost_min_dmg([100, 268], K, 400, 500, 800)
+    assert (motion.strafe_solve_speedxi, common.vec_dot, motion._optimize) \
+        == originals
+
+    stats = ins.as_dict()
+    assert stats['pystrafe.basic.strafe_fme_theta']['calls'] == 3
+    assert stats['pystrafe.basic.strafe_fme_theta']['time'] > 0
+    assert stats['pystrafe.motion.strafe_solve_speedxi'] == {
+        'calls': 1, 'time': stats['pystrafe.motion.strafe_solve_speedxi']['time'],
+        'failures': 1}
+    assert set(stats['minimize_scalar']) == {'calls', 'time', 'failures',
+                                             'iterations', 'nfev'}
+    assert stats['minimize_scalar']['calls'] == 1
+    solver = stats['minimize_scalar']
+    assert solver['nfev'] > solver['iterations'] > 0
+    assert 'brentq' not in stats
+    assert json.loads(ins.to_json()) == stats
+
+def test_brentq():
+    with instrument.Instrument(['motion']) as ins:
+        speed = motion.strafe_solve_speedxi(0, K, 100, -18, 800)
+    assert speed == motion.strafe_solve_speedxi(0, K, 100, -18, 800)
+    stats = ins.as_dict()
+    assert list(stats) == ['brentq', 'pystrafe.motion.strafe_solve_speedxi']
+    assert stats['brentq']['calls'] == 1
+    assert stats['brentq']['nfev'] == stats['brentq']['iterations'] + 1
+
+def test_reenter_reset():
+    ins = instrument.Instrument(['vec.motion'])
+    for _ in range(2):
+        with ins:
+            vmotion.strafe_time([0, 100], 320, K)
+    assert ins.as_dict()['pystrafe.vec.motion.strafe_time']['calls'] == 2
+    ins.reset()
+    assert ins.as_dict() == {}
+
+def test_single_active():
+    with instrument.Instrument():
+        with raises(RuntimeError):
+            instrument.Instrument().start()
+    with instrument.Instrument():
+        pass
+
+def test_environ(tmp_path):
+    path = tmp_path / 'stats.json'
+    env = dict(os.environ, PYSTRAFE_INSTRUMENT=str(path))
+    subprocess.run([sys.executable, '-c',
+                    'from pystrafe import common\n'
+                    'common.vec_dot([1, 2], [3, 4])'],
+                   env=env, check=True)
+    stats = json.loads(path.read_text())
+    assert stats['pystrafe.common.vec_dot']['calls'] == 1
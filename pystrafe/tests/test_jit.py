@@ -0,0 +1,108 @@
+import math
+import random
+import warnings
+import numpy as np
+from pytest import raises
+from pystrafe import basic, jit, scalar, sim
+
+# Compiled sines and cosines may differ from math's, so the results of the
+# kernels using them are only required to be within the stated bound.
+trig_ulps = jit.trig_ulps if jit.available else 0
+
+def ulp_close(a, b, ulps):
+    return all(abs(x - y) <= ulps * math.ulp(max(abs(x), abs(y)))
+               for x, y in zip(a, b))
+
+def random_velocities(n, seed):
+    rng = random.Random(seed)
+    vs = [[rng.uniform(-1000, 1000), rng.uniform(-1000, 1000),
+           rng.uniform(-500, 500)] for _ in range(n)]
+    vs += [[0.05, 0.0, 10.0], [2.0, -1.0, 0.0], [100.0, 0.0, 0.0],
+           [0.4, 0.0, 0.0], [50.0, 50.0, 0.0]]
+    return vs
+
+def test_available():
+    assert isinstance(jit.available, bool)
+
+def test_scalar_friction():
+    for speed in [0.0, 0.3, 0.4, 50.0, 99.999, 100.0, 1000.0]:
+        for tau in [0.001, 0.01]:
+            assert jit.scalar_friction(speed, tau, 100.0, 4.0) \
+                == scalar.friction(speed, tau, 100.0, 4.0)
+
+def test_scalar_strafe_maxaccel():
+    for speed in [0.0, 0.4, 50.0, 320.0, 1000.0]:
+        for L, tau, A in [(30, 0.001, 10), (30, 0.01, 10), (320, 0.001, 10),
+                          (30, 0.001, 100)]:
+            assert jit.scalar_strafe_maxaccel(speed, L, tau, 320, A, 100, 4) \
+                == scalar.strafe_maxaccel(speed, L, tau, 320, A, 100, 4)
+
+def test_friction():
+    for v in random_velocities(200, 0):
+        for k in [basic.k, 2 * basic.k]:
+            a = np.array(v)
+            b = list(v)
+            jit.friction(a, 0.01, basic.E, k)
+            basic.friction(b, 0.01, basic.E, k)
+            assert a.tolist() == b
+
+def test_collide():
+    rng = np.random.default_rng(1)
+    normals = rng.normal(size=(205, 3))
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    for v, n in zip(random_velocities(200, 1), normals.tolist()):
+        for b in [1.0, 1.5, 0.5]:
+            a = np.array(v)
+            expected = list(v)
+            jit.collide(a, np.array(n), b)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                basic.collide(expected, n, b)
+            assert a.tolist() == expected
+
+def test_collide_not_unit():
+    with raises(ValueError):
+        jit.collide(np.zeros(3), np.array([1.0, 1.0, 0.0]))
+
+def test_strafe_fme_theta():
+    rng = random.Random(2)
+    for v in random_velocities(200, 2):
+        theta = rng.uniform(-math.pi, math.pi)
+        for L, gamma1 in [(30, 3.2), (320, 32)]:
+            a = np.array(v)
+            b = list(v)
+            jit.strafe_fme_theta(a, theta, L, gamma1)
+            basic.strafe_fme_theta(b, theta, L, gamma1)
+            assert ulp_close(a.tolist(), b, trig_ulps)
+
+def test_strafe_fme_theta_zero_speed():
+    with raises(ValueError):
+        jit.strafe_fme_theta(np.zeros(3), 0.5, 30, 3.2)
+
+def test_step():
+    rng = random.Random(3)
+    # Leave out the slow velocities that friction stops.
+    for v in random_velocities(100, 3)[:100]:
+        theta = rng.uniform(0, math.pi / 2)
+        for onground in [False, True]:
+            pos, vel = np.zeros(3), np.array(v)
+            jit.step(pos, vel, 0.001, theta, 30.0, 3.2, onground, basic.E,
+                     basic.k, basic.g)
+            traj = sim.iter_trajectory(v, 0.001, 30, 3.2, n=1, theta=theta,
+                                       onground=onground)
+            last = list(traj)[-1]
+            assert ulp_close(pos.tolist(), last.position, trig_ulps)
+            assert ulp_close(vel.tolist(), last.velocity, trig_ulps)
+
+def test_run():
+    pos, vel = np.zeros(3), np.array([400.0, 0.0, 268.0])
+    jit.run(pos, vel, 1000, 0.001, 1.5, 30.0, 3.2, False, basic.E, basic.k,
+            basic.g)
+    last = list(sim.iter_trajectory([400, 0, 268], 0.001, 30, 3.2, n=1000,
+                                    theta=1.5, every=1000))[-1]
+    if jit.available:
+        assert np.allclose(pos, last.position, rtol=1e-12, atol=0)
+        assert np.allclose(vel, last.velocity, rtol=1e-12, atol=0)
+    else:
+        assert pos.tolist() == list(last.position)
+        assert vel.tolist() == list(last.velocity)
@@ -0,0 +1,54 @@
+"""Checks of the compiled kernels, skipped unless Numba is installed.
+
+The parity tests in test_jit.py run against whichever backend is in use; the
+tests here make sure that it is the compiled one, in nopython mode."""
+
+import math
+import numpy as np
+from pytest import importorskip
+from pystrafe import basic, jit, sim
+
+numba = importorskip('numba')
+
+kernels = ['scalar_friction', 'scalar_strafe_maxaccel', 'collide', 'friction',
+           'strafe_fme_theta', 'step', 'run']
+
+def test_available():
+    assert jit.available
+    for name in kernels:
+        assert isinstance(getattr(jit, name), numba.core.registry.CPUDispatcher)
+
+def test_nopython():
+    v = np.array([400.0, 100.0, -50.0])
+    pos = np.zeros(3)
+    jit.scalar_friction(400.0, 0.001, basic.E, basic.k)
+    jit.scalar_strafe_maxaccel(400.0, 30.0, 0.001, 320.0, 10.0, basic.E, basic.k)
+    jit.collide(v, np.array([0.0, 0.0, 1.0]), 1.0)
+    jit.friction(v, 0.001, basic.E, basic.k)
+    jit.strafe_fme_theta(v, 1.5, 30.0, 3.2)
+    jit.step(pos, v, 0.001, 1.5, 30.0, 3.2, False, basic.E, basic.k, basic.g)
+    jit.run(pos, v, 10, 0.001, 1.5, 30.0, 3.2, True, basic.E, basic.k, basic.g)
+    for name in kernels:
+        # njit never falls back to object mode, so any compiled signature is
+        # a nopython one.
+        assert getattr(jit, name).nopython_signatures
+
+def test_strafe_fme_theta_ulps():
+    rng = np.random.default_rng(0)
+    for vx, vy, theta in rng.uniform(-1000, 1000, (1000, 3)):
+        theta = math.fmod(theta, math.pi)
+        a = np.array([vx, vy, 0.0])
+        b = [vx, vy, 0.0]
+        jit.strafe_fme_theta(a, theta, 30.0, 3.2)
+        basic.strafe_fme_theta(b, theta, 30, 3.2)
+        for x, y in zip(a.tolist(), b):
+            assert abs(x - y) <= jit.trig_ulps * math.ulp(max(abs(x), abs(y)))
+
+def test_run():
+    pos, vel = np.zeros(3), np.array([400.0, 0.0, 268.0])
+    jit.run(pos, vel, 1000, 0.001, 1.5, 30.0, 3.2, False, basic.E, basic.k,
+            basic.g)
+    last = list(sim.iter_trajectory([400, 0, 268], 0.001, 30, 3.2, n=1000,
+                                    theta=1.5, every=1000))[-1]
+    np.testing.assert_allclose(pos, last.position, rtol=1e-12)
+    np.testing.assert_allclose(vel, last.velocity, rtol=1e-12)
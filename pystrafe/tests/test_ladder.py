@@ -1,4 +1,5 @@
 import math
+import itertools
 from pystrafe import ladder, view
 from pytest import approx, raises
 
@@ -62,3 +63,57 @@ def test_maxspeed_normal_n_length():
     with raises(ValueError):
         tmp = math.sqrt(1 / 3)
         ladder.maxspeed_normal([tmp, tmp, tmp + 1e-3], 1, 1, 1)
+
+def test_ladder_cache():
+    cache = ladder.LadderCache()
+    c = math.sqrt(0.5)
+    normals = [[1, 0, 0], [0, c, c], [c, 0, -c], [0, 0, 1],
+               [0.6, 0, 0.8], [0, -0.8, -0.6]]
+    signs = list(itertools.product([1, -1, 0.0, -0.0], repeat=3))
+    for _ in range(2):
+        for n in normals:
+            for vdir, F, S in signs:
+                assert cache.maxspeed_normal(n, vdir, F, S) \
+                    == ladder.maxspeed_normal(n, vdir, F, S)
+    info = cache.cache_info()
+    assert info.misses == len(normals) == info.currsize
+    assert info.hits == 2 * len(normals) * len(signs) - len(normals)
+
+    cache.maxspeed_normal([1 - 1e-10, 1e-7, 0], 1, 1, 1)
+    assert cache.cache_info().misses == len(normals)
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 1024, 0)
+
+def test_ladder_cache_exact():
+    cache = ladder.LadderCache(quantum=None)
+    assert cache.maxspeed_normal([0.6, 0, 0.8], 1, -1, 1) \
+        == ladder.maxspeed_normal([0.6, 0, 0.8], 1, -1, 1)
+    cache.maxspeed_normal([0.6, 0, 0.8], -1, 1, 1)
+    cache.maxspeed_normal([0.6 + 1e-12, 0, 0.8], 1, 1, 1)
+    assert cache.cache_info() == (1, 2, 1024, 2)
+
+def test_ladder_cache_lru():
+    cache = ladder.LadderCache(maxsize=2)
+    c = math.sqrt(0.5)
+    cache.maxspeed_normal([1, 0, 0], 1, 1, 1)
+    cache.maxspeed_normal([0, 1, 0], 1, 1, 1)
+    cache.maxspeed_normal([1, 0, 0], 1, 1, 1)
+    cache.maxspeed_normal([c, c, 0], 1, 1, 1)
+    assert cache.cache_info() == (1, 3, 2, 2)
+    cache.maxspeed_normal([1, 0, 0], 1, 1, 1)
+    cache.maxspeed_normal([0, 1, 0], 1, 1, 1)
+    assert cache.cache_info() == (2, 4, 2, 2)
+
+def test_ladder_cache_invalid():
+    with raises(ValueError):
+        ladder.LadderCache(maxsize=0)
+    with raises(ValueError):
+        ladder.LadderCache(quantum=0)
+    with raises(ValueError):
+        ladder.LadderCache().maxspeed_normal([1, 1, 0], 1, 1, 1)
+    # A non-unit normal sharing the key of a cached normal.
+    cache = ladder.LadderCache()
+    cache.maxspeed_normal([1, 0, 0], 1, 1, 1)
+    with raises(ValueError):
+        cache.maxspeed_normal([1 + 4e-7, 0, 0], 1, 1, 1)
+    assert cache.cache_info().hits == 0
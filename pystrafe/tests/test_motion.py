@@ -25,6 +25,40 @@ def test_strafe_K_neg_params():
     with raises(ValueError):
         motion.strafe_K(10, -10, 10, -10)
 
+def test_strafe_config():
+    cfg = motion.StrafeConfig(30, 0.001, 320, 10)
+    assert cfg.K == motion.strafe_K(30, 0.001, 320, 10)
+    assert cfg.gamma1 == approx(3.2) and cfg.LtauMA == approx(26.8)
+    assert eval('motion.' + repr(cfg)).K == cfg.K
+    assert motion.strafe_config(30, 0.001, 320, 10) is motion.strafe_config(30, 0.001, 320, 10)
+    with raises(ValueError):
+        motion.StrafeConfig(30, -0.001, 320, 10)
+
+def outcome(f, *args):
+    try:
+        return f(*args)
+    except ValueError as e:
+        return str(e)
+
+def test_strafe_config_methods():
+    for params in [(30, 0.001, 320, 10), (30, 0.01, 320, 100), (30, 0.001, 320, 0)]:
+        cfg = motion.strafe_config(*params, 800)
+        K = cfg.K
+        for t, speed in itertools.product([0, 0.5, 2.5], [0, -100, 400]):
+            assert cfg.strafe_speedxf(t, speed) == motion.strafe_speedxf(t, speed, K)
+            assert cfg.strafe_distance(t, speed) == motion.strafe_distance(t, speed, K)
+            assert cfg.strafe_time(t * 1000, speed) == motion.strafe_time(t * 1000, speed, K)
+            assert cfg.strafe_distance_frames(int(t * 100), speed) \
+                == motion.strafe_distance_frames(int(t * 100), speed, K, params[1])
+        if K == 0:
+            continue
+        for v, x, z in itertools.product([0, 268, 1000], [0, 100, 1000], [-300, 0, 30]):
+            for method in ['brentq', 'newton']:
+                assert outcome(cfg.strafe_solve_speedxi, v, x, z, method) \
+                    == outcome(motion.strafe_solve_speedxi, v, K, x, z, 800, method)
+            assert cfg.solve_boost_min_dmg([100, v], x, z) \
+                == motion.solve_boost_min_dmg([100, v], K, x, z, 800)
+
 def test_strafe_speedxf():
     with raises(ValueError):
         motion.strafe_speedxf(4, 450, -10)
@@ -68,6 +102,29 @@ def test_strafe_distance_zero_K():
     assert motion.strafe_distance(1, 100, 0) == 100
     assert motion.strafe_distance(1, -100, 0) == 100
 
+def test_strafe_distance_frames():
+    for n, speed, K, tau in itertools.product(
+            [0, 1, 2, 31, 32, 33, 100, 2500], [0, 1e-3, 30, 320, -400, 5000],
+            [0, 1, motion.strafe_K_std(0.001), 1e7], [0.001, 0.01, 0.1]):
+        speeds = [math.sqrt(speed * speed + i * K * tau) for i in range(n + 1)]
+        x, speedf = motion.strafe_distance_frames(n, speed, K, tau)
+        assert x == approx(tau * math.fsum(speeds[1:]), rel=1e-14, abs=0)
+        assert speedf == approx(speeds[-1], rel=1e-15)
+
+def test_strafe_distance_frames_continuous():
+    K = motion.strafe_K_std(0.001)
+    x, speedf = motion.strafe_distance_frames(100000, 400, K, 0.001)
+    assert x == approx(motion.strafe_distance(100, 400, K), 1e-5)
+    assert speedf == approx(motion.strafe_speedxf(100, 400, K))
+
+def test_strafe_distance_frames_invalid():
+    with raises(ValueError):
+        motion.strafe_distance_frames(-1, 400, 1, 0.001)
+    with raises(ValueError):
+        motion.strafe_distance_frames(1, 400, -1, 0.001)
+    with raises(ValueError):
+        motion.strafe_distance_frames(1, 400, 1, -0.001)
+
 def test_strafe_time():
     assert motion.strafe_time(400, 400, 1e-5) == approx(0.9999901521950959)
     assert motion.strafe_time(400, 400, 0) == approx(1)
@@ -302,3 +359,31 @@ def test_solve_boost_min_dmg_no_dv():
     dv = motion.solve_boost_min_dmg([0, 1500], K, 500, 1000, 800)
     assert dv[0] == approx(0, abs=1e-5)
     assert dv[1] == approx(0, abs=1e-5)
+
+def test_strafe_solve_speedxi_newton():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    with raises(ValueError):
+        motion.strafe_solve_speedxi(0, K, 100, -18, 800, 'secant')
+    assert motion.strafe_solve_speedxi(0, K, 100, -18, 800, 'newton') \
+        == approx(450.6474498822009)
+    assert motion.strafe_solve_speedxi(0, K, 100, -100, 800, 'newton') == 0
+    assert motion.strafe_solve_speedxi(0, K, 100, 0, 800, 'newton') == math.inf
+    assert math.isnan(motion.strafe_solve_speedxi(-100, K, 10, 2, 800, 'newton'))
+    vs = range(-1000, 1001, 100)
+    xs = range(1, 10000, 500)
+    zs = range(-600, 601, 100)
+    for v, x, z in itertools.product(vs, xs, zs):
+        try:
+            expected = motion.strafe_solve_speedxi(v, K, x, z, 800)
+        except ValueError:
+            continue
+        ret = motion.strafe_solve_speedxi(v, K, x, z, 800, 'newton')
+        assert ret == approx(expected, nan_ok=True)
+
+def test_strafe_solve_speedxi_newton_large_speed():
+    # The original equation cancels catastrophically at such speeds, where the
+    # strafing time is practically x / v.
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    x, tz = 4672.656406837548, 1e-4
+    v = motion.strafe_solve_speedxi(0, K, x, -400 * tz * tz, 800, 'newton')
+    assert v == approx(x / tz)
@@ -0,0 +1,82 @@
+import sys
+import math
+import itertools
+from pytest import raises, approx, importorskip
+from pystrafe import optimize, motion
+
+def test_brentq():
+    scipy_optimize = importorskip('scipy.optimize')
+    funcs = [(lambda x: x * x - 2, 0, 2), (lambda x: math.cos(x) - x, 0, 1),
+             (lambda x: x ** 3 - 1, -1, 3), (lambda x: math.exp(x) - 1e5, 0, 100)]
+    for f, a, b in funcs:
+        root, res = optimize.brentq(f, a, b, full_output=True)
+        expected, expected_res = scipy_optimize.brentq(f, a, b, full_output=True)
+        assert root == expected
+        assert res.iterations == expected_res.iterations
+        assert res.function_calls == expected_res.function_calls
+        assert res.converged
+
+def test_brentq_root_at_bounds():
+    assert optimize.brentq(lambda x: x, 0, 1) == 0
+    assert optimize.brentq(lambda x: x - 1, 0, 1) == 1
+
+def test_brentq_sign():
+    with raises(ValueError):
+        optimize.brentq(lambda x: x * x + 1, -1, 1)
+
+def test_brentq_maxiter():
+    with raises(RuntimeError):
+        optimize.brentq(lambda x: math.cos(x) - x, 0, 1, maxiter=2)
+
+def test_minimize_scalar():
+    scipy_optimize = importorskip('scipy.optimize')
+    funcs = [lambda x: (x - 3) ** 2 + 1, lambda x: math.cosh(x - 0.2),
+             lambda x: x ** 4 - 3 * x, lambda x: abs(x + 100) + 5,
+             lambda x: math.exp(-x) + x]
+    for f in funcs:
+        res = optimize.minimize_scalar(f)
+        expected = scipy_optimize.minimize_scalar(f)
+        assert res.x == expected.x
+        assert res.fun == expected.fun
+        assert res.nit == expected.nit
+        assert res.nfev == expected.nfev
+        assert res.success
+
+def test_minimize_scalar_no_bracket():
+    res = optimize.minimize_scalar(lambda x: math.inf)
+    assert not res.success
+    res = optimize.minimize_scalar(lambda x: -x)
+    assert not res.success
+
+def test_motion_without_scipy(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'scipy.optimize', None)
+    motion._optimize.cache_clear()
+    try:
+        assert motion._optimize() is optimize
+        K = motion.strafe_K(30, 0.001, 320, 10)
+        assert motion.strafe_solve_speedxi(0, K, 100, -18, 800) \
+            == approx(450.6474498822009)
+        dv = motion.solve_boost_min_dmg([0, 0], K, 400, 400, 800)
+        assert dv[0] == approx(79.399032802535118, 1e-4)
+        assert dv[1] == approx(816.5301806366407, 1e-4)
+    finally:
+        motion._optimize.cache_clear()
+
+def test_motion_fallback_matches_scipy(monkeypatch):
+    importorskip('scipy.optimize')
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    args = list(itertools.product([-300, 0, 268, 1000], [100, 1000, 5000], [-400, -18, 1, 300]))
+    expected_speeds = []
+    expected_boosts = []
+    for v, x, z in args:
+        try:
+            expected_speeds.append(motion.strafe_solve_speedxi(v, K, x, z, 800))
+        except ValueError:
+            expected_speeds.append(None)
+        expected_boosts.append(motion.solve_boost_min_dmg([100, v], K, x, z, 800))
+
+    monkeypatch.setattr(motion, '_optimize', lambda: optimize)
+    for (v, x, z), speed, boost in zip(args, expected_speeds, expected_boosts):
+        if speed is not None:
+            assert motion.strafe_solve_speedxi(v, K, x, z, 800) == approx(speed, nan_ok=True)
+        assert motion.solve_boost_min_dmg([100, v], K, x, z, 800) == approx(boost)
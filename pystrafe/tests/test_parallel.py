@@ -0,0 +1,63 @@
+import math
+import numpy as np
+from pytest import raises
+from pystrafe import motion, parallel
+
+K = motion.strafe_K_std(0.001)
+rng = np.random.default_rng(0)
+xs = rng.uniform(0, 2000, 500)
+zs = rng.uniform(-500, 100, 500)
+
+def test_map_solve_speedxi():
+    ret = parallel.map_solve_speedxi(268, K, xs, zs, 800, workers=2, chunksize=37)
+    assert ret.shape == (500,)
+    for r, x, z in zip(ret, xs, zs):
+        try:
+            expected = motion.strafe_solve_speedxi(268, K, x, z, 800)
+        except ValueError:
+            expected = math.nan
+        assert r == expected or (math.isnan(r) and math.isnan(expected))
+    assert np.isnan(ret).any()
+    serial = parallel.map_solve_speedxi(268, K, xs, zs, 800, workers=1)
+    np.testing.assert_array_equal(ret, serial)
+
+def test_map_solve_speedxi_shape():
+    z = np.linspace(-300, 0, 4)
+    ret = parallel.map_solve_speedxi(268, K, xs[:6, None], z, 800,
+                                     method='newton', workers=2, chunksize=5)
+    assert ret.shape == (6, 4)
+    assert ret[3, 2] == motion.strafe_solve_speedxi(268, K, xs[3], z[2], 800, 'newton')
+    with raises(ValueError):
+        parallel.map_solve_speedxi(268, K, xs, zs, 800, chunksize=0)
+
+def test_map_boost_min_dmg():
+    vi = np.stack([rng.uniform(0, 400, 40), np.full(40, 268.0)], axis=-1)
+    ret = parallel.map_boost_min_dmg(vi, K, xs[:40], zs[:40], 800, workers=2,
+                                     chunksize=3)
+    assert ret.shape == (40, 2)
+    for r, v, x, z in zip(ret, vi, xs, zs):
+        assert r.tolist() == motion.solve_boost_min_dmg(v.tolist(), K, x, z, 800)
+    with raises(ValueError):
+        parallel.map_boost_min_dmg([0, 0], -K, 100, 0, 800)
+    with raises(ValueError):
+        parallel.map_boost_min_dmg([0, 0, 0], K, 100, 0, 800)
+
+def test_map_negative_K():
+    with raises(ValueError):
+        parallel.map_solve_speedxi(268, [K, -K], 100, -18, 800)
+
+def test_map_zero_K_or_g():
+    # A zero K or g makes the scalar solvers divide by zero, which only
+    # affects that element.
+    expected = motion.strafe_solve_speedxi(0, K, 100, -18, 800)
+    for workers in [1, 2]:
+        ret = parallel.map_solve_speedxi(0, [K, 0, K], 100, -18, [800, 800, 0],
+                                         workers=workers, chunksize=1)
+        assert ret[0] == expected
+        assert np.isnan(ret[1:]).all()
+    # The boost solver handles them itself.
+    ret = parallel.map_boost_min_dmg([100, 268], [K, 0], 400, 500, [0, 800])
+    assert ret[0].tolist() == motion.solve_boost_min_dmg([100, 268], K, 400,
+                                                         500, 0)
+    assert ret[1].tolist() == motion.solve_boost_min_dmg([100, 268], 0, 400,
+                                                         500, 800)
@@ -0,0 +1,214 @@
+import math
+import numpy as np
+from pytest import approx, raises
+from pystrafe import basic, common, pmove
+from pystrafe.tests.reference import dot, reference_clip
+
+def reference_step(pos, v, yaw, planes, tau, edgefriction=1.0, accel=True):
+    """One frame of a single player with the scalar functions."""
+    M, A = 320.0, 10.0
+
+    def categorize():
+        hmin = math.inf
+        for nx, ny, nz, d in planes:
+            if nz >= 0.7:
+                hmin = min(hmin, (nx * pos[0] + ny * pos[1] + nz * pos[2] - d) / nz)
+        onground = hmin <= 2 and v[2] <= 180
+        if onground:
+            pos[2] -= hmin
+        return onground
+
+    onground = categorize()
+    basic.gravity_half(v, basic.g, tau)
+    if onground:
+        v[2] = 0.0
+        basic.friction(v, tau, basic.E, basic.k * edgefriction)
+    if accel:
+        L = M if onground else min(30, M)
+        gamma1 = tau * M * A
+        a = common.anglemod_rad(yaw)
+        ax, ay = math.cos(a), math.sin(a)
+        gamma2 = L - (v[0] * ax + v[1] * ay)
+        if gamma2 > 0:
+            mu = min(gamma1, gamma2)
+            v[0] += ax * mu
+            v[1] += ay * mu
+    def dist(plane):
+        return dot(plane, pos) - plane[3]
+
+    def push_out(tol):
+        pushed = False
+        for i, p in enumerate(planes):
+            s = dist(p)
+            if s >= -tol:
+                continue
+            pushed = True
+            touched.add(i)
+            for j, q in enumerate(planes):
+                c = dot(p, q)
+                if j == i or c >= 0 or math.isclose(c, -1):
+                    continue
+                sq = dist(q)
+                if sq - s * c < -tol:
+                    a = (c * sq - s) / (1 - c * c)
+                    b = (c * s - sq) / (1 - c * c)
+                    for k in range(3):
+                        pos[k] += a * p[k] + b * q[k]
+                    touched.add(j)
+                    break
+            else:
+                for k in range(3):
+                    pos[k] -= s * p[k]
+        return pushed
+
+    for i in range(3):
+        pos[i] += v[i] * tau
+    touched = set()
+    if push_out(0.0):
+        for _ in range(len(planes)):
+            if not push_out(1e-9):
+                break
+    moving_in = [planes[i][:3] for i in sorted(touched)
+                 if dot(planes[i], v) < 0]
+    if moving_in:
+        v[:] = reference_clip(v, moving_in)
+    onground = categorize()
+    basic.gravity_half(v, basic.g, tau)
+    if onground:
+        v[2] = 0.0
+    return onground
+
+c = math.sqrt(0.5)
+room = [[0, 0, 1, 0], [-1, 0, 0, -500], [0, c, c, -50], [0.6, 0, 0.8, -20]]
+
+def random_players(n, seed):
+    rng = np.random.default_rng(seed)
+    pos = np.stack([rng.uniform(-400, 400, n), rng.uniform(-400, 400, n),
+                    rng.uniform(0, 100, n)], axis=-1)
+    pos[:n // 2, 2] = 0.0
+    vel = rng.uniform(-600, 600, (n, 3))
+    vel[:n // 2, 2] = 0.0
+    return pos, vel
+
+def test_state_init():
+    state = pmove.PlayerState([[1, 2, 3]])
+    assert state.vel.tolist() == [[0, 0, 0]]
+    assert state.edgefriction.tolist() == [1]
+    assert not state.onground[0]
+    assert len(state) == 1
+    with raises(ValueError):
+        pmove.PlayerState([1, 2, 3])
+    with raises(ValueError):
+        pmove.PlayerState([[1, 2, 3]], [[1, 2]])
+
+def test_init_planes():
+    assert pmove.PlayerMove([], 0.01).normals.shape == (0, 3)
+    with raises(ValueError):
+        pmove.PlayerMove([[0, 0, 1]], 0.01)
+    with raises(ValueError):
+        pmove.PlayerMove([[0, 0, 2, 0]], 0.01)
+
+def test_step_matches_scalar():
+    pos, vel = random_players(100, 0)
+    edgefriction = np.where(np.arange(100) % 3 == 0, 2.0, 1.0)
+    yaws = np.random.default_rng(1).uniform(-np.pi, np.pi, 100)
+    move = pmove.PlayerMove(room, 0.01)
+    state = pmove.PlayerState(pos, vel, edgefriction)
+    ref = [(p, v) for p, v in zip(pos.tolist(), vel.tolist())]
+    for _ in range(100):
+        move.step(state, yaws)
+        for i, (p, v) in enumerate(ref):
+            onground = reference_step(p, v, yaws[i], room, 0.01,
+                                      edgefriction[i])
+            assert state.onground[i] == onground
+            assert state.pos[i].tolist() == approx(p, abs=1e-9)
+            assert state.vel[i].tolist() == approx(v, abs=1e-9)
+
+def test_wedge_matches_scalar():
+    # Two planes meeting at an acute angle, where pushing out of one plane
+    # alone puts the player behind the other.
+    wedge = [[0.6, 0, 0.8, 0], [0.6, 0, -0.8, 0], [0, 1, 0, -300]]
+    rng = np.random.default_rng(2)
+    pos = np.stack([rng.uniform(0, 50, 200), rng.uniform(-200, 200, 200),
+                    rng.uniform(-20, 20, 200)], axis=-1)
+    pos[:, 2] *= pos[:, 0] / 50
+    vel = rng.uniform(-3000, 1000, (200, 3))
+    yaws = rng.uniform(-np.pi, np.pi, 200)
+    move = pmove.PlayerMove(wedge, 0.01)
+    state = pmove.PlayerState(pos, vel)
+    ref = [(p, v) for p, v in zip(pos.tolist(), vel.tolist())]
+    for _ in range(20):
+        move.step(state, yaws)
+        for i, (p, v) in enumerate(ref):
+            onground = reference_step(p, v, yaws[i], wedge, 0.01)
+            assert state.onground[i] == onground
+            assert state.pos[i].tolist() == approx(p, abs=1e-9)
+            assert state.vel[i].tolist() == approx(v, abs=1e-9)
+        assert np.all(state.pos @ move.normals.T - move.dists >= -1e-9)
+
+def test_wedge_push_out():
+    move = pmove.PlayerMove([[0.6, 0, 0.8, 0], [0.6, 0, -0.8, 0]], 0.01)
+    state = pmove.PlayerState([[5, 0, 0]], [[-2000, 0, 0]])
+    move.step(state, 0.0, np.array([False]))
+    assert state.pos[0].tolist() == approx([0, 0, 0], abs=1e-12)
+    assert state.vel[0].tolist() == [0, 0, 0]
+
+def test_ground_friction_exact():
+    vs = [[0.05, 0, 0], [2, -1, 0], [50, 0, 0], [100, 0, 0], [1000, 300, 0]]
+    state = pmove.PlayerState(np.zeros((len(vs), 3)), vs, [1, 1, 2, 3, 1])
+    move = pmove.PlayerMove([[0, 0, 1, 0]], 0.01)
+    move.categorize(state)
+    assert state.onground.all()
+    move.friction(state, state.onground)
+    for v, e, vnew in zip(vs, [1, 1, 2, 3, 1], state.vel.tolist()):
+        basic.friction(v, 0.01, basic.E, basic.k * e)
+        assert vnew == v
+
+def test_no_accel_mask():
+    state = pmove.PlayerState([[0, 0, 0], [0, 0, 0]])
+    move = pmove.PlayerMove([[0, 0, 1, 0]], 0.01)
+    move.step(state, 0.0, np.array([True, False]))
+    assert state.vel.tolist() == [[32, 0, 0], [0, 0, 0]]
+
+def test_onground_speed_limit():
+    state = pmove.PlayerState([[0, 0, 1], [0, 0, 1]], [[0, 0, 180], [0, 0, 181]])
+    move = pmove.PlayerMove([[0, 0, 1, 0]], 0.01)
+    move.categorize(state)
+    assert state.onground.tolist() == [True, False]
+    assert state.pos[:, 2].tolist() == [0, 1]
+
+def test_fall_onto_floor():
+    state = pmove.PlayerState([[0, 0, 100]])
+    move = pmove.PlayerMove([[0, 0, 1, 0]], 0.01)
+    for _ in range(200):
+        move.step(state, 0.0, np.array([False]))
+    assert state.onground[0]
+    assert state.pos[0].tolist() == [0, 0, 0]
+    assert state.vel[0].tolist() == [0, 0, 0]
+
+def test_wall_clip():
+    state = pmove.PlayerState([[499, 0, 0]], [[300, 100, 0]])
+    move = pmove.PlayerMove(room, 0.01)
+    move.step(state, 0.0, np.array([False]))
+    assert state.pos[0, 0] == approx(500)
+    assert state.vel[0, 0] == 0
+    assert state.vel[0, 1] > 0
+
+def test_ramp_slide():
+    # A steep plane that cannot be stood on deflects a falling player.
+    state = pmove.PlayerState([[0, 0, 0.5]], [[0, 0, -100]])
+    move = pmove.PlayerMove([[0, 0.8, 0.6, 0]], 0.01)
+    move.step(state, 0.0, np.array([False]))
+    assert not state.onground[0]
+    assert state.vel[0, 1] > 0
+    assert state.pos[0] @ [0, 0.8, 0.6] == approx(0, abs=1e-12)
+
+def test_wall_corner():
+    # Running on the ground into the corner of two walls stops the player, as
+    # the crease between the walls is vertical.
+    state = pmove.PlayerState([[499, 499, 0]], [[300, 300, -100]])
+    move = pmove.PlayerMove([[0, 0, 1, 0], [-1, 0, 0, -500], [0, -1, 0, -500]],
+                            0.01)
+    move.step(state, 0.0, np.array([False]))
+    assert state.pos[0].tolist() == approx([500, 500, 0])
+    assert state.vel[0].tolist() == [0, 0, 0]
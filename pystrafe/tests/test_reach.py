@@ -0,0 +1,70 @@
+import math
+import numpy as np
+from pytest import approx, raises
+from pystrafe import motion, reach
+
+K = motion.strafe_K_std(0.001)
+xs = np.linspace(0, 1000, 21)
+zs = np.linspace(-300, 60, 13)
+
+def test_flight_time():
+    for z in zs:
+        t = reach.flight_time(268, z, 800)
+        t1, t2 = motion.gravity_time_speediz_z(268, z, 800) if z <= 45 else (0, 0)
+        if z > 45:
+            assert math.isnan(t)
+        else:
+            assert t == approx(t1 if t1 >= 0 else t2)
+
+def test_flight_time_invalid_g():
+    for g in [0, -800, [800, 0]]:
+        with raises(ValueError):
+            reach.flight_time(268, 10, g)
+
+def test_reach_grid():
+    grid = reach.reach_grid(xs, zs, 400, 268, K, 800)
+    assert grid.speedxi.shape == grid.time.shape == grid.feasible.shape == (21, 13)
+    for i, x in enumerate(xs):
+        for j, z in enumerate(zs):
+            try:
+                expected = motion.strafe_solve_speedxi(268, K, x, z, 800)
+            except ValueError:
+                expected = math.nan
+            if math.isnan(expected):
+                assert math.isnan(grid.speedxi[i, j])
+                assert not grid.feasible[i, j]
+            else:
+                assert grid.speedxi[i, j] == approx(expected)
+                assert grid.feasible[i, j] == (expected <= 400)
+
+def test_reach_grid_chunks():
+    grid = reach.reach_grid(xs, zs, 400, 268, K, 800)
+    for chunk_size, workers in [(1, None), (30, None), (30, 3)]:
+        other = reach.reach_grid(xs, zs, 400, 268, K, 800, chunk_size, workers)
+        for a, b in zip(grid, other):
+            np.testing.assert_array_equal(a, b)
+
+def test_reach_grid_memmap(tmp_path):
+    grid = reach.reach_grid(xs, zs, 400, 268, K, 800, chunk_size=50, path=tmp_path)
+    assert isinstance(grid.speedxi, np.memmap)
+    expected = reach.reach_grid(xs, zs, 400, 268, K, 800)
+    for name, a in zip(reach.ReachGrid._fields, expected):
+        np.testing.assert_array_equal(np.load(tmp_path / (name + '.npy')), a)
+
+def test_reach_grid_invalid():
+    with raises(ValueError):
+        reach.reach_grid([[1, 2]], zs, 400, 268, K, 800)
+    with raises(ValueError):
+        reach.reach_grid(xs, zs, 400, 268, K, 800, chunk_size=0)
+    with raises(ValueError):
+        reach.reach_grid(xs, zs, 400, 268, -K, 800)
+    with raises(ValueError):
+        reach.reach_grid(xs, zs, 400, 268, K, 0)
+
+def test_reach_grid_invalid_no_files(tmp_path):
+    for K_, g, method in [(-K, 800, 'illinois'), (K, 0, 'illinois'),
+                          (K, 800, 'bisect')]:
+        with raises(ValueError):
+            reach.reach_grid(xs, zs, 400, 268, K_, g, path=tmp_path,
+                             method=method)
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,214 @@
+import math
+import random
+import itertools
+import numpy as np
+from pytest import approx, raises
+from pystrafe import basic, common, motion, sim
+
+def random_velocities(n, seed):
+    rng = random.Random(seed)
+    vs = [[rng.uniform(-1000, 1000), rng.uniform(-1000, 1000),
+           rng.uniform(-500, 500)] for _ in range(n)]
+    vs += [[0.0, 0.0, 0.0], [0.05, 0.0, 10.0], [2.0, -1.0, 0.0], [100.0, 0.0, 0.0]]
+    return vs
+
+def test_init_shape():
+    with raises(ValueError):
+        sim.StrafeSim([[1, 2]], 0.01)
+    with raises(ValueError):
+        sim.StrafeSim([1, 2, 3], 0.01)
+
+def test_friction():
+    vs = random_velocities(200, 1)
+    s = sim.StrafeSim(vs, 0.01)
+    for _ in range(50):
+        s.friction()
+        for v in vs:
+            basic.friction(v, 0.01, basic.E, basic.k)
+        assert s.v.tolist() == vs
+
+def test_friction_edge():
+    vs = random_velocities(100, 2)
+    s = sim.StrafeSim(vs, 0.001, k=8)
+    for _ in range(20):
+        s.friction()
+        for v in vs:
+            basic.friction(v, 0.001, basic.E, 8)
+    assert s.v.tolist() == vs
+
+def test_gravity_half():
+    vs = random_velocities(10, 3)
+    s = sim.StrafeSim(vs, 0.01)
+    s.gravity_half()
+    for v in vs:
+        basic.gravity_half(v, basic.g, 0.01)
+    assert s.v.tolist() == vs
+
+def test_strafe_scalar_theta():
+    vs = random_velocities(200, 4)[:-4]
+    s = sim.StrafeSim(vs, 0.001)
+    for theta in [0.0, 0.3, -1.2, math.pi / 2, 2.0]:
+        s.strafe(theta, 30, 3.2)
+        for v in vs:
+            basic.strafe_fme_theta(v, theta, 30, 3.2)
+        assert s.v.tolist() == vs
+
+def test_strafe_array_theta():
+    vs = random_velocities(100, 5)[:-4]
+    thetas = np.linspace(-math.pi, math.pi, len(vs))
+    s = sim.StrafeSim(vs, 0.001)
+    s.strafe(thetas, 320, 3.2)
+    for v, theta in zip(vs, thetas):
+        basic.strafe_fme_theta(v, theta, 320, 3.2)
+    for row, v in zip(s.v.tolist(), vs):
+        assert row == approx(v, rel=1e-14, abs=1e-12)
+
+def test_strafe_zero_speed():
+    s = sim.StrafeSim([[100, 0, 0], [0, 0, 100]], 0.01)
+    with raises(ValueError):
+        s.strafe(0.5, 30, 32)
+
+def test_step():
+    vs = random_velocities(100, 6)[:-4]
+    s = sim.StrafeSim(vs, 0.01)
+    buf = s.v
+    for frame in range(100):
+        onground = frame % 10 == 0
+        s.step(1.2, 30, 32, onground)
+        for v in vs:
+            if onground:
+                basic.friction(v, 0.01, basic.E, basic.k)
+            basic.strafe_fme_theta(v, 1.2, 30, 32)
+            if not onground:
+                basic.gravity_half(v, basic.g, 0.01)
+                basic.gravity_half(v, basic.g, 0.01)
+    assert s.v is buf
+    assert s.v.tolist() == vs
+
+def strafe_yaw_scalar(v, yaw, L, gamma1):
+    yaw = common.anglemod_rad(yaw)
+    ax, ay = math.cos(yaw), math.sin(yaw)
+    gamma2 = L - (v[0] * ax + v[1] * ay)
+    if gamma2 > 0:
+        mu = min(gamma1, gamma2)
+        v[0] += ax * mu
+        v[1] += ay * mu
+
+def test_strafe_yaw():
+    vs = random_velocities(200, 7)
+    rng = random.Random(7)
+    yaws = np.array([rng.uniform(-10, 10) for _ in vs])
+    s = sim.StrafeSim(vs, 0.001)
+    for _ in range(20):
+        s.strafe_yaw(yaws, 30, 3.2)
+        for v, yaw in zip(vs, yaws):
+            strafe_yaw_scalar(v, yaw, 30, 3.2)
+        assert s.v == approx(np.array(vs), rel=1e-12, abs=1e-12)
+    s.strafe_yaw(0.5, 30, 3.2)
+
+def test_accelerate_yaw():
+    vs = random_velocities(200, 8)
+    rng = random.Random(8)
+    yaws = np.array([rng.uniform(-10, 10) for _ in vs])
+    L = np.array([rng.choice([30.0, 320.0]) for _ in vs])
+    mask = np.arange(len(vs)) % 3 != 0
+    vx, vy = np.array(vs)[:, 0].copy(), np.array(vs)[:, 1].copy()
+    sim.accelerate_yaw(vx, vy, yaws, L, 3.2, mask)
+    for v, yaw, l, m in zip(vs, yaws, L, mask):
+        if m:
+            strafe_yaw_scalar(v, yaw, l, 3.2)
+    assert np.stack([vx, vy], axis=-1) == approx(np.array(vs)[:, :2],
+                                                 rel=1e-12, abs=1e-12)
+
+def test_strafe_optimal_anglemod():
+    vs = [[400 * math.cos(a), 400 * math.sin(a), 0.0] for a in np.linspace(0, 6, 20)]
+    s = sim.StrafeSim(vs, 0.001)
+    s.strafe_optimal_anglemod(30, 3.2, left=False)
+    for v in vs:
+        basic.strafe_optimal(v, 30, 3.2, left=False)
+    # The quantised yaw is at most one anglemod unit off the optimal yaw, which
+    # changes both the direction and gamma2 = L - v . a.
+    bound = (400 + 3.2) * common.anglemod_u_rad
+    assert s.v[:, :2] == approx(np.array(vs)[:, :2], abs=bound)
+    with raises(ValueError):
+        sim.StrafeSim([[0.0, 0.0, 0.0]], 0.001).strafe_optimal_anglemod(30, 3.2)
+
+def test_strafe_distance_anglemod():
+    for tau in [0.01, 0.001]:
+        n = round(1 / tau)
+        K = motion.strafe_K_std(tau)
+        vs = [[400 * math.cos(a), 400 * math.sin(a), 0.0] for a in np.linspace(0, 6, 20)]
+        x, speed = sim.strafe_distance_anglemod(vs, n, 30, tau * 3200, tau)
+        xf, speedf = motion.strafe_distance_frames(n, 400, K, tau)
+        assert np.all(x < xf) and np.all(speed < speedf)
+        assert x == approx(xf, rel=2e-3)
+        assert speed == approx(speedf, rel=2e-3)
+
+def reference_trajectory(v, pos, n, tau, L, gamma1, theta=None, onground=False):
+    v, pos = list(v), list(pos)
+    frames = [(0, tuple(pos), tuple(v))]
+    for i in range(1, n + 1):
+        if onground:
+            basic.friction(v, tau, basic.E, basic.k)
+        else:
+            v[2] -= 0.5 * basic.g * tau
+        if theta is None:
+            basic.strafe_optimal(v, L, gamma1)
+        else:
+            basic.strafe_fme_theta(v, theta, L, gamma1)
+        for j in range(3):
+            pos[j] += v[j] * tau
+        if not onground:
+            v[2] -= 0.5 * basic.g * tau
+        frames.append((i, tuple(pos), tuple(v)))
+    return frames
+
+def test_iter_trajectory():
+    for kwargs in [{}, {'theta': 1.2}, {'onground': True}]:
+        expected = reference_trajectory([400, 30, 268], [10, 20, 30], 300,
+                                        0.001, 30, 3.2, **kwargs)
+        points = list(sim.iter_trajectory([400, 30, 268], 0.001, 30, 3.2, n=300,
+                                          position=[10, 20, 30], **kwargs))
+        assert [p[:3] for p in points] == expected
+        assert points[-1].speed == approx(math.hypot(*expected[-1][2][:2]))
+
+def test_iter_trajectory_every_chunks():
+    expected = reference_trajectory([400, 0, 268], [0, 0, 0], 1000, 0.001, 30, 3.2)
+    points = list(sim.iter_trajectory([400, 0, 268], 0.001, 30, 3.2, n=1000,
+                                      every=300))
+    assert [p.frame for p in points] == [0, 300, 600, 900, 1000]
+    assert [p[:3] for p in points] == [expected[i] for i in (0, 300, 600, 900, 1000)]
+
+    blocks = list(sim.iter_trajectory([400, 0, 268], 0.001, 30, 3.2, n=1000,
+                                      every=7, chunk_size=64))
+    assert all(len(b.frame) == 64 for b in blocks[:-1])
+    frame = np.concatenate([b.frame for b in blocks])
+    assert frame.tolist() == list(range(0, 1000, 7)) + [1000]
+    position = np.concatenate([b.position for b in blocks])
+    velocity = np.concatenate([b.velocity for b in blocks])
+    speed = np.concatenate([b.speed for b in blocks])
+    assert position.tolist() == [list(expected[i][1]) for i in frame]
+    assert velocity.tolist() == [list(expected[i][2]) for i in frame]
+    assert speed == approx(np.hypot(velocity[:, 0], velocity[:, 1]))
+
+def test_iter_trajectory_until():
+    # Without n, the generator runs until the predicate holds.
+    points = list(sim.iter_trajectory([400, 0, 268], 0.001, 30, 3.2, every=1000,
+                                      until=lambda pos, v: pos[2] < 0))
+    assert [p.frame for p in points] == [0, 670]
+    assert points[-1].position[2] < 0
+    expected = reference_trajectory([400, 0, 268], [0, 0, 0], 670, 0.001, 30, 3.2)
+    assert expected[-2][1][2] >= 0
+
+    gen = sim.iter_trajectory([400, 0, 0], 0.001, 30, 3.2, onground=True)
+    assert [p.frame for p in itertools.islice(gen, 5)] == [0, 1, 2, 3, 4]
+
+def test_iter_trajectory_invalid():
+    with raises(ValueError):
+        sim.iter_trajectory([400, 0], 0.001, 30, 3.2)
+    with raises(ValueError):
+        sim.iter_trajectory([400, 0, 0], 0.001, 30, 3.2, every=0)
+    with raises(ValueError):
+        sim.iter_trajectory([400, 0, 0], 0.001, 30, 3.2, chunk_size=0)
+    with raises(ValueError):
+        list(sim.iter_trajectory([0, 0, 0], 0.001, 30, 3.2, n=2))
@@ -0,0 +1,76 @@
+import math
+import warnings
+import numpy as np
+from pytest import approx, raises
+from pystrafe import basic
+from pystrafe.vec import basic as vbasic
+from pystrafe.tests.reference import reference_clip
+
+def random_normals(n, seed):
+    rng = np.random.default_rng(seed)
+    normals = rng.normal(size=(n, 3))
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    c = math.sqrt(0.5)
+    special = [[0, 0, 1], [1, 0, 0], [0, c, c], [-1, 0, 0]]
+    return np.concatenate([special, normals])
+
+def test_collide():
+    rng = np.random.default_rng(0)
+    vs = rng.uniform(-500, 500, (200, 3))
+    normals = random_normals(196, 1)
+    for b in [1, 1.5, 0.5]:
+        out = vbasic.collide(vs, normals, b)
+        for v, n, vnew in zip(vs.tolist(), normals.tolist(), out.tolist()):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                basic.collide(v, n, b)
+            assert vnew == approx(v, rel=1e-15, abs=1e-12)
+
+def test_collide_invalid():
+    with raises(ValueError):
+        vbasic.collide([1, 2, 3], [1, 1, 0])
+    with raises(ValueError):
+        vbasic.collide([1, 2], [1, 0])
+
+def test_clip_planes():
+    rng = np.random.default_rng(2)
+    normals = random_normals(4, 3)
+    vs = rng.uniform(-500, 500, (2000, 3))
+    mask = rng.random((2000, len(normals))) < 0.3
+    for b in [1, 1.5]:
+        out = vbasic.clip_planes(vs, normals, b, mask=mask)
+        for v, m, vnew in zip(vs.tolist(), mask, out.tolist()):
+            planes = normals[m].tolist()
+            ref = reference_clip(v, planes, b) if planes else v
+            assert vnew == approx(ref, rel=1e-12, abs=1e-9)
+
+def test_clip_planes_crease():
+    # Into both the floor and a wall: slide along the edge between them.
+    out = vbasic.clip_planes([[-100, 50, -100]], [[0, 0, 1], [1, 0, 0]])
+    assert out.tolist() == [[0, 50, 0]]
+    # The crease direction is not normalised, as in the game.
+    out = vbasic.clip_planes([[0, 50, -100]], [[0.6, 0, 0.8], [-0.6, 0, 0.8]])
+    assert out[0].tolist() == approx([0, 50 * 0.96 ** 2, 0])
+
+def test_clip_planes_corner():
+    out = vbasic.clip_planes([[-100, -100, -100]], np.eye(3))
+    assert out.tolist() == [[0, 0, 0]]
+
+def test_clip_planes_no_planes():
+    v = [[1.0, 2.0, 3.0]]
+    assert vbasic.clip_planes(v, np.empty((0, 3))).tolist() == v
+    assert vbasic.clip_planes(v, np.eye(3), mask=[[False] * 3]).tolist() == v
+
+def test_clip_planes_validate():
+    with raises(ValueError):
+        vbasic.clip_planes([[1, 2, 3]], [[0, 0, 2]])
+    with raises(ValueError):
+        vbasic.clip_planes([[1, 2, 3]], [[0, 0]])
+    with raises(ValueError):
+        vbasic.clip_planes([1, 2, 3], [[0, 0, 1]])
+    with raises(ValueError):
+        vbasic.clip_planes([[1, 2, 3]], [[0, 0, 1]], mask=[True])
+    normals = random_normals(3, 0)
+    v = np.random.default_rng(0).uniform(-500, 500, (100, 3))
+    assert vbasic.clip_planes(v, normals, validate=False).tolist() \
+        == vbasic.clip_planes(v, normals).tolist()
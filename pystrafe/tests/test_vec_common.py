@@ -0,0 +1,28 @@
+import math
+import random
+import numpy as np
+from pytest import raises
+from pystrafe import common
+from pystrafe.vec import common as vcommon
+
+def test_float_equal():
+    a = np.array([1.5, 1.5, 0.0, math.inf, math.nan])
+    b = np.array([1.5 + 1e-10, 1.5 - 1e-4, 0.0, math.inf, math.nan])
+    assert vcommon.float_equal(a, b).tolist() == [True, False, True, True, False]
+    assert vcommon.float_zero([1e-10, 1e-4]).tolist() == [True, False]
+
+def test_validate_K():
+    vcommon.validate_K(0)
+    vcommon.validate_K([0, 1e6])
+    with raises(ValueError):
+        vcommon.validate_K([1, -1])
+
+def test_anglemod():
+    rng = random.Random(0)
+    a = [0, math.radians(10), math.radians(-350), math.pi / 4, -1e-9, 1e6]
+    a += [rng.uniform(-1e4, 1e4) for _ in range(1000)]
+    assert vcommon.anglemod_rad(a).tolist() == [common.anglemod_rad(x) for x in a]
+    assert vcommon.anglemod_deg(a).tolist() == [common.anglemod_deg(x) for x in a]
+    idx = vcommon.anglemod_index_rad(a)
+    assert idx.min() >= 0 and idx.max() <= 0xffff
+    assert np.ndim(vcommon.anglemod_rad(1.0)) == 0
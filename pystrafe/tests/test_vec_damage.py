@@ -0,0 +1,73 @@
+import math
+import numpy as np
+from pytest import raises
+from pystrafe import damage
+from pystrafe.vec import damage as vdamage
+
+def test_hpap_damage():
+    hps = [-10, 0, 1, 100]
+    aps = [-5, -1e-7, 0, 1e-7, 0.001, 0.5, 1, 3.2, 3.20001, 100]
+    dmgs = [-1234, -100, -5, -1.5, -1, 0, 0.99999, 1, 8, 50.5, 70, 100, 300]
+    hp, ap, dmg = np.meshgrid(hps, aps, dmgs, indexing='ij')
+    ret = vdamage.hpap_damage(hp, ap, dmg)
+    assert ret.shape == hp.shape
+    for idx in np.ndindex(hp.shape):
+        expected = damage.hpap_damage(hps[idx[0]], aps[idx[1]], dmgs[idx[2]])
+        assert (ret['hp'][idx], ret['ap'][idx]) == expected
+
+def test_hpap_damage_scalar():
+    ret = vdamage.hpap_damage(100, 100, 100)
+    assert ret.shape == () and (ret['hp'], ret['ap']) == (80, 60)
+    assert math.isnan(vdamage.hpap_damage(100, 0, math.inf)['hp'])
+
+def check_ap_dhp_damage(dhps, dmgs):
+    dhp, dmg = np.meshgrid(dhps, dmgs, indexing='ij')
+    ret = vdamage.ap_dhp_damage(dhp, dmg)
+    for idx in np.ndindex(dhp.shape):
+        apl, apu, bl, bu = damage.ap_dhp_damage(dhp[idx], dmg[idx])
+        r = ret[idx]
+        assert (r['bl'], r['bu']) == (vdamage.bound_codes[bl], vdamage.bound_codes[bu])
+        if bl is None:
+            assert math.isnan(r['apl']) and math.isnan(r['apu'])
+        else:
+            assert (r['apl'], r['apu']) == (apl, apu)
+
+def test_ap_dhp_damage():
+    check_ap_dhp_damage(np.arange(-100, 101, 0.47), np.arange(-100, 101, 0.47))
+
+def test_ap_dhp_damage_edges():
+    check_ap_dhp_damage([-101, -10, -1.999, -1, -0.9999, -0.0001, 0, 0.9, 1, 1.3,
+                         10, 20, 20.9999, 21, 100, 1000],
+                        [-101, -100, -10, -1, 0, 1e-4, 1, 2, 5, 6, 8, 9.9, 9.9999,
+                         10, 11, 20, 40, 70, 103])
+
+def test_ap_dhp_damage_invalid():
+    ret = vdamage.ap_dhp_damage([math.nan, math.inf, 1], [1, 1, math.nan])
+    assert ret['bl'].tolist() == [vdamage.BOUND_NONE] * 3
+    assert np.isnan(ret['apl']).all()
+
+def test_fall():
+    speedzis = [-1200, -600, -100, 0, 268, 1000]
+    zs = [-2000, -300, -100, 0, 50, 100, 1000]
+    dmgs = [-1, 0, 10, 100]
+    vfz = np.array(speedzis + [math.nan, 580, 581])
+    ret = vdamage.fall(vfz)
+    assert ret.tolist() == [damage.fall(v) for v in vfz]
+
+    for name, args in [('fall_z', (speedzis, zs, 800)),
+                       ('fall_min_z', (dmgs, speedzis, 800)),
+                       ('fall_max_speedzi', (dmgs, zs, 800))]:
+        grid = np.meshgrid(*args[:2], indexing='ij')
+        ret = getattr(vdamage, name)(*grid, args[2])
+        for idx in np.ndindex(grid[0].shape):
+            try:
+                expected = getattr(damage, name)(grid[0][idx], grid[1][idx], 800)
+            except ValueError:
+                assert math.isnan(ret[idx])
+            else:
+                assert ret[idx] == expected
+
+    assert vdamage.fall_speed(dmgs).tolist()[1:] == [damage.fall_speed(d) for d in dmgs[1:]]
+    assert math.isnan(vdamage.fall_speed(-1))
+    with raises(ValueError):
+        vdamage.fall_min_z(0, 268, [800, 0])
@@ -0,0 +1,58 @@
+import math
+import itertools
+import numpy as np
+from pytest import approx, raises
+from pystrafe import ladder, view
+from pystrafe.vec import ladder as vladder
+
+def random_normals(n):
+    rng = np.random.default_rng(0)
+    normals = rng.normal(size=(n, 3))
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    c = math.sqrt(0.5)
+    special = [[1, 0, 0], [0, -1, 0], [0, 0, 1], [0, 0, -1], [0, c, c], [c, 0, -c]]
+    return np.concatenate([special, normals])
+
+def test_maxspeed_normal():
+    normals = random_normals(500)
+    for vdir, F, S in itertools.product([1, -1], repeat=3):
+        pitch, yaw, horizontal = vladder.maxspeed_normal(normals, vdir, F, S)
+        assert pitch.shape == yaw.shape == horizontal.shape == (len(normals),)
+        for i, n in enumerate(normals.tolist()):
+            p, y = ladder.maxspeed_normal(n, vdir, F, S)
+            # NumPy's arccos and arctan2 may differ from math's in the last bit
+            assert pitch[i] == approx(p, rel=1e-15, abs=1e-15)
+            if y is None:
+                assert horizontal[i] and math.isnan(yaw[i])
+            else:
+                assert not horizontal[i] and yaw[i] == approx(y, rel=1e-15, abs=1e-15)
+
+def test_maxspeed_normal_broadcast():
+    pitch, yaw, horizontal = vladder.maxspeed_normal([1, 0, 0], [1, -1], 1, 1)
+    assert pitch.tolist() == [-math.pi / 2, math.pi / 2]
+    assert horizontal.tolist() == [False, False]
+    pitch, yaw, horizontal = vladder.maxspeed_normal([0, 0, 1], 1, 1, 1)
+    assert (pitch, horizontal) == (0, True) and math.isnan(yaw)
+
+def test_climb_velocity():
+    normals = random_normals(100)
+    rng = np.random.default_rng(1)
+    angles = rng.uniform(-math.pi, math.pi, size=(len(normals), 2))
+    f, s = [], []
+    for pitch, yaw in angles:
+        fv, sv = view.angles_to_vectors(pitch, yaw, 3)
+        f.append(fv)
+        s.append(sv)
+    for F, S in itertools.product([1, 0, -1], repeat=2):
+        ret = vladder.climb_velocity(normals, f, s, F, S)
+        assert ret.shape == (len(normals), 3)
+        for i, n in enumerate(normals.tolist()):
+            assert ret[i].tolist() == ladder.climb_velocity(n, f[i], s[i], F, S)
+
+def test_invalid():
+    with raises(ValueError):
+        vladder.maxspeed_normal([[1, 0, 0], [1, 1, 0]], 1, 1, 1)
+    with raises(ValueError):
+        vladder.maxspeed_normal([1, 0], 1, 1, 1)
+    with raises(ValueError):
+        vladder.climb_velocity([1, 0, 0], [0, 0, 2], [1, 0, 0], 1, 1)
@@ -0,0 +1,232 @@
+import math
+import warnings
+import itertools
+import numpy as np
+from pytest import raises, approx
+from pystrafe import motion
+from pystrafe.vec import motion as vmotion
+
+def scalar_or_nan(f, *args):
+    try:
+        return f(*args)
+    except ValueError:
+        return math.nan
+    except ZeroDivisionError:
+        return math.inf
+
+def assert_matches_scalar(vf, f, *grids):
+    args = np.meshgrid(*grids, indexing='ij')
+    ret = vf(*args)
+    for idx in np.ndindex(args[0].shape):
+        expected = scalar_or_nan(f, *(float(a[idx]) for a in args))
+        if math.isnan(expected):
+            assert math.isnan(ret[idx])
+        elif math.isinf(expected):
+            assert not math.isfinite(ret[idx])
+        else:
+            assert ret[idx] == approx(expected)
+
+def test_strafe_K():
+    assert_matches_scalar(vmotion.strafe_K, motion.strafe_K,
+                          [0, 10, 30, 320], [0, 0.001, 0.01, 0.1],
+                          [0, 10, 320], [0, 10, 100, 2000])
+    with raises(ValueError):
+        vmotion.strafe_K([30, -30], 0.001, 320, 10)
+
+def test_strafe_K_std():
+    taus = np.array([0.001, 0.004, 0.01])
+    assert vmotion.strafe_K_std(taus) == approx([motion.strafe_K_std(t) for t in taus])
+
+def test_strafe_speedxf():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    assert_matches_scalar(vmotion.strafe_speedxf, motion.strafe_speedxf,
+                          [-1, 0, 0.5, 4], [0, 100, 450, 1451.07], [0, 1, K])
+    with raises(ValueError):
+        vmotion.strafe_speedxf(1, 100, [K, -K])
+
+def test_strafe_distance():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    assert_matches_scalar(vmotion.strafe_distance, motion.strafe_distance,
+                          [-1, 0, 1, 2.5], [-100, 0, 1, 100, 1000],
+                          [0, 1, K, 1e8])
+    with raises(ValueError):
+        vmotion.strafe_distance(1, 100, -K)
+
+def test_strafe_time():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    xs = [-100, 0, 1e-15, 1e-7, 1e-3, 1, 100, 1e5]
+    vs = [-320, 0, 1, 320, 1e5, 1e10, 1e15]
+    assert_matches_scalar(vmotion.strafe_time, motion.strafe_time,
+                          xs, vs, [0, 1e-7, 1e-5, K])
+    ret = vmotion.strafe_time(*np.meshgrid(xs, vs, K))
+    assert np.all(ret >= 0)
+    with raises(ValueError):
+        vmotion.strafe_time(100, 320, -K)
+
+def test_gravity_speediz_distance_time():
+    assert_matches_scalar(vmotion.gravity_speediz_distance_time,
+                          motion.gravity_speediz_distance_time,
+                          [-1, 0, 1e-7, 0.5, 2], [-10, -1e-7, 0, 1, 100],
+                          [0, 800])
+    assert vmotion.gravity_speediz_distance_time(0, [1, -1], 800).tolist() \
+        == [math.inf, -math.inf]
+
+def test_gravity_time_speediz_z():
+    vs = range(-1000, 1001, 250)
+    zs = range(-1000, 1001, 250)
+    for i in range(2):
+        assert_matches_scalar(
+            lambda *args: vmotion.gravity_time_speediz_z(*args)[i],
+            lambda *args: motion.gravity_time_speediz_z(*args)[i],
+            vs, zs, [-800, 0, 800])
+
+def test_gravity_first_time():
+    vs = np.arange(-1000, 1001, 250)[:, None]
+    zs = np.arange(-1000, 1001, 250)
+    t = vmotion.gravity_first_time(vs, zs, 800)
+    t1, t2 = vmotion.gravity_time_speediz_z(vs, zs, 800)
+    expected = np.where(t1 >= 0, t1, np.where(t2 >= 0, t2, np.nan))
+    assert np.array_equal(t, expected, equal_nan=True)
+    assert np.isnan(vmotion.gravity_first_time(268, [10, 100], 0)).all()
+
+def test_scalar_inputs():
+    K = motion.strafe_K_std(0.001)
+    ret = vmotion.strafe_distance(2.5, 400, K)
+    assert np.ndim(ret) == 0
+    assert ret == approx(motion.strafe_distance(2.5, 400, K))
+    t1, t2 = vmotion.gravity_time_speediz_z(268, 20, 800)
+    assert (t1, t2) == approx(motion.gravity_time_speediz_z(268, 20, 800))
+
+def test_broadcast():
+    K = vmotion.strafe_K_std(np.array([0.001, 0.01]))[:, None, None]
+    t = np.linspace(0, 5, 7)[None, :, None]
+    speed = np.array([0, 320, 1000])[None, None, :]
+    ret = vmotion.strafe_distance(t, speed, K)
+    assert ret.shape == (2, 7, 3)
+    for i, j, k in itertools.product(range(2), range(7), range(3)):
+        assert ret[i, j, k] == approx(motion.strafe_distance(
+            t[0, j, 0], speed[0, 0, k], K[i, 0, 0]))
+
+def test_strafe_solve_speedxi():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    with raises(ValueError):
+        vmotion.strafe_solve_speedxi(10, -K, 400, -200, 800)
+    args = [(0, 100, -18), (0, 100, -100), (163.23541222592047, 100, -18),
+            (200, 100, -18), (-10000, 100, -100), (-100, 200, -200),
+            (1000, 100, 400), (1000, 100, 700), (0, 100, 700),
+            (1000, 1, 0), (0, 0, 0), (0, 100, 0), (0, 1e-5, 0),
+            (0, 0, 1), (40, 0, 2), (40, 0, 1), (-100, 0, 2), (-100, 10, 2),
+            (0, 10, 2), (0, -300, -50)]
+    speedzi, x, z = np.array(args).T
+    ret = vmotion.strafe_solve_speedxi(speedzi, K, x, z, 800)
+    for r, (v, x, z) in zip(ret, args):
+        expected = scalar_or_nan(motion.strafe_solve_speedxi, v, K, x, z, 800)
+        if math.isnan(expected):
+            assert math.isnan(r)
+        else:
+            assert r == approx(expected)
+
+def test_strafe_solve_speedxi_mixed_batch():
+    # Elements the scalar function divides by zero for must not keep the
+    # rest of the batch from converging.
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    expected = motion.strafe_solve_speedxi(0, K, 100, -18, 800)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        ret = vmotion.strafe_solve_speedxi(0, [K, 0], 100, -18, 800)
+        assert ret[0] == approx(expected) and math.isnan(ret[1])
+        ret = vmotion.strafe_solve_speedxi(0, K, 100, -18, [800, 0])
+        assert ret[0] == approx(expected) and math.isnan(ret[1])
+        ret = vmotion.strafe_solve_speedxi([0, np.inf, 0], K, [100, 100, 1e308],
+                                           -18, 800)
+        assert ret[0] == approx(expected) and math.isnan(ret[1])
+        assert ret[2] == math.inf
+
+def test_strafe_solve_speedxi_newton_mixed_batch():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    expected = motion.strafe_solve_speedxi(0, K, 100, -18, 800, 'newton')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        ret = vmotion.strafe_solve_speedxi(0, [K, 0], 100, -18, 800, 'newton')
+        assert ret[0] == approx(expected) and math.isnan(ret[1])
+        ret = vmotion.strafe_solve_speedxi(0, K, 100, -18, [800, 0], 'newton')
+        assert ret[0] == approx(expected) and math.isnan(ret[1])
+
+def test_strafe_solve_speedxi_newton_nonfinite():
+    # Called directly without the mask, a bad element ends up NaN on its own.
+    with np.errstate(all='ignore'):
+        ret = vmotion._strafe_solve_speedxi_newton(
+            np.array([1e6, np.nan]), np.array([1e3, 1e3]), 1e-15, 100)
+    assert math.isfinite(ret[0]) and math.isnan(ret[1])
+
+def test_strafe_solve_speedxi_grid():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    assert_matches_scalar(
+        lambda v, x, z: vmotion.strafe_solve_speedxi(v, K, x, z, 800),
+        lambda v, x, z: motion.strafe_solve_speedxi(v, K, x, z, 800),
+        range(-1000, 1001, 250), range(-5000, 5001, 1000), range(-600, 601, 150))
+
+def test_strafe_solve_speedxi_shape():
+    K = vmotion.strafe_K_std(np.array([0.001, 0.01]))[:, None]
+    ret = vmotion.strafe_solve_speedxi(268, K, np.arange(100, 1000, 100), -50, 800)
+    assert ret.shape == (2, 9)
+    assert np.ndim(vmotion.strafe_solve_speedxi(268, K[0, 0], 500, -50, 800)) == 0
+    assert vmotion.strafe_solve_speedxi([], K[0, 0], 500, -50, 800).shape == (0,)
+
+def test_strafe_solve_speedxi_newton():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    with raises(ValueError):
+        vmotion.strafe_solve_speedxi(0, K, 100, -18, 800, method='brent')
+    assert_matches_scalar(
+        lambda v, x, z: vmotion.strafe_solve_speedxi(v, K, x, z, 800, 'newton'),
+        lambda v, x, z: motion.strafe_solve_speedxi(v, K, x, z, 800, 'newton'),
+        range(-1000, 1001, 250), range(-5000, 5001, 1000), range(-600, 601, 150))
+
+def test_solve_boost_min_dmg():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    with raises(ValueError):
+        vmotion.solve_boost_min_dmg([0, 0], -K, 400, 400, 800)
+    cases = list(itertools.product([0, 100, 400, 2000], [-600, 0, 268, 1500],
+                                   [-400, 0, 1, 100, 1500, 10000],
+                                   [-100000, -200, -1, 0, 1, 500, 5000]))
+    vi = np.array([c[:2] for c in cases])
+    x, z = np.array([c[2:] for c in cases]).T
+    dx, dy, fun, converged = vmotion.solve_boost_min_dmg(vi, K, x, z, 800)
+    assert converged.all()
+    assert np.all(dx >= 0) and np.all(dy >= 0)
+    assert fun == approx(dx * dx + dy * dy)
+    for i, (vx, vy, xx, zz) in enumerate(cases):
+        expected = motion.solve_boost_min_dmg([vx, vy], K, xx, zz, 800)
+        assert fun[i] == approx(expected[0] ** 2 + expected[1] ** 2, rel=1e-6, abs=1e-8)
+        assert dx[i] == approx(expected[0], rel=1e-3, abs=1e-3)
+        assert dy[i] == approx(expected[1], rel=1e-3, abs=1e-3)
+
+def test_solve_boost_min_dmg_scalar():
+    K = motion.strafe_K(30, 0.001, 320, 100)
+    dx, dy, fun, converged = vmotion.solve_boost_min_dmg([400, 268], K, 1500, -200, 800)
+    assert np.ndim(dx) == 0 and converged
+    assert dx == approx(77.238561539572189, 1e-4)
+    assert dy == approx(241.47957829048562, 1e-4)
+    dx, dy, fun, converged = vmotion.solve_boost_min_dmg([0, 0], K, 0, 1, 800)
+    assert dx == 0 and dy == math.inf and converged
+
+def test_solve_boost_min_dmg_warm_start():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    x = np.linspace(100, 2000, 50)
+    cold = vmotion.solve_boost_min_dmg([0, 268], K, x, -200, 800)
+    warm = vmotion.solve_boost_min_dmg([0, 268], K, x, -200, 800, dx0=np.roll(cold[0], 1))
+    assert warm[3].all()
+    assert warm[0] == approx(cold[0], rel=1e-6, abs=1e-4)
+    assert warm[2] == approx(cold[2], rel=1e-9)
+    bad = vmotion.solve_boost_min_dmg([0, 268], K, x, -200, 800, dx0=1e6)
+    assert bad[0] == approx(cold[0], rel=1e-6, abs=1e-4)
+
+def test_solve_boost_min_dmg_broadcast():
+    K = motion.strafe_K(30, 0.001, 320, 10)
+    vi = np.array([[0, 0], [100, 268], [400, 268]])[:, None, :]
+    x = np.array([100, 400, 1500])
+    dx, dy, fun, converged = vmotion.solve_boost_min_dmg(vi, K, x, -200, 800)
+    assert dx.shape == (3, 3)
+    for i, j in itertools.product(range(3), range(3)):
+        expected = motion.solve_boost_min_dmg(vi[i, 0].tolist(), K, x[j], -200, 800)
+        assert dx[i, j] == approx(expected[0], 1e-4)
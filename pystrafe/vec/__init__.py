@@ -0,0 +1,11 @@
+"""NumPy array versions of the scalar routines in :py:mod:`pystrafe`.
+
+Each submodule mirrors the scalar module of the same name. The functions
+broadcast over all of their array arguments and apply the same edge-case rules
+as their scalar counterparts element by element. Where a scalar function would
+raise :py:exc:`ValueError` or :py:exc:`ZeroDivisionError` because of a math
+domain error in one particular input, the array version returns ``NaN`` (or an
+infinity, where the scalar function would return one) for that element instead.
+Validation of parameters that are invalid for the whole computation, such as a
+negative *K*, still raises.
+"""
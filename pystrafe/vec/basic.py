@@ -0,0 +1,143 @@
+"""Array versions of the functions in :py:mod:`pystrafe.basic`.
+
+Velocities are arrays with a last axis of length 3, and the plane normals are
+given as an array of shape (P, 3) shared by the whole batch.
+"""
+
+import numpy as np
+from pystrafe.vec import common
+
+def _unit_normals(normals):
+    normals = np.asarray(normals, dtype=float)
+    if normals.ndim != 2 or normals.shape[1] != 3:
+        raise ValueError('normals must have shape (P, 3)')
+    n0, n1, n2 = normals[:, 0], normals[:, 1], normals[:, 2]
+    if not np.all(common.float_equal(n0 * n0 + n1 * n1 + n2 * n2, 1)):
+        raise ValueError('normals must be unit vectors')
+    return normals
+
+def collide(v, n, b=1):
+    """Array version of :py:func:`pystrafe.basic.collide`.
+
+    Return the velocities *v* clipped against the plane with the unit normal
+    *n*, which broadcasts against *v*. Unlike the scalar function, *v* is not
+    modified, and velocities directed out of the plane are returned
+    unchanged without a warning.
+
+    >>> collide([[-100, 50, 0], [100, 50, 0]], [1, 0, 0])
+    array([[  0.,  50.,   0.],
+           [100.,  50.,   0.]])
+    """
+    v = np.array(v, dtype=float)
+    n = np.asarray(n, dtype=float)
+    if v.ndim < 1 or v.shape[-1] != 3 or n.shape[-1:] != (3,):
+        raise ValueError('v and n must have a last axis of length 3')
+    if not np.all(common.float_equal(np.sum(n * n, axis=-1), 1)):
+        raise ValueError('n must be a unit vector')
+    if b < 1:
+        return np.zeros(np.broadcast_shapes(v.shape, n.shape))
+    vdotn = np.sum(v * n, axis=-1, keepdims=True)
+    return np.where(vdotn > 0.0, v, v - n * (vdotn * b))
+
+def clip_planes(v, normals, b=1, validate=True, mask=None):
+    """Clip the velocities *v* against several planes at once as the game
+    does when a move touches them in the same frame.
+
+    *v* is an array of shape (N, 3) and *normals* an array of shape (P, 3) of
+    the unit normals of the planes touched. *mask* is an optional boolean
+    array of shape (N, P) selecting the planes touched by each velocity,
+    which defaults to all of them. The per-call checks of the arguments are
+    skipped if *validate* is false, in which case *normals* must already be
+    an array of unit vectors of the right shape. Return the clipped
+    velocities as a new array.
+
+    A velocity touching a single plane is clipped as in :py:func:`collide`
+    with the bounce coefficient *b*. For several planes, the velocity is
+    clipped against each plane in turn with a coefficient of 1 until the
+    result is not directed into any of the other planes. If there is no such
+    plane, the velocity is projected onto the crease between two planes
+    along the cross product of their normals, which is not normalised, as
+    in the game. With three or more planes, or if the result opposes the
+    original velocity, the velocity is zeroed as in a corner.
+
+    >>> clip_planes([[-100, 50, -100], [100, 0, -100]], [[0, 0, 1], [1, 0, 0]])
+    array([[  0.,  50.,   0.],
+           [100.,   0.,   0.]])
+    """
+    v = np.asarray(v, dtype=float)
+    if validate:
+        normals = _unit_normals(normals)
+        if v.ndim != 2 or v.shape[1] != 3:
+            raise ValueError('v must have shape (N, 3)')
+    n_planes = len(normals)
+    if mask is None:
+        mask = np.ones((len(v), n_planes), dtype=bool)
+    else:
+        mask = np.asarray(mask, dtype=bool)
+        if validate and mask.shape != (len(v), n_planes):
+            raise ValueError('mask must have shape (N, P)')
+    if not n_planes:
+        return v.copy()
+
+    # Everything works on columns of shape (N,) with a loop over the planes,
+    # as NumPy is slow at operating along short trailing axes.
+    vx, vy, vz = v[:, 0].copy(), v[:, 1].copy(), v[:, 2].copy()
+    masks = list(mask.T)
+    planes = normals.tolist()
+    count = np.zeros(len(v), dtype=np.intp)
+    for m in masks:
+        count += m
+    dots = [vx * nx + vy * ny + vz * nz for nx, ny, nz in planes]
+    out = [vx.copy(), vy.copy(), vz.copy()]
+
+    single = count == 1
+    if single.any():
+        for (nx, ny, nz), m, d in zip(planes, masks, dots):
+            if b < 1:
+                for o in out:
+                    np.copyto(o, 0.0, where=single & m)
+                continue
+            sel = single & m & (d <= 0.0)
+            d = d * b
+            for o, c in zip(out, (vx - nx * d, vy - ny * d, vz - nz * d)):
+                np.copyto(o, c, where=sel)
+
+    multi = count > 1
+    if not multi.any():
+        return np.stack(out, axis=-1)
+    res = [np.zeros(len(v)) for _ in range(3)]
+    found = ~multi
+    for i, ((nx, ny, nz), m, d) in enumerate(zip(planes, masks, dots)):
+        # A velocity clipped along a plane is good if it does not go into
+        # any other touched plane.
+        cx, cy, cz = vx - nx * d, vy - ny * d, vz - nz * d
+        good = m & ~found
+        for j, ((mx, my, mz), mj) in enumerate(zip(planes, masks)):
+            if j != i:
+                good &= ~mj | (cx * mx + cy * my + cz * mz >= 0.0)
+        for r, c in zip(res, (cx, cy, cz)):
+            np.copyto(r, c, where=good)
+        found |= good
+
+    # Slide along the crease between the two planes if neither is good.
+    crease = ~found & (count == 2)
+    if crease.any():
+        for i in range(n_planes):
+            for j in range(i + 1, n_planes):
+                sel = crease & masks[i] & masks[j]
+                if not sel.any():
+                    continue
+                (ax, ay, az), (bx, by, bz) = planes[i], planes[j]
+                dx, dy, dz = ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+                d = dx * vx + dy * vy + dz * vz
+                for r, c in zip(res, (dx * d, dy * d, dz * d)):
+                    np.copyto(r, c, where=sel)
+
+    # Stop if the result opposes the original velocity.
+    res_dot = res[0] * vx + res[1] * vy + res[2] * vz
+    keep = multi & (res_dot > 0.0)
+    stop = multi & ~keep
+    for o, r in zip(out, res):
+        np.copyto(o, r, where=keep)
+        np.copyto(o, 0.0, where=stop)
+    return np.stack(out, axis=-1)
@@ -0,0 +1,43 @@
+"""Array versions of the helpers in :py:mod:`pystrafe.common`."""
+
+import numpy as np
+from pystrafe import common
+
+def float_equal(a, b):
+    """Elementwise version of :py:func:`pystrafe.common.float_equal`.
+
+    Unlike :py:func:`numpy.isclose`, the test is symmetric in *a* and *b*,
+    matching :py:func:`math.isclose` with its default tolerances.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    with np.errstate(invalid='ignore'):
+        close = np.abs(a - b) <= 1e-9 * np.maximum(np.abs(a), np.abs(b))
+    return (a == b) | (close & np.isfinite(a) & np.isfinite(b))
+
+def float_zero(a):
+    """Elementwise version of :py:func:`pystrafe.common.float_zero`."""
+    return np.abs(np.asarray(a, dtype=float)) <= 1e-6
+
+def validate_K(K):
+    """Raise :py:exc:`ValueError` if any element of the strafing constant *K*
+    is negative, as for the whole batch of a computation."""
+    if np.any(np.asarray(K) < 0):
+        raise ValueError('K must be > 0')
+
+def anglemod_index_rad(a):
+    """Return the integer index in [0, 65535] of the anglemod of *a* in
+    radians, such that :py:func:`anglemod_rad` is the index times
+    :py:data:`pystrafe.common.anglemod_u_rad`.
+    """
+    q = np.trunc(np.asarray(a, dtype=float) / common.anglemod_u_rad)
+    return q.astype(np.int64) & 0xffff
+
+def anglemod_rad(a):
+    """Elementwise version of :py:func:`pystrafe.common.anglemod_rad`."""
+    return anglemod_index_rad(a) * common.anglemod_u_rad
+
+def anglemod_deg(a):
+    """Elementwise version of :py:func:`pystrafe.common.anglemod_deg`."""
+    q = np.trunc(np.asarray(a, dtype=float) / common.anglemod_u_deg)
+    return (q.astype(np.int64) & 0xffff) * common.anglemod_u_deg
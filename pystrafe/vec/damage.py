@@ -0,0 +1,158 @@
+"""Array versions of the functions in :py:mod:`pystrafe.damage`.
+
+The results of :py:func:`hpap_damage` and :py:func:`ap_dhp_damage` are
+structured arrays. The interval bounds returned by
+:py:func:`pystrafe.damage.ap_dhp_damage` as strings are encoded as the small
+integer codes :py:data:`BOUND_NONE`, :py:data:`BOUND_OPEN`,
+:py:data:`BOUND_CLOSED` and :py:data:`BOUND_INF`. Whether an open or closed
+bound is the lower or upper one is given by its field.
+"""
+
+import numpy as np
+from pystrafe.vec import common
+
+BOUND_NONE = 0
+BOUND_OPEN = 1
+BOUND_CLOSED = 2
+BOUND_INF = 3
+
+#: Mapping from the bound strings of :py:func:`pystrafe.damage.ap_dhp_damage`
+#: to the integer codes.
+bound_codes = {None: BOUND_NONE, '(': BOUND_OPEN, ')': BOUND_OPEN,
+               '[': BOUND_CLOSED, ']': BOUND_CLOSED, 'inf': BOUND_INF}
+
+hpap_dtype = np.dtype([('hp', float), ('ap', float)])
+ap_interval_dtype = np.dtype([('apl', float), ('apu', float), ('bl', np.int8),
+                              ('bu', np.int8)])
+
+def hpap_damage(hp, ap, dmg):
+    """Array version of :py:func:`pystrafe.damage.hpap_damage`.
+
+    Return a structured array of :py:data:`hpap_dtype` with fields *hp* and
+    *ap*. The HP is stored as a float so that elements with non-finite
+    damage, for which the scalar function raises, can be ``NaN``.
+
+    >>> hpap_damage(100, [100, 0, 0], [100, 50.5, -1])
+    array([( 80., 60.), ( 50.,  0.), (101.,  0.)],
+          dtype=[('hp', '<f8'), ('ap', '<f8')])
+    """
+    hp, ap, dmg = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                        for a in (hp, ap, dmg)))
+    ret = np.empty(hp.shape, dtype=hpap_dtype)
+    with np.errstate(invalid='ignore'):
+        new_ap = ap - 0.4 * dmg
+        # Same as max(0.0, new_ap), which gives 0.0 for NaN
+        new_ap = np.where(new_ap > 0.0, new_ap, 0.0)
+        new_ap[common.float_zero(ap)] = 0.0
+        loss = np.where(common.float_zero(new_ap), dmg - 2 * ap, 0.2 * dmg)
+        ret['hp'] = hp - np.where(np.isfinite(loss), np.trunc(loss), np.nan)
+    ret['ap'] = new_ap
+    return ret[()]
+
+def ap_dhp_damage(dhp, dmg):
+    """Array version of :py:func:`pystrafe.damage.ap_dhp_damage`.
+
+    Return a structured array of :py:data:`ap_interval_dtype` with fields
+    *apl*, *apu*, *bl* and *bu*, where the bounds are integer codes. Elements
+    with non-finite *dhp* or ``NaN`` *dmg* have no solution.
+
+    >>> r = ap_dhp_damage([1, 20, 0], [8, 40, 5])
+    >>> r['apl'], r['apu']
+    (array([3. , 9.5, nan]), array([ 3.2, 10. ,  nan]))
+    >>> r['bl'].tolist() == [BOUND_OPEN, BOUND_OPEN, BOUND_NONE]
+    True
+    >>> r['bu'].tolist() == [BOUND_INF, BOUND_CLOSED, BOUND_NONE]
+    True
+    """
+    dhp, dmg = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                     for a in (dhp, dmg)))
+    ret = np.empty(dhp.shape, dtype=ap_interval_dtype)
+    with np.errstate(invalid='ignore'):
+        dhp = np.trunc(dhp)
+        neg = dhp < 0
+        equal = neg & common.float_equal(dmg, dhp)
+        none = np.where(neg, dmg > 5 * dhp, dmg >= 5 * (dhp + 1))
+        none |= ~np.isfinite(dhp) | np.isnan(dmg)
+        none &= ~equal
+
+        apl = np.where(neg, 0.5 * (dmg - dhp), 0.5 * (dmg - dhp - 1))
+        apu = apl + 0.5
+        max_ap = 0.4 * dmg
+        # Same as min(apu, max_ap)
+        apu = np.where(max_ap < apu, max_ap, apu)
+        bl = np.where(neg, BOUND_CLOSED, BOUND_OPEN)
+        bu = np.where(neg, np.where(dmg <= 5 * (dhp - 1), BOUND_OPEN, BOUND_INF),
+                      np.where(dmg < 5 * dhp, BOUND_CLOSED, BOUND_INF))
+
+    apl[equal] = apu[equal] = 0.0
+    bl[equal] = bu[equal] = BOUND_CLOSED
+    apl[none] = apu[none] = np.nan
+    bl[none] = bu[none] = BOUND_NONE
+    ret['apl'] = apl
+    ret['apu'] = apu
+    ret['bl'] = bl
+    ret['bu'] = bu
+    return ret[()]
+
+def fall(vfz):
+    """Array version of :py:func:`pystrafe.damage.fall`."""
+    vfz = np.asarray(vfz, dtype=float)
+    with np.errstate(invalid='ignore'):
+        ret = 25 * (vfz - 580) / 111
+        # Same as max(0.0, ret)
+        ret = np.where(ret > 0.0, ret, 0.0)
+    return ret[()]
+
+def fall_speed(dmg):
+    """Array version of :py:func:`pystrafe.damage.fall_speed`.
+
+    Elements with negative *dmg* are ``NaN``.
+    """
+    dmg = np.asarray(dmg, dtype=float)
+    with np.errstate(invalid='ignore'):
+        ret = np.where(dmg >= 0, 580 + 111 * dmg / 25, np.nan)
+    return ret[()]
+
+def fall_z(speedzi, z, g):
+    """Array version of :py:func:`pystrafe.damage.fall_z`.
+
+    Elements where *z* is unreachable are ``NaN``.
+
+    >>> fall_z(268, [0, -100, -200, 100], 800)
+    array([ 0.        ,  0.        , 10.35100565,         nan])
+    """
+    speedzi, z, g = (np.asarray(a, dtype=float) for a in (speedzi, z, g))
+    with np.errstate(invalid='ignore'):
+        vfz = np.sqrt(speedzi * speedzi - 2 * g * z)
+        # Unlike in fall, NaN from an unreachable z must propagate
+        ret = np.maximum(25 * (vfz - 580) / 111, 0.0)
+    return ret[()]
+
+def fall_min_z(dmg, speedzi, g):
+    """Array version of :py:func:`pystrafe.damage.fall_min_z`.
+
+    Elements with negative *dmg* are ``NaN``. Raise :py:exc:`ValueError` if
+    any *g* is not positive.
+
+    >>> fall_min_z([0, 10, 100], 268, 800)
+    array([-165.36  , -198.7821, -610.47  ])
+    """
+    g = np.asarray(g, dtype=float)
+    if np.any(~(g > 0)):
+        raise ValueError('g must be > 0')
+    speedf = fall_speed(dmg)
+    speedzi = np.asarray(speedzi, dtype=float)
+    ret = (speedzi * speedzi - speedf * speedf) / (2 * g)
+    return ret[()]
+
+def fall_max_speedzi(dmg, z, g):
+    """Array version of :py:func:`pystrafe.damage.fall_max_speedzi`.
+
+    Elements with negative *dmg*, or where no initial speed keeps the damage
+    within *dmg*, are ``NaN``.
+    """
+    speedf = fall_speed(dmg)
+    z, g = (np.asarray(a, dtype=float) for a in (z, g))
+    with np.errstate(invalid='ignore'):
+        ret = np.sqrt(speedf * speedf + 2 * g * z)
+    return ret[()]
@@ -0,0 +1,101 @@
+"""Array versions of the functions in :py:mod:`pystrafe.ladder`.
+
+Vectors are arrays with a last axis of length 3, so that a batch of *N*
+ladder normals is an array of shape ``(N, 3)``. The remaining arguments
+broadcast against the leading axes of the vectors. Every vector is checked
+to be of unit length up front, and any that is not raises
+:py:exc:`ValueError` for the whole batch.
+"""
+
+import numpy as np
+from pystrafe.vec import common
+
+def _unit_vectors(name, v):
+    v = np.asarray(v, dtype=float)
+    if v.ndim < 1 or v.shape[-1] != 3:
+        raise ValueError(name + ' must have a last axis of length 3')
+    v0, v1, v2 = v[..., 0], v[..., 1], v[..., 2]
+    if not np.all(common.float_equal(v0 * v0 + v1 * v1 + v2 * v2, 1)):
+        raise ValueError(name + ' must be a unit vector')
+    return v0, v1, v2
+
+def _sign_mul(a):
+    a = np.asarray(a, dtype=float)
+    return np.where(common.float_zero(a), 0.0, np.copysign(200.0, a))
+
+def climb_velocity(n, f, s, F, S):
+    """Array version of :py:func:`pystrafe.ladder.climb_velocity`.
+
+    Return an array of the climbing velocities with a last axis of length 3.
+
+    >>> f = [[0, 0, 1], [0, 0, 1]]
+    >>> s = [[1, 0, 0], [0, 1, 0]]
+    >>> climb_velocity([[1, 0, 0], [0, 1, 0]], f, s, 1, -1)
+    array([[  0.,   0., 400.],
+           [  0.,   0., 400.]])
+    """
+    n0, n1, n2 = _unit_vectors('n', n)
+    f0, f1, f2 = _unit_vectors('f', f)
+    s0, s1, s2 = _unit_vectors('s', s)
+
+    fmul = _sign_mul(F)
+    smul = _sign_mul(S)
+    ux = f0 * fmul + s0 * smul
+    uy = f1 * fmul + s1 * smul
+    uz = f2 * fmul + s2 * smul
+
+    cross_norm = n1 * n1 + n0 * n0
+    vertical = common.float_zero(cross_norm)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1 / cross_norm
+        fx = np.where(vertical, 0.0, -(n2 * n0) * inv)
+        fy = np.where(vertical, 0.0, -(n2 * n1) * inv)
+        fz = np.where(vertical, 0.0, (n0 * n0 + n1 * n1) * inv)
+    udotn = ux * n0 + uy * n1 + uz * n2
+    return np.stack(np.broadcast_arrays(ux - (fx + n0) * udotn,
+                                        uy - (fy + n1) * udotn,
+                                        uz - (fz + n2) * udotn), axis=-1)
+
+def maxspeed_normal(n, vdir, F, S):
+    """Array version of :py:func:`pystrafe.ladder.maxspeed_normal`.
+
+    Return a 3-tuple (*pitch*, *yaw*, *horizontal*) of arrays.
+    *horizontal* is true for the horizontal ladders, for which the scalar
+    function returns ``None`` as the yaw. Their *yaw* is ``NaN`` and their
+    *pitch* is zero.
+
+    >>> c = np.sqrt(0.5)
+    >>> pitch, yaw, horizontal = maxspeed_normal([[1, 0, 0], [0, c, c],
+    ...                                           [0, 0, 1]], 1, 1, 1)
+    >>> pitch
+    array([-1.57079633, -0.        ,  0.        ])
+    >>> yaw
+    array([-1.57079633, -0.78539816,         nan])
+    >>> horizontal
+    array([False, False,  True])
+    """
+    n0, n1, n2 = _unit_vectors('n', n)
+    vdir, F, S = (np.asarray(a, dtype=float) for a in (vdir, F, S))
+
+    sign_vdir = np.copysign(1.0, vdir)
+    sign_F = np.copysign(1.0, F) * sign_vdir
+    sign_S = np.copysign(1.0, S) * sign_vdir
+    yaw = np.arctan2(n1, n0)
+
+    with np.errstate(invalid='ignore'):
+        # Ladders facing up
+        tmp = np.sqrt(2 * n2 * np.hypot(n0, n1))
+        yaw_up = yaw + np.arctan2(-sign_S, -sign_F * tmp)
+        sign_nzdiff = np.copysign(1.0, np.sqrt(0.5) - n2)
+        pitch_up = -sign_F * sign_nzdiff * np.arccos(tmp)
+    # Ladders facing down
+    sign_nzadd = np.copysign(1.0, np.sqrt(0.5) + n2)
+    yaw_down = yaw + sign_S * sign_nzadd * 0.5 * np.pi
+    pitch_down = -sign_F * 0.5 * np.pi
+
+    up = n2 >= 0
+    horizontal = common.float_equal(np.abs(n2), 1)
+    pitch = np.where(horizontal, 0.0, np.where(up, pitch_up, pitch_down))
+    yaw = np.where(horizontal, np.nan, np.where(up, yaw_up, yaw_down))
+    horizontal = np.broadcast_to(horizontal, pitch.shape)
+    return pitch[()], yaw[()], horizontal[()]
@@ -0,0 +1,328 @@
+"""Array versions of the closed-form routines in :py:mod:`pystrafe.motion`.
+
+All functions broadcast over their arguments and return NumPy arrays, or NumPy
+scalars when every argument is a scalar. The same assumptions as those in
+:py:mod:`pystrafe.motion` apply.
+
+>>> K = strafe_K_std(0.001)
+>>> strafe_time([0, 100, 1000], 320, K)
+array([0.        , 0.2801297 , 1.93172356])
+"""
+
+import numpy as np
+from pystrafe.vec import common
+
+def strafe_K(L, tau, M, A):
+    """Array version of :py:func:`pystrafe.motion.strafe_K`.
+
+    Elements where the scalar function would divide by zero are ``NaN``.
+    """
+    L, tau, M, A = (np.asarray(p, dtype=float) for p in (L, tau, M, A))
+    if np.any((L < 0) | (tau < 0) | (M < 0) | (A < 0)):
+        raise ValueError('parameters must be > 0')
+    L = np.minimum(L, M)
+    LtauMA = L - tau * M * A
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret = np.where(LtauMA <= 0, L * L / tau, M * A * (L + LtauMA))
+    return ret[()]
+
+def strafe_K_std(tau):
+    """Array version of :py:func:`pystrafe.motion.strafe_K_std`."""
+    return strafe_K(30, tau, 320, 10)
+
+def strafe_speedxf(t, speed, K):
+    """Array version of :py:func:`pystrafe.motion.strafe_speedxf`.
+
+    >>> strafe_speedxf([0, 1, 2], 400, 90000)
+    array([400.        , 500.        , 583.09518948])
+    """
+    common.validate_K(K)
+    t, speed, K = (np.asarray(p, dtype=float) for p in (t, speed, K))
+    with np.errstate(invalid='ignore'):
+        ret = np.sqrt(speed * speed + t * K)
+    return ret[()]
+
+def strafe_distance(t, speed, K):
+    """Array version of :py:func:`pystrafe.motion.strafe_distance`."""
+    common.validate_K(K)
+    t, speed, K = (np.asarray(p, dtype=float) for p in (t, speed, K))
+    speed = np.abs(speed)
+    speedsq = speed * speed
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret = ((speedsq + t * K) ** 1.5 - speedsq * speed) / (1.5 * K)
+    ret = np.where(common.float_equal(K, 0.0), speed * t, np.abs(ret))
+    return ret[()]
+
+def strafe_time(x, speedxi, K):
+    """Array version of :py:func:`pystrafe.motion.strafe_time`."""
+    common.validate_K(K)
+    x, speedxi, K = (np.asarray(p, dtype=float) for p in (x, speedxi, K))
+    speedxi = np.abs(speedxi)
+    x = np.abs(x)
+    sq = speedxi * speedxi
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret = ((sq * speedxi + 1.5 * K * x) ** (2 / 3) - sq) / K
+        # ret < 0 can occur from the subtraction with small x and big speedxi
+        ret = np.maximum(ret, 0.0)
+        ret = np.where(common.float_zero(K), x / speedxi, ret)
+    ret = np.where(common.float_zero(x), 0.0, ret)
+    return ret[()]
+
+def gravity_speediz_distance_time(t, z, g):
+    """Array version of :py:func:`pystrafe.motion.gravity_speediz_distance_time`.
+
+    Elements that are indeterminate are ``NaN``.
+    """
+    t, z, g = (np.asarray(p, dtype=float) for p in (t, z, g))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret = (0.5 * g * t * t + z) / t
+    ret = np.where(t == 0, np.copysign(np.inf, z), ret)
+    ret = np.where(common.float_zero(t) & common.float_zero(z), np.nan, ret)
+    return ret[()]
+
+def gravity_time_speediz_z(speedzi, z, g):
+    """Array version of :py:func:`pystrafe.motion.gravity_time_speediz_z`.
+
+    Return a 2-tuple of arrays. Elements where the height is unreachable are
+    ``NaN``.
+    """
+    speedzi, z, g = (np.asarray(p, dtype=float) for p in (speedzi, z, g))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = z / speedzi
+        sqrt_tmp = np.sqrt(speedzi * speedzi - 2 * g * z)
+        t1 = (speedzi - sqrt_tmp) / g
+        t2 = (speedzi + sqrt_tmp) / g
+    gzero = common.float_zero(g)
+    t1 = np.where(gzero, t, t1)
+    t2 = np.where(gzero, t, t2)
+    return t1[()], t2[()]
+
+def gravity_first_time(speedzi, z, g):
+    """Compute the earliest nonnegative time at which the height *z* is
+    reached with the initial vertical speed *speedzi*.
+
+    This is the time to the height used by :py:func:`strafe_solve_speedxi`.
+    Elements where the height is unreachable, or the time is not finite as
+    for a zero *g*, are ``NaN``.
+
+    >>> gravity_first_time(268, [10, 100, -50], 800)
+    array([0.03966121,        nan, 0.82205749])
+    """
+    speedzi, z, g = (np.asarray(p, dtype=float) for p in (speedzi, z, g))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        sqrt_tmp = np.sqrt(speedzi * speedzi - 2 * g * z)
+        t = speedzi - sqrt_tmp
+        t = np.where(t < 0, speedzi + sqrt_tmp, t)
+        t /= g
+        t = np.where((t >= 0) & (t < np.inf), t, np.nan)
+    return t[()]
+
+def _illinois(f, a, b, fa, fb, xtol, rtol, maxiter):
+    """Solve f(v, idx) = 0 for every bracket [a, b] using the Illinois method.
+
+    *f* receives the points to evaluate together with the indices of the
+    brackets they belong to, so that only unconverged brackets are computed.
+    """
+    root = np.empty_like(b)
+    idx = np.arange(len(b))
+    for _ in range(maxiter):
+        done = (np.abs(b - a) <= xtol + rtol * np.abs(b)) | (fb == 0)
+        root[idx[done]] = b[done]
+        if done.all():
+            return root
+        keep = ~done
+        idx, a, b, fa, fb = idx[keep], a[keep], b[keep], fa[keep], fb[keep]
+        c = b - fb * (b - a) / (fb - fa)
+        fc = f(c, idx)
+        side = fc * fb < 0
+        a = np.where(side, b, a)
+        fa = np.where(side, fb, 0.5 * fa)
+        b, fb = c, fc
+    raise RuntimeError('failed to converge after {} iterations'.format(maxiter))
+
+def _strafe_solve_speedxi_newton(c, D, rtol, maxiter):
+    """Array version of the quartic Newton iteration in
+    :py:func:`pystrafe.motion.strafe_solve_speedxi`."""
+    s = np.zeros_like(c)
+    root = np.empty_like(c)
+    idx = np.arange(len(c))
+    for _ in range(maxiter):
+        ss = s * s
+        step = (ss * ss - 4 * c[idx] * s + 3 * D[idx] ** 2) / (4 * (ss * s - c[idx]))
+        s = s - step
+        # A non-finite step can only come from an element that should have
+        # been masked out by the caller, and must not stall the others.
+        done = (-step <= rtol * s) | ~np.isfinite(step)
+        root[idx[done]] = s[done]
+        if done.all():
+            return np.maximum(0.5 * (D / root - root), 0.0)
+        idx, s = idx[~done], s[~done]
+    raise RuntimeError('failed to converge after {} iterations'.format(maxiter))
+
+def strafe_solve_speedxi(speedzi, K, x, z, g, method='illinois', xtol=2e-12,
+                         rtol=4 * np.finfo(float).eps, maxiter=100):
+    """Array version of :py:func:`pystrafe.motion.strafe_solve_speedxi`.
+
+    If *method* is ``'illinois'``, all brackets are solved at once using the
+    Illinois variant of the regula falsi method, with the same bracket as the
+    scalar function. *xtol* and *rtol* have the same meanings as those in
+    ``scipy.optimize.brentq``. If *method* is ``'newton'``, the quartic Newton
+    iteration of the scalar function is used instead, and *xtol* is ignored.
+    Elements where the height is unreachable are ``NaN``, as are elements
+    with a zero *K* or *g* for which the scalar function would divide by
+    zero, and elements with a non-finite time to the height. Elements whose
+    bracket ``x / tz`` is infinite are ``inf``.
+
+    >>> K = strafe_K(30, 0.001, 320, 10)
+    >>> strafe_solve_speedxi(0, K, [100, 100, 200], [-18, -100, -30], 800)
+    array([450.64744988,   0.        , 713.12104519])
+    """
+    common.validate_K(K)
+    if method not in ('illinois', 'newton'):
+        raise ValueError('unknown method: {}'.format(method))
+    args = np.broadcast_arrays(*(np.asarray(p, dtype=float)
+                                 for p in (speedzi, K, x, z, g)))
+    shape = args[0].shape
+    speedzi, K, x, z, g = (a.ravel() for a in args)
+
+    tz = gravity_first_time(speedzi, z, g)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        x = np.abs(x)
+        txmax = (1.5 * x) ** (2 / 3) * K ** (-1 / 3)
+        # The scalar function divides by zero for these, and they would keep
+        # the solvers below from converging for the whole batch.
+        unreachable = np.isnan(tz) | (K == 0)
+        bound = x / tz
+
+    ret = np.full(len(x), np.nan)
+    zero = ~unreachable & (common.float_zero(txmax) | common.float_equal(txmax, tz)
+                           | (txmax < tz))
+    ret[zero] = 0.0
+    inf = ~unreachable & ~zero & (common.float_zero(tz) | (bound == np.inf))
+    ret[inf] = np.inf
+
+    solve = np.flatnonzero(~unreachable & ~zero & ~inf & np.isfinite(bound))
+    if len(solve):
+        K, tz, x, bound = K[solve], tz[solve], x[solve], bound[solve]
+        tmp = 1.5 * K * x
+        if method == 'newton':
+            ret[solve] = _strafe_solve_speedxi_newton(tmp, K * tz, rtol, maxiter)
+            return ret.reshape(shape)[()]
+
+        def f(v, idx):
+            return ((v ** 3 + tmp[idx]) ** (2 / 3) - v ** 2) / K[idx] - tz[idx]
+
+        # The upper bound of x / tz is the minimum _constant_ speed needed
+        a = np.zeros(len(solve))
+        b = bound
+        every = np.arange(len(solve))
+        ret[solve] = _illinois(f, a, b, f(a, every), f(b, every),
+                               xtol, rtol, maxiter)
+
+    return ret.reshape(shape)[()]
+
+_invphi = (np.sqrt(5) - 1) / 2
+
+def _golden(f, a, b, rtol, atol, maxiter):
+    """Minimise f(x, idx) over every bracket [a, b] by golden-section search.
+
+    Return a 2-tuple of the minimisers and a boolean array indicating
+    convergence. The brackets are assumed to contain a unimodal function.
+    """
+    every = np.arange(len(a))
+    c = b - _invphi * (b - a)
+    d = a + _invphi * (b - a)
+    fc = f(c, every)
+    fd = f(d, every)
+    xmin = np.where(fc < fd, c, d)
+    converged = np.zeros(len(a), dtype=bool)
+    idx = every
+    for _ in range(maxiter):
+        done = b - a <= atol + rtol * np.abs(c + d)
+        xmin[idx[done]] = np.where(fc < fd, c, d)[done]
+        converged[idx[done]] = True
+        if done.all():
+            return xmin, converged
+        keep = ~done
+        idx, a, b, c, d, fc, fd = (arr[keep] for arr in (idx, a, b, c, d, fc, fd))
+        left = fc < fd
+        a = np.where(left, a, c)
+        b = np.where(left, d, b)
+        c, d = np.where(left, b - _invphi * (b - a), d), np.where(left, c, a + _invphi * (b - a))
+        fx = f(np.where(left, c, d), idx)
+        fc, fd = np.where(left, fx, fd), np.where(left, fc, fx)
+    xmin[idx] = np.where(fc < fd, c, d)
+    return xmin, converged
+
+def solve_boost_min_dmg(vi, K, x, z, g, dx0=None, rtol=1.48e-8, atol=1e-10,
+                        maxiter=200):
+    """Array version of :py:func:`pystrafe.motion.solve_boost_min_dmg`.
+
+    *vi* is an array-like whose last axis holds the horizontal and vertical
+    components of the initial velocities. It broadcasts with the remaining
+    arguments after removing that axis.
+
+    Since the health loss of boosting only horizontally is an upper bound of
+    the objective, the optimal horizontal boost lies in between zero and the
+    vertical boost needed when not boosting horizontally. The objective is
+    unimodal in this bracket, which is searched using the golden-section method
+    for all targets at once. The search stops when the bracket is narrower
+    than *atol* plus *rtol* times the boost.
+
+    *dx0*, if given, is an array of initial guesses of the horizontal boosts,
+    such as the solutions of neighbouring targets in a sweep. Wherever the
+    guess is verified to bracket the minimum within 10% either side, the
+    search starts from that much narrower bracket instead.
+
+    Return a 4-tuple (*dx*, *dy*, *fun*, *converged*) of arrays, where *fun*
+    is the objective :math:`dx^2 + dy^2` and *converged* indicates whether the
+    search converged within *maxiter* iterations.
+
+    >>> K = strafe_K(30, 0.001, 320, 10)
+    >>> dx, dy, fun, converged = solve_boost_min_dmg([100, 268], K, 400, 500, 800)
+    >>> '{:.5g} {:.5g} {}'.format(dx, dy, converged)
+    '27.394 627.83 True'
+    """
+    common.validate_K(K)
+    vi = np.asarray(vi, dtype=float)
+    args = np.broadcast_arrays(*(np.asarray(p, dtype=float) for p in
+                                 (vi[..., 0], vi[..., 1], K, x, z, g)))
+    shape = args[0].shape
+    vix, viz, K, x, z, g = (a.ravel() for a in args)
+    vix = np.abs(vix)
+    x = np.abs(x)
+
+    def compute_dy(dx, idx):
+        tx = strafe_time(x[idx], vix[idx] + dx, K[idx])
+        dy = gravity_speediz_distance_time(tx, z[idx], g[idx]) - viz[idx]
+        # max to simulate inequality constraint, where the final position
+        # being above the minimum permissible is sufficient
+        return np.maximum(np.nan_to_num(dy, nan=0.0, posinf=np.inf), 0.0)
+
+    def fun(dx, idx):
+        dy = compute_dy(dx, idx)
+        return dx * dx + dy * dy
+
+    every = np.arange(len(x))
+    dx = np.zeros(len(x))
+    converged = np.ones(len(x), dtype=bool)
+    upper = compute_dy(dx, every)
+    solve = np.flatnonzero((upper > 0) & np.isfinite(upper))
+    if len(solve):
+        a = np.zeros(len(solve))
+        b = upper[solve]
+        if dx0 is not None:
+            dx0 = np.broadcast_to(np.asarray(dx0, dtype=float), shape).ravel()[solve]
+            lo = np.maximum(0.9 * dx0, 0.0)
+            hi = np.minimum(1.1 * dx0, b)
+            f0 = fun(dx0, solve)
+            warm = (lo < hi) & (fun(hi, solve) >= f0) \
+                & ((lo == 0) | (fun(lo, solve) >= f0))
+            a = np.where(warm, lo, a)
+            b = np.where(warm, hi, b)
+        dx[solve], converged[solve] = _golden(lambda dx, idx: fun(dx, solve[idx]),
+                                              a, b, rtol, atol, maxiter)
+
+    dy = compute_dy(dx, every)
+    fval = dx * dx + dy * dy
+    return tuple(a.reshape(shape)[()] for a in (dx, dy, fval, converged))
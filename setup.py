@@ -3,11 +3,12 @@ import pystrafe
 
 setup(
     name='pystrafe',
-    packages=['pystrafe', 'pystrafe.tests'],
+    packages=['pystrafe', 'pystrafe.vec', 'pystrafe.tests'],
     version=pystrafe.__version__,
     description='Python routines for Half-Life physics computations',
-    install_requires=['scipy'],
-    python_requires='>=3.2.*',
+    install_requires=['numpy'],
+    extras_require={'scipy': ['scipy'], 'numba': ['numba']},
+    python_requires='>=3.7',
     license='MIT',
     author='Chong Jiang Wei',
     author_email='me@jwchong.com',